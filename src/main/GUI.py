@@ -1,23 +1,65 @@
 import customtkinter as ctk
-from src.main.persistance.Supabase import DatabaseConfig
+from src.main.persistance.Supabase import DatabaseConfig, RECENCY_KEY
 from src.main.config.logger_config import log
 from src.main.config.SitesConfigLoader import ConfigLoader
-from src.main.service.ScraperService import ScraperService
-from src.main.service.StatisticsService import StatisticsService
+from src.main.service.StatisticsService import StatisticsService, WATERMARK_OVERLAP
+from src.main.service.SearchIndex import SearchIndex
+from src.main.service.RefreshWorker import RefreshWorker, OFFERS, DONE, FAILED
 from src.main.model.JobOffer import JobOffer
-from typing import List
+from src.main.model.OfferBatch import OfferBatch
+from src.main.view.VirtualOfferList import VirtualOfferList
+from src.main.view.TextTruncator import TextTruncator
+from src.main.view.ChartPanel import ChartPanel
+from src.main.view.Charts import SALARY_UNIT
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
 import tkinter.font as tkfont
 import webbrowser
-import matplotlib.pyplot as plt
+
+# Typing pauses this long before the list is filtered
+SEARCH_DEBOUNCE_MS = 150
+# How often a running refresh is checked for new offers
+REFRESH_POLL_MS = 100
+# How often a page being read is checked for
+PAGE_POLL_MS = 50
+# Wait before reading the first page again after it failed
+PAGE_RETRY_MS = 5000
+# How often a report being computed is checked for
+STATISTICS_POLL_MS = 50
+# Width in pixels that offer titles are shortened to
+TITLE_WIDTH = 476
 
 
 class GUI:
     def __init__(self):
         self.number_of_offers = 0
-        self.selected_button = None
         self.selected_offer = None
+        self.search_job = None
+        self.refresh_worker = None
         self.database = DatabaseConfig()
-        self.data = self.database.read_data()
+        # Kept for the whole session so repeated graphs reuse its snapshot of the offers
+        statistics_settings = ConfigLoader().get_statistics_settings()
+        self.statistics = StatisticsService(self.database, backend=statistics_settings.get('backend', 'python'))
+        # Offers are read page by page, newest first, once the window is shown. Keys index `data`
+        # in load order; the list shows refreshed offers above the pages, both newest first.
+        self.data = OfferBatch()
+        self.offer_keys = set()
+        self.refreshed_keys: List[int] = []
+        self.paged_keys: List[int] = []
+        # Position of each key in the list; refreshed offers count down from 0, paged ones up
+        self.ranks: List[int] = []
+        self.top_rank = 0
+        self.watermark = None
+        self.search_index = SearchIndex()
+        self.page_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-loader")
+        # Reports are computed off the Tk thread, one at a time, from the service's cached snapshot
+        self.statistics_loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="statistics")
+        self.statistics_job = None
+        self.chart_panel = None
+        self.page_job = None
+        self.page_cursor = None
+        self.all_pages_loaded = False
 
         ctk.set_appearance_mode("Dark")
         ctk.set_default_color_theme("dark-blue")
@@ -32,48 +74,134 @@ class GUI:
         self.app.grid_rowconfigure(0, weight=1)
 
         self.font = tkfont.Font(family="Roboto", size=12)
-        self.titles = [self.fix_text(offer.title) for offer in self.data]
+        self.truncate_title = TextTruncator(self.font.measure, TITLE_WIDTH)
+        self.titles = []
+
+    def load_next_page(self):
+        if self.page_job is not None or self.all_pages_loaded:
+            return
+        self.page_job = self.page_loader.submit(self.database.read_page, self.page_cursor)
+        self.app.after(PAGE_POLL_MS, self.on_page_progress)
+
+    def on_page_progress(self):
+        if not self.page_job.done():
+            self.app.after(PAGE_POLL_MS, self.on_page_progress)
+            return
+        job, self.page_job = self.page_job, None
+        try:
+            page, self.page_cursor = job.result()
+        except Exception as e:
+            log.error(f"Failed to load offers: {e}")
+            self.settings_status_label.configure(text="LOADING FAILED")
+            if not self.data:
+                # An empty list cannot be scrolled to its end, so the first page is retried on a timer
+                self.app.after(PAGE_RETRY_MS, self.load_next_page)
+            if self.refresh_worker is None:
+                # Without a watermark the refresh reads back every stored offer, which also fills the list
+                self.refresh_button.configure(state="normal")
+            return
+
+        self.all_pages_loaded = self.page_cursor is None
+        self.add_offers(page)
+        if self.refresh_worker is None:
+            # Refreshing waits for the first page, which sets the watermark of the newest offers
+            self.refresh_button.configure(state="normal")
+            self.settings_status_label.configure(text=f"{self.number_of_offers} OFFERS FOUND")
 
     def on_refresh(self):
-        log.info("Loading the configuration")
-        config = ConfigLoader()
-        websites = config.get_sites_config()
-
-        log.info("Scraping the data")
-        scraper = ScraperService(websites)
-        offers: List[JobOffer] = scraper.scrape_all_sites()
-        log.info(f"Found {len(offers)} offers")
-
-        log.info("Saving the data")
-
-        database = DatabaseConfig()
-        database.create_table()
-        self.data += database.insert_data(offers)
-        self.titles = [self.fix_text(offer.title) for offer in self.data]
+        # The same button cancels a running refresh
+        if self.refresh_worker is not None:
+            self.refresh_worker.cancel()
+            self.refresh_button.configure(state="disabled")
+            self.settings_status_label.configure(text="CANCELLING...")
+            return
+
+        # Also picks up offers stored meanwhile by other runs, without re-reading the table
+        since = self.watermark - WATERMARK_OVERLAP if self.watermark else None
+        self.refresh_worker = RefreshWorker(self.database, since)
+        self.refresh_worker.start()
+        self.refresh_button.configure(text="Cancel refresh")
+        self.settings_status_label.configure(text="REFRESHING...")
+        self.app.after(REFRESH_POLL_MS, self.on_refresh_progress)
+
+    def on_refresh_progress(self):
+        for kind, payload in self.refresh_worker.poll():
+            if kind == OFFERS:
+                self.add_offers(payload, newest=True)
+                self.settings_status_label.configure(text=f"REFRESHING... {self.number_of_offers} OFFERS")
+            elif kind in (DONE, FAILED):
+                self.refresh_worker = None
+                self.refresh_button.configure(text="Refresh offers", state="normal")
+                status = "REFRESH FAILED" if kind == FAILED else f"{self.number_of_offers} OFFERS FOUND"
+                self.settings_status_label.configure(text=status)
+                if self.chart_panel is not None and self.chart_panel.is_shown():
+                    self.update_charts()
+                return
+        self.app.after(REFRESH_POLL_MS, self.on_refresh_progress)
+
+    def add_offers(self, offers: Iterable[JobOffer], newest: bool = False):
+        """Adds the offers not loaded yet to the list, keeping its scroll position and search filter.
+
+        Pages go below the offers shown, in the order read. `newest` offers, from a refresh,
+        are newer than any page and go on top, sorted newest first.
+        """
+        new_offers = [offer for offer in offers if (offer.url, offer.title) not in self.offer_keys]
+        if not new_offers:
+            return
+        log.info(f"Loaded {len(new_offers)} new offers")
+        for offer in new_offers:
+            self.offer_keys.add((offer.url, offer.title))
+            if offer.scraped_at and (self.watermark is None or offer.scraped_at > self.watermark):
+                self.watermark = offer.scraped_at
+        if newest:
+            new_offers.sort(key=lambda offer: tuple(getattr(offer, column) for column in RECENCY_KEY), reverse=True)
+        first_key = len(self.data)
+        self.data += new_offers
+        self.titles += [self.fix_text(offer.title) for offer in new_offers]
+        self.search_index.add_rows((offer.title, offer.company, offer.location) for offer in new_offers)
+        self.number_of_offers = len(self.data)
 
-        self.fill_listbox()
-        self.settings_status_label.configure(text=f"{self.number_of_offers} OFFERS FOUND")
+        # Within the batch, key order is display order
+        new_keys = range(first_key, len(self.data))
+        if newest:
+            self.top_rank -= len(new_keys)
+            self.ranks.extend(range(self.top_rank, self.top_rank + len(new_keys)))
+            self.refreshed_keys[:0] = new_keys
+        else:
+            self.ranks.extend(new_keys)
+            self.paged_keys.extend(new_keys)
+
+        query = self.search_var.get().strip()
+        if query:
+            keys = self.search_index.search(query)
+            new_keys = keys[bisect_left(keys, first_key):]
+        if newest:
+            self.offer_list.prepend(new_keys)
+        else:
+            self.offer_list.extend(new_keys)
 
     def on_visit(self):
         if self.selected_offer:
             webbrowser.open(self.selected_offer.url)
 
+    def on_search_changed(self):
+        if self.search_job is not None:
+            self.app.after_cancel(self.search_job)
+        self.search_job = self.app.after(SEARCH_DEBOUNCE_MS, self.on_search)
+
     def on_search(self):
-        if self.search_entry.get().strip() != '':
-            self.fill_listbox(lambda x: True if self.search_entry.get().lower() in x.lower() else False)
-        else:
-            self.fill_listbox()
+        if self.search_job is not None:
+            self.app.after_cancel(self.search_job)
+            self.search_job = None
+        query = self.search_var.get().strip()
+        self.fill_listbox(self.search_index.search(query) if query else None)
 
     def on_clear(self):
         self.search_var.set('')
-        self.fill_listbox()
-
-    def on_offer_select(self, button, offer):
-        if self.selected_button:
-            self.selected_button.configure(fg_color="#3a3a3a")
+        self.on_search()
 
-        button.configure(fg_color="#1f6aa5")
-        self.selected_button = button
+    def on_offer_select(self, key):
+        offer = self.data[key]
         self.selected_offer = offer
 
         self.title_entry.configure(state="normal")
@@ -94,24 +222,32 @@ class GUI:
             self.salary_entry.configure(state="disabled")
 
     def on_show_graph(self):
-        s_service = StatisticsService()
-        data = s_service.get_position_type_counts()
-
-        x = list(data.keys())
-        y = list(data.values())
-
-        plt.figure(figsize=(10, 6))
-        plt.bar(x, y, color='orange')
-
-        plt.title('Number of offers in different areas', fontsize=16)
-        plt.xlabel('Position', fontsize=12)
-        plt.ylabel('Number of offers', fontsize=12)
-
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.show()
+        if self.chart_panel is None:
+            self.chart_panel = ChartPanel(self.app)
+        # Shows the last report at once; a changed table is picked up in the background
+        self.chart_panel.show()
+        self.update_charts()
+
+    def update_charts(self):
+        if self.statistics_job is not None:
+            return
+        self.chart_panel.set_status("Updating statistics...")
+        self.statistics_job = self.statistics_loader.submit(self.statistics.get_report, unit=SALARY_UNIT)
+        self.app.after(STATISTICS_POLL_MS, self.on_statistics_progress)
+
+    def on_statistics_progress(self):
+        if not self.statistics_job.done():
+            self.app.after(STATISTICS_POLL_MS, self.on_statistics_progress)
+            return
+        job, self.statistics_job = self.statistics_job, None
+        try:
+            report = job.result()
+        except Exception as e:
+            log.error(f"Failed to compute statistics: {e}")
+            self.chart_panel.set_status("Statistics could not be updated")
+            return
+        self.chart_panel.set_report(report)
+        self.chart_panel.set_status("")
 
     def main_frame_setup(self):
         self.main_frame = ctk.CTkFrame(self.app, fg_color="transparent")
@@ -132,7 +268,7 @@ class GUI:
         search_frame.grid_columnconfigure(0, weight=1)
 
         self.search_var = ctk.StringVar()
-        self.search_var.trace_add("write", lambda *args: self.on_search())
+        self.search_var.trace_add("write", lambda *args: self.on_search_changed())
 
         self.search_entry = ctk.CTkEntry(search_frame, textvariable=self.search_var, placeholder_text="Search", font=("Roboto", 12))
         self.search_entry.grid(row=0, column=0, sticky="ew")
@@ -143,44 +279,23 @@ class GUI:
         self.offer_list_box_setup()
 
     def offer_list_box_setup(self):
-        self.listbox_frame = ctk.CTkScrollableFrame(self.offer_frame, border_width=2, corner_radius=0)
-        self.listbox_frame.grid(row=1, column=0, sticky="nsew", padx=10, pady=(2, 10))
-        self.listbox_frame.grid_columnconfigure(0, weight=1)
+        self.offer_list = VirtualOfferList(self.offer_frame, on_select=self.on_offer_select, on_scroll_end=self.load_next_page,
+                                           border_width=2, corner_radius=0)
+        self.offer_list.grid(row=1, column=0, sticky="nsew", padx=10, pady=(2, 10))
         self.fill_listbox()
 
     def fix_text(self, text):
-        if_changed = False
-        while self.font.measure(text) > 476 and len(text) > 0:
-            text = text[:-1]
-            if_changed = True
-        if if_changed:
-            text = text[:-4] + ' ...'
-        return text
-
-    def fill_listbox(self, pred=lambda x: True):
-        for child in self.listbox_frame.winfo_children():
-            child.destroy()
-
-        self.selected_button = None
+        return self.truncate_title(text)
+
+    def fill_listbox(self, keys=None):
+        # Only the visible rows get widgets, so refilling costs the same for any number of offers
         self.number_of_offers = len(self.data)
-        is_first = True
-        for element, title in zip(self.data, self.titles):
-            if pred(element.title):
-                button = ctk.CTkButton(
-                    self.listbox_frame,
-                    text=title,
-                    anchor="w",
-                    fg_color="#3a3a3a",
-                    hover=True,
-                    corner_radius=4,
-                    font=("Roboto", 12)
-                )
-                button.configure(command=lambda b=button, o=element: self.on_offer_select(b, o))
-                if is_first:
-                    button.pack(fill="x", pady=8, padx=(8, 1))
-                    is_first = False
-                else:
-                    button.pack(fill="x", pady=(0, 8), padx=(8, 1))
+        if keys is None:
+            keys = self.refreshed_keys + self.paged_keys
+        else:
+            # Search results come in key order; without a refresh that already is the list order
+            keys = sorted(keys, key=self.ranks.__getitem__)
+        self.offer_list.set_items(keys, self.titles)
 
     def details_container_setup(self):
         self.details_container = ctk.CTkFrame(self.main_frame, fg_color="transparent")
@@ -237,8 +352,9 @@ class GUI:
         self.settings_status_label = ctk.CTkLabel(center_frame, text=f"{self.number_of_offers} OFFERS FOUND", font=("Verdana", 28, "bold"))
         self.settings_status_label.pack()
 
-        settings_refresh_button = ctk.CTkButton(center_frame, text="Refresh offers", command=self.on_refresh, font=("Roboto", 12))
-        settings_refresh_button.pack(pady=10)
+        self.refresh_button = ctk.CTkButton(center_frame, text="Refresh offers", command=self.on_refresh, font=("Roboto", 12),
+                                            state="disabled")
+        self.refresh_button.pack(pady=10)
 
         view_graph_button = ctk.CTkButton(center_frame, text="Show graph", command=self.on_show_graph, font=("Roboto", 12))
         view_graph_button.pack()
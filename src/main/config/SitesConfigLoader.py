@@ -28,6 +28,17 @@ class ConfigLoader:
 
     def get_sites_config(self) -> List[Dict[str, Any]]:
         return self.config.get('scraper', {}).get('sites', [])
+
+    def get_scraper_settings(self) -> Dict[str, Any]:
+        """Returns the scraper-wide settings, i.e. every 'scraper' key except 'sites'."""
+        scraper_config = self.config.get('scraper', {})
+        return {key: value for key, value in scraper_config.items() if key != 'sites'}
+
+    def get_pipeline_settings(self) -> Dict[str, Any]:
+        return self.config.get('pipeline') or {}
+
+    def get_statistics_settings(self) -> Dict[str, Any]:
+        return self.config.get('statistics') or {}
     
 if __name__ == "__main__":
     config_loader = ConfigLoader()
@@ -1,7 +1,13 @@
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 from datetime import datetime
-import inspect 
+import yaml
 
 LOG_DIR = "logs"
 if not os.path.exists(LOG_DIR):
@@ -9,6 +15,161 @@ if not os.path.exists(LOG_DIR):
 
 LOG_FILENAME = datetime.now().strftime("%Y-%m-%d.log")
 LOG_FILE_PATH = os.path.join(LOG_DIR, LOG_FILENAME)
+CONFIG_PATH = 'src/resources/config.yml'
+
+DEFAULT_LOGGING_SETTINGS = {
+    'mode': 'sync', # 'async' hands records to a background thread through a queue
+    'queueSize': 10000,
+    'overflow': 'drop', # 'drop' discards new records when the queue is full, 'block' waits for space
+    'flushEvery': 100, # Records written before the log file is flushed in async mode
+    'flushInterval': 1.0, # Seconds after which pending records are flushed in async mode
+}
+
+
+def load_logging_settings(config_path=CONFIG_PATH):
+    """Returns the 'logging' section of the config file merged over the defaults."""
+    settings = dict(DEFAULT_LOGGING_SETTINGS)
+    try:
+        with open(config_path, 'r', encoding='utf-8') as f:
+            config_data = yaml.safe_load(f) or {}
+        settings.update(config_data.get('logging') or {})
+    except (OSError, yaml.YAMLError) as e:
+        # The logger cannot log its own configuration problems yet
+        print(f"Could not read logging settings from '{config_path}': {e}. Using defaults.", file=sys.stderr)
+    return settings
+
+
+class _BatchingFileHandler(logging.FileHandler):
+    """File handler that flushes every `flush_every` records or `flush_interval` seconds instead of per record.
+
+    Records at ERROR and above are flushed straight away.
+    """
+    def __init__(self, filename, flush_every=100, flush_interval=1.0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.flush_every = max(1, int(flush_every))
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._force = False
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        # StreamHandler.emit flushes after every record; count the record and decide here instead
+        self._pending += 1
+        self._force = record.levelno >= logging.ERROR
+        super().emit(record)
+
+    def flush(self):
+        if not (self._force or self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            return
+        self.force_flush()
+
+    def force_flush(self):
+        self._force = False
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        super().flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.stream:
+                self.force_flush()
+        finally:
+            self.release()
+        super().close()
+
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler for a bounded queue that either drops or waits for space when the queue is full."""
+    def __init__(self, log_queue, overflow='drop'):
+        super().__init__(log_queue)
+        self.block = overflow == 'block'
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record):
+        try:
+            self.queue.put(record, block=self.block)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """Queue listener that flushes its handlers whenever the queue runs empty, so records are written in batches."""
+    def dequeue(self, block):
+        try:
+            return self.queue.get_nowait()
+        except queue.Empty:
+            if not block:
+                raise
+        for handler in self.handlers:
+            handler.acquire()
+            try:
+                getattr(handler, 'force_flush', handler.flush)()
+            finally:
+                handler.release()
+        return self.queue.get()
+
+
+_handlers = None
+_listener = None
+_handlers_lock = threading.Lock()
+
+
+def _create_handlers(settings, formatter):
+    """Builds the handlers shared by every module logger, in sync or async mode."""
+    global _listener
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+
+    if settings.get('mode') != 'async':
+        file_handler = logging.FileHandler(LOG_FILE_PATH, mode='a', encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        return [console_handler, file_handler]
+
+    file_handler = _BatchingFileHandler(LOG_FILE_PATH, flush_every=settings.get('flushEvery'),
+                                        flush_interval=settings.get('flushInterval'), mode='a', encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    log_queue = queue.Queue(maxsize=max(1, int(settings.get('queueSize'))))
+    queue_handler = _BoundedQueueHandler(log_queue, overflow=settings.get('overflow'))
+    _listener = _BatchingQueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging, queue_handler)
+    return [queue_handler]
+
+
+def stop_logging(queue_handler=None):
+    """Writes out the records still queued in async mode and stops the listener thread."""
+    global _listener
+    listener, _listener = _listener, None
+    if listener is None:
+        return
+    listener.stop()
+    if queue_handler is not None and queue_handler.dropped:
+        record = logging.LogRecord(__name__, logging.WARNING, __file__, 0,
+                                   f"Dropped {queue_handler.dropped} log records because the log queue was full.", None, None)
+        listener.handle(record)
+    for handler in listener.handlers:
+        handler.close()
+
+
+def get_handlers(settings=None):
+    """Returns the process-wide console and file handlers, creating them on first use.
+
+    Every module logger shares them, so the log file is opened once per process.
+    """
+    global _handlers
+    with _handlers_lock:
+        if _handlers is None:
+            formatter = logging.Formatter(
+                "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+                datefmt="%Y-%m-%d %H:%M:%S",
+            )
+            _handlers = _create_handlers(settings or load_logging_settings(), formatter)
+        return _handlers
+
 
 def get_logger(name="offer_scraper", level=logging.INFO): 
     logger = logging.getLogger(name)
@@ -18,64 +179,73 @@ def get_logger(name="offer_scraper", level=logging.INFO):
         
     logger.setLevel(level)
 
-    # Formatter
-    formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-
-    # Console Handler
-    ch = logging.StreamHandler()
-    ch.setLevel(level)
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
-
-    # File Handler - daily log files
-    fh = logging.FileHandler(LOG_FILE_PATH, mode='a', encoding='utf-8')
-    fh.setLevel(level)
-    fh.setFormatter(formatter)
-    logger.addHandler(fh)
+    for handler in get_handlers():
+        logger.addHandler(handler)
     
     return logger
 
+# Logger methods that emit a record, with the level each one logs at
+_LEVEL_METHODS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'warn': logging.WARNING,
+    'error': logging.ERROR,
+    'exception': logging.ERROR,
+    'critical': logging.CRITICAL,
+    'fatal': logging.CRITICAL,
+}
+
+def _discard(*args, **kwargs):
+    """Stands in for a logging method whose level is disabled."""
+    return None
+
 class _ContextualLogger:
     """
     A logger proxy that determines the calling module's name for each log operation.
     """
     def __init__(self):
         self._cached_loggers = {}
+        # Code object of the calling function -> logger name, so each call site is resolved once
+        self._names_by_code = {}
 
     def _get_actual_logger(self):
         """
         Determines the caller's module and returns an appropriately named logger.
-        inspect.stack()[0] is _get_actual_logger
-        inspect.stack()[1] is the __getattr__ call (e.g., log.info)
-        inspect.stack()[2] is the user's code that called log.info()
+        sys._getframe(0) is _get_actual_logger
+        sys._getframe(1) is the __getattr__ call (e.g., log.info)
+        sys._getframe(2) is the user's code that called log.info()
         """
         try:
-            frame = inspect.stack()[2]
-            module = inspect.getmodule(frame[0])
-            
-            logger_name = "unknown_module" # fallback
-            if module:
-                if module.__name__ == '__main__':
-                    filepath = frame.filename
-                    logger_name = os.path.splitext(os.path.basename(filepath))[0]
-                else:
-                    logger_name = module.__name__
-            
-            if logger_name not in self._cached_loggers:
-                self._cached_loggers[logger_name] = get_logger(logger_name)
-            return self._cached_loggers[logger_name]
-        except IndexError:
-            # Fallback if stack inspection fails unexpectedly
-            if "fallback_logger" not in self._cached_loggers:
-                self._cached_loggers["fallback_logger"] = get_logger("fallback_logger")
-            return self._cached_loggers["fallback_logger"]
+            frame = sys._getframe(2)
+        except ValueError:
+            # Fallback if the call stack is unexpectedly shallow
+            return self._get_named_logger("fallback_logger")
 
+        code = frame.f_code
+        logger_name = self._names_by_code.get(code)
+        if logger_name is None:
+            module_name = frame.f_globals.get('__name__')
+            if not module_name:
+                logger_name = "unknown_module" # fallback
+            elif module_name == '__main__':
+                logger_name = os.path.splitext(os.path.basename(code.co_filename))[0]
+            else:
+                logger_name = module_name
+            self._names_by_code[code] = logger_name
+        return self._get_named_logger(logger_name)
+
+    def _get_named_logger(self, logger_name):
+        logger = self._cached_loggers.get(logger_name)
+        if logger is None:
+            logger = self._cached_loggers[logger_name] = get_logger(logger_name)
+        return logger
 
     def __getattr__(self, name):
         actual_logger = self._get_actual_logger()
+        level = _LEVEL_METHODS.get(name)
+        if level is not None and not actual_logger.isEnabledFor(level):
+            return _discard
         return getattr(actual_logger, name)
 
-log = _ContextualLogger()
\ No newline at end of file
+log = _ContextualLogger()
@@ -11,6 +11,7 @@ from typing import List
 
 from src.main.config.SitesConfigLoader import ConfigLoader
 from src.main.service.ScraperService import ScraperService
+from src.main.service.PipelineService import PipelineService
 from src.main.model.JobOffer import JobOffer
 from src.main.service.EmailFormatService import EmailFormatService
 from src.main.service.EmailSenderService import EmailSenderService
@@ -24,16 +25,22 @@ def main():
     websites = config.get_sites_config()
     log.info(f"Loaded {len(websites)} websites from the configuration")
     
-    log.info("Scraping the data")
-    scraper = ScraperService(websites)
-    offers: List[JobOffer] = scraper.scrape_all_sites()
-    log.info(f"Scraped {len(offers)} job offers from {len(websites)} websites")
-
-    log.info("Saving the data")
+    log.info("Preparing the database")
     database = DatabaseConfig()
     database.create_table()
-    inserted_offers = database.insert_data(offers)
-    log.info("Data has been saved to the database")
+
+    log.info("Scraping and saving the data")
+    # Lets pagination stop at the first page of offers that are already stored
+    scraper = ScraperService(websites, config.get_scraper_settings(), database.find_stored_offers)
+    pipeline = PipelineService(scraper, database, config.get_pipeline_settings())
+    inserted_offers: List[JobOffer] = []
+    for new_offers in pipeline.run():
+        inserted_offers.extend(new_offers)
+    # Sites are stored in the order they finish; the email lists them in configuration order
+    inserted_offers = scraper.sort_by_site(inserted_offers)
+    log.info(f"Data has been saved to the database. {len(inserted_offers)} new offers from {len(websites)} websites")
+    # Persists the HTTP cache only now, so pages of a failed run are not skipped next time
+    scraper.close()
 
     log.info("Formatting the scraped data")
     formatter = EmailFormatService()
@@ -1,8 +1,13 @@
+from datetime import datetime
 from typing import Optional
 
 class JobOffer:
+    # No per-instance __dict__; the order matches the constructor arguments
+    __slots__ = ('title', 'company', 'location', 'salary', 'url', 'site_id', 'add_info', 'scraped_at')
+
     def __init__(self, title: Optional[str], company: Optional[str], location: Optional[str],
-                 salary: Optional[str], url: Optional[str], site_id: str, add_info: Optional[str] = None):
+                 salary: Optional[str], url: Optional[str], site_id: str, add_info: Optional[str] = None,
+                 scraped_at: Optional[datetime] = None):
         self.title = title
         self.company = company
         self.location = location
@@ -10,6 +15,7 @@ class JobOffer:
         self.url = url
         self.site_id = site_id
         self.add_info = add_info
+        self.scraped_at = scraped_at
 
     def __str__(self):
         return (f"Site: {self.site_id}\n"
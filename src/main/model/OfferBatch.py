@@ -0,0 +1,66 @@
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Union
+from src.main.model.JobOffer import JobOffer
+
+# Columns whose few distinct values repeat across many offers, so each value is stored once
+INTERNED_COLUMNS = ('site_id', 'location', 'company', 'salary')
+
+
+class OfferBatch:
+    """Column-oriented collection of job offers.
+
+    Stores one list per JobOffer attribute instead of one object per offer, and interns the
+    strings of INTERNED_COLUMNS. Indexing and iteration build JobOffer objects on demand, so
+    code written against a list of offers keeps working; changes made to those objects are
+    not written back.
+    """
+
+    def __init__(self, offers: Iterable[JobOffer] = ()):
+        self._columns: Dict[str, List[Any]] = {column: [] for column in JobOffer.__slots__}
+        self.extend(offers)
+
+    def append(self, offer: JobOffer):
+        for column, values in self._columns.items():
+            values.append(self._store(column, getattr(offer, column)))
+
+    def append_row(self, columns: Sequence[str], row: Sequence[Any]):
+        """Appends an offer given as a row of values for `columns`; the other attributes are None."""
+        values = dict(zip(columns, row))
+        for column, stored in self._columns.items():
+            stored.append(self._store(column, values.get(column)))
+
+    def extend(self, offers: Iterable[JobOffer]):
+        for offer in offers:
+            self.append(offer)
+
+    @staticmethod
+    def _store(column: str, value: Any) -> Any:
+        if column in INTERNED_COLUMNS and type(value) is str:
+            return sys.intern(value)
+        return value
+
+    def column(self, name: str) -> List[Any]:
+        """Returns the values of one attribute for every offer, e.g. column('title')."""
+        return self._columns[name]
+
+    def __len__(self) -> int:
+        return len(self._columns['url'])
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[JobOffer, 'OfferBatch']:
+        if isinstance(index, slice):
+            batch = OfferBatch()
+            for column, values in self._columns.items():
+                batch._columns[column] = values[index]
+            return batch
+        return JobOffer(**{column: values[index] for column, values in self._columns.items()})
+
+    def __iter__(self) -> Iterator[JobOffer]:
+        for row in zip(*self._columns.values()):
+            yield JobOffer(*row)
+
+    def __iadd__(self, offers: Iterable[JobOffer]) -> 'OfferBatch':
+        self.extend(offers)
+        return self
+
+    def __repr__(self):
+        return f"OfferBatch({len(self)} offers)"
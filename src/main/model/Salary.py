@@ -0,0 +1,62 @@
+import re
+from typing import Optional
+
+HOURLY = 'hourly'
+MONTHLY = 'monthly'
+
+# A number with an optional decimal part; thousands may be grouped with spaces, e.g. "4 500 zł"
+_NUMBER_PATTERN = re.compile(r'\d{1,3}(?:[ \u00a0]\d{3})+(?:[,\.]\d+)?|\d+(?:[,\.]\d+)?')
+_HOURLY_PATTERN = re.compile(r'godz|hour|/\s*h\b')
+_MONTHLY_PATTERN = re.compile(r'mies|month')
+_GROSS_PATTERN = re.compile(r'\b(?:brutto|gross)\b')
+_NET_PATTERN = re.compile(r'\b(?:netto|net)\b')
+
+
+class Salary:
+    def __init__(self, minimum: float, maximum: float, unit: Optional[str] = None, gross: Optional[bool] = None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.unit = unit
+        self.gross = gross
+
+    @property
+    def midpoint(self) -> float:
+        return (self.minimum + self.maximum) / 2
+
+    def __eq__(self, other):
+        if not isinstance(other, Salary):
+            return NotImplemented
+        return (self.minimum, self.maximum, self.unit, self.gross) == (other.minimum, other.maximum, other.unit, other.gross)
+
+    def __repr__(self):
+        return f"Salary({self.minimum}, {self.maximum}, unit={self.unit!r}, gross={self.gross!r})"
+
+
+def parse_salary(text: Optional[str]) -> Optional[Salary]:
+    """Parses a salary text such as "30,50 - 33 zł / godz. brutto" or "4 500 zł / mies. netto".
+
+    The first two numbers are the range, a single number is both ends of it. The unit is
+    HOURLY, MONTHLY or None and `gross` is None when the text says neither brutto nor netto.
+    Returns None when the text holds no number.
+    """
+    if not text:
+        return None
+    text = text.lower()
+    numbers = _NUMBER_PATTERN.findall(text)[:2]
+    if not numbers:
+        return None
+    values = [float(re.sub(r'[ \u00a0]', '', number).replace(',', '.')) for number in numbers]
+
+    unit = None
+    if _HOURLY_PATTERN.search(text):
+        unit = HOURLY
+    elif _MONTHLY_PATTERN.search(text):
+        unit = MONTHLY
+
+    gross = None
+    if _GROSS_PATTERN.search(text):
+        gross = True
+    elif _NET_PATTERN.search(text):
+        gross = False
+
+    return Salary(values[0], values[-1], unit, gross)
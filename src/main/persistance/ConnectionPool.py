@@ -0,0 +1,136 @@
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+from src.main.config.logger_config import log
+
+DEFAULT_MIN_CONNECTIONS = 1
+DEFAULT_MAX_CONNECTIONS = 5
+DEFAULT_ACQUIRE_TIMEOUT = 30.0
+# Connections idle for longer than this are pinged before being handed out
+HEALTH_CHECK_AFTER = 30.0
+
+
+class ConnectionPool:
+    """Thread-safe pool of PostgreSQL connections with health checks.
+
+    Unlike psycopg2's ThreadedConnectionPool on its own, callers wait for a free
+    connection instead of failing once `max_connections` are checked out.
+    """
+
+    def __init__(self, min_connections: int = DEFAULT_MIN_CONNECTIONS, max_connections: int = DEFAULT_MAX_CONNECTIONS,
+                 acquire_timeout: float = DEFAULT_ACQUIRE_TIMEOUT, **connect_kwargs):
+        self.min_connections = max(0, min_connections)
+        self.max_connections = max(1, max_connections, self.min_connections)
+        self.acquire_timeout = acquire_timeout
+        self._available = threading.BoundedSemaphore(self.max_connections)
+        self._last_used: Dict[int, float] = {}
+        self._pool = ThreadedConnectionPool(self.min_connections, self.max_connections, **connect_kwargs)
+        log.info(f"Database connection pool created (min: {self.min_connections}, max: {self.max_connections}).")
+
+    def _is_healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        # Connections the pool has just opened have not been handed out before and need no ping.
+        if last_used is None or time.monotonic() - last_used < HEALTH_CHECK_AFTER:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            log.warning(f"Discarding broken database connection: {e}")
+            return False
+
+    def getconn(self):
+        """Checks out a healthy connection, waiting up to `acquire_timeout` seconds for one to be free."""
+        if not self._available.acquire(timeout=self.acquire_timeout):
+            raise TimeoutError(f"No database connection available within {self.acquire_timeout}s.")
+        try:
+            # A dead connection is replaced once; a second failure means the server is unreachable.
+            for _ in range(2):
+                conn = self._pool.getconn()
+                if self._is_healthy(conn):
+                    return conn
+                self._last_used.pop(id(conn), None)
+                self._pool.putconn(conn, close=True)
+            raise psycopg2.OperationalError("Could not obtain a healthy database connection.")
+        except Exception:
+            self._available.release()
+            raise
+
+    def putconn(self, conn, close: bool = False):
+        if close or conn.closed:
+            self._last_used.pop(id(conn), None)
+        else:
+            self._last_used[id(conn)] = time.monotonic()
+        self._pool.putconn(conn, close=close or bool(conn.closed))
+        self._available.release()
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Yields a pooled connection, committing on success and rolling back on error."""
+        conn = self.getconn()
+        broken = False
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            # BaseException also covers GeneratorExit from a reader abandoned mid-stream.
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            raise
+        finally:
+            self.putconn(conn, close=broken)
+
+    def close(self):
+        self._pool.closeall()
+        self._last_used.clear()
+        log.info("Database connection pool closed.")
+
+
+_shared_pools: Dict[Tuple, ConnectionPool] = {}
+_shared_pools_pid: Optional[int] = None
+_shared_pools_lock = threading.Lock()
+
+
+def get_shared_pool(**connect_kwargs) -> ConnectionPool:
+    """Returns the process-wide pool for the given connection parameters, creating it on first use.
+
+    Pool limits come from SUPABASE_DB_POOL_MIN and SUPABASE_DB_POOL_MAX.
+    """
+    global _shared_pools_pid
+    key = tuple(sorted(connect_kwargs.items()))
+    with _shared_pools_lock:
+        if _shared_pools_pid != os.getpid():
+            # Connections must not be shared with a forked child; start over.
+            _shared_pools.clear()
+            _shared_pools_pid = os.getpid()
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(
+                min_connections=int(os.getenv('SUPABASE_DB_POOL_MIN', DEFAULT_MIN_CONNECTIONS)),
+                max_connections=int(os.getenv('SUPABASE_DB_POOL_MAX', DEFAULT_MAX_CONNECTIONS)),
+                **connect_kwargs
+            )
+            _shared_pools[key] = pool
+        return pool
+
+
+@atexit.register
+def close_shared_pools():
+    with _shared_pools_lock:
+        if _shared_pools_pid != os.getpid():
+            return
+        for pool in _shared_pools.values():
+            pool.close()
+        _shared_pools.clear()
@@ -0,0 +1,109 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+import requests
+from src.main.config.logger_config import log
+
+
+class HttpCache:
+    """On-disk store of HTTP validators (ETag, Last-Modified) and body hashes per URL.
+
+    Lets the scraper send conditional requests and recognise listing pages that
+    did not change since the last run, so they do not have to be parsed again.
+    """
+
+    def __init__(self, path: str = 'cache/http_cache.json'):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Optional[str]]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Optional[str]]]:
+        if not os.path.exists(self.path):
+            log.info(f"No HTTP cache found at '{self.path}'. Starting with an empty cache.")
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            log.info(f"Loaded {len(entries)} HTTP cache entries from '{self.path}'.")
+            return entries
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not read HTTP cache '{self.path}': {e}. Starting with an empty cache.")
+            return {}
+
+    @staticmethod
+    def _hash_content(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    def get_conditional_headers(self, url: str) -> Dict[str, str]:
+        """Returns the If-None-Match/If-Modified-Since headers for a cached URL."""
+        with self._lock:
+            entry = self._entries.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def is_unchanged(self, url: str, response: requests.Response) -> bool:
+        """Checks whether the response repeats the cached page.
+
+        A 304 response or a body whose hash matches the previous run counts as unchanged.
+        The cache itself is left as it is; see `record`.
+        """
+        if response.status_code == 304:
+            log.debug(f"Server reported {url} as not modified.")
+            return True
+
+        content_hash = self._hash_content(response.content)
+        with self._lock:
+            entry = self._entries.get(url)
+            unchanged = entry is not None and entry.get('content_hash') == content_hash
+
+        if unchanged:
+            log.debug(f"Content of {url} matches the cached hash.")
+        return unchanged
+
+    def record(self, url: str, response: requests.Response):
+        """Stores the validators and body hash of a page whose offers were processed.
+
+        Pages are recorded only once handled, so a page that was downloaded but never
+        parsed is not skipped as unchanged on the next run.
+        """
+        if response.status_code == 304:
+            return
+
+        entry = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': self._hash_content(response.content),
+        }
+        with self._lock:
+            self._entries[url] = entry
+            self._dirty = True
+
+    def save(self):
+        """Writes the cache to disk if it changed since it was loaded."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = dict(self._entries)
+            self._dirty = False
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f)
+            os.replace(tmp_path, self.path)
+            log.info(f"Saved {len(entries)} HTTP cache entries to '{self.path}'.")
+        except OSError as e:
+            log.error(f"Failed to save HTTP cache to '{self.path}': {e}", exc_info=True)
@@ -1,11 +1,50 @@
-import psycopg2
+import uuid
+from datetime import date, datetime
+from contextlib import contextmanager
+from psycopg2 import sql
+from psycopg2.extras import execute_values
 from src.main.config.logger_config import log
 from src.main.model.JobOffer import JobOffer
-from typing import List
+from src.main.model.OfferBatch import OfferBatch
+from src.main.model.Salary import parse_salary
+from src.main.persistance.ConnectionPool import ConnectionPool, get_shared_pool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
+# Rows sent per INSERT statement, i.e. per network round trip
+INSERT_PAGE_SIZE = 500
+# Rows fetched per round trip when streaming from a server-side cursor
+READ_ITERSIZE = 2000
+# Offers per page of read_page
+PAGE_SIZE = 500
+OFFER_COLUMNS = ('url', 'title', 'company', 'location', 'salary', 'site_id', 'add_info', 'scraped_at')
+# Parsed from the salary text when an offer is inserted
+SALARY_COLUMNS = ('salary_min', 'salary_max', 'salary_unit', 'salary_gross')
+# Midpoint of the parsed salary range, the value salary statistics are computed on
+SALARY_VALUE = sql.SQL("(salary_min + salary_max) / 2")
+# Orders offers newest first; (url, title) is the primary key, so the order is total
+RECENCY_KEY = ('scraped_at', 'url', 'title')
+# Columns missing from tables created by earlier versions, added by create_table
+ADDED_COLUMNS = {
+    'scraped_at': 'TIMESTAMPTZ NOT NULL DEFAULT now()',
+    'last_seen_at': 'TIMESTAMPTZ NOT NULL DEFAULT now()',
+    'salary_min': 'DOUBLE PRECISION',
+    'salary_max': 'DOUBLE PRECISION',
+    'salary_unit': 'TEXT',
+    'salary_gross': 'BOOLEAN',
+}
+INDEXES = {
+    'data_scraped_at_idx': '(scraped_at)',
+    'data_recency_idx': '(scraped_at DESC, url DESC, title DESC)',
+}
+
+def _contains_pattern(text: str) -> str:
+    """LIKE pattern matching any value that contains `text`."""
+    escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f"%{escaped}%"
+
 class DatabaseConfig:
     def __init__(self, name='postgres'):
         self.name = name
@@ -16,98 +55,401 @@ class DatabaseConfig:
         self.supabase_password = os.getenv('SUPABASE_DB_PASSWORD')
         self.supabase_port = os.getenv('SUPABASE_DB_PORT')
         
-    def connect_to_database(self):
+    def get_pool(self) -> ConnectionPool:
         # For Supabase, we don't need to specify a different database name
-        log.info(f"Connecting to Supabase database")
-        conn = psycopg2.connect(
+        return get_shared_pool(
             host=self.supabase_host,
             database=self.supabase_database,
             user=self.supabase_user,
             password=self.supabase_password,
             port=self.supabase_port
         )
-        conn.autocommit = True
-        cursor = conn.cursor()
-        log.info(f"Connected to Supabase database")
-
-        return conn, cursor
 
-    def disconnect_from_database(self, conn, cursor):
-        cursor.close()
-        conn.close()
-        log.info(f"Disconnected from Supabase database")
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrows a connection from the shared pool; the transaction commits when the block exits."""
+        with self.get_pool().connection() as conn:
+            yield conn
 
+    @contextmanager
+    def cursor(self) -> Iterator[Any]:
+        with self.connection() as conn:
+            with conn.cursor() as cursor:
+                yield cursor
 
     def create_table(self):
-        conn, cursor = self.connect_to_database()
-
         log.info("Creating 'data' table.")
-        cursor.execute("""
-                CREATE TABLE IF NOT EXISTS data (
-                    url TEXT,
-                    title TEXT,
-                    company TEXT,
-                    location TEXT,
-                    salary TEXT,
-                    site_id TEXT,
-                    add_info TEXT,
-                    PRIMARY KEY (url, title)
-                )
-            """)
-        log.info("Table 'data' has been created.")
+        with self.cursor() as cursor:
+            cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS data (
+                        url TEXT,
+                        title TEXT,
+                        company TEXT,
+                        location TEXT,
+                        salary TEXT,
+                        site_id TEXT,
+                        add_info TEXT,
+                        scraped_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        last_seen_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+                        salary_min DOUBLE PRECISION,
+                        salary_max DOUBLE PRECISION,
+                        salary_unit TEXT,
+                        salary_gross BOOLEAN,
+                        PRIMARY KEY (url, title)
+                    )
+                """)
+            # ALTER TABLE and CREATE INDEX lock the table even when there is nothing to do, so the
+            # catalog is checked first and an up-to-date table is left alone on every refresh.
+            cursor.execute("""
+                    SELECT column_name FROM information_schema.columns
+                    WHERE table_schema = current_schema() AND table_name = 'data'
+                """)
+            existing_columns = {name for (name,) in cursor.fetchall()}
+            missing_columns = [column for column in ADDED_COLUMNS if column not in existing_columns]
+            if missing_columns:
+                log.info(f"Adding columns {missing_columns} to the 'data' table.")
+                cursor.execute(sql.SQL("ALTER TABLE data {}").format(sql.SQL(', ').join(
+                    sql.SQL("ADD COLUMN IF NOT EXISTS {} {}").format(sql.Identifier(column), sql.SQL(ADDED_COLUMNS[column]))
+                    for column in missing_columns)))
 
-        self.disconnect_from_database(conn, cursor)
+            cursor.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'data'")
+            existing_indexes = {name for (name,) in cursor.fetchall()}
+            for index, key in INDEXES.items():
+                if index not in existing_indexes:
+                    cursor.execute(sql.SQL("CREATE INDEX IF NOT EXISTS {} ON data {}").format(sql.Identifier(index), sql.SQL(key)))
 
-    def insert_data(self, data):
-        conn, cursor = self.connect_to_database()
-        inserted_offers: List[JobOffer] = []
+            if 'salary_min' in missing_columns:
+                self._backfill_salaries(cursor)
+        log.info("Table 'data' has been created.")
+
+    def _backfill_salaries(self, cursor):
+        """Fills the parsed salary columns of offers stored before they existed."""
+        cursor.execute("SELECT DISTINCT salary FROM data WHERE salary IS NOT NULL")
+        parsed = [(text, salary.minimum, salary.maximum, salary.unit, salary.gross)
+                  for (text,) in cursor.fetchall() for salary in [parse_salary(text)] if salary]
+        if not parsed:
+            return
+        execute_values(
+            cursor,
+            """
+            UPDATE data
+            SET salary_min = parsed.salary_min, salary_max = parsed.salary_max,
+                salary_unit = parsed.salary_unit, salary_gross = parsed.salary_gross
+            FROM (VALUES %s) AS parsed (salary, salary_min, salary_max, salary_unit, salary_gross)
+            WHERE data.salary = parsed.salary
+            """,
+            parsed,
+            template="(%s, %s::float8, %s::float8, %s, %s::boolean)",
+            page_size=INSERT_PAGE_SIZE
+        )
+        log.info(f"Parsed {len(parsed)} distinct salary texts of existing offers.")
 
-        log.info(f"Saving data to '{self.name}'.")
+    def insert_data(self, data: Iterable[JobOffer]) -> List[JobOffer]:
+        # Duplicates inside one batch would be reported once by RETURNING; keep the first like row-by-row inserts did.
+        records: Dict[Tuple[str, str], JobOffer] = {}
         for record in data:
-            cursor.execute("""
-                        INSERT INTO data (title, company, location, salary, url, site_id, add_info)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (url, title) DO NOTHING
-                        """,
-                           (record.title,
-                            record.company,
-                            record.location,
-                            record.salary,
-                            record.url,
-                            record.site_id,
-                            record.add_info)
-                           )
-            if cursor.rowcount == 1:
-                inserted_offers.append(record)
+            records.setdefault((record.url, record.title), record)
+        if not records:
+            log.info("No offers to insert.")
+            return []
+
+        log.info(f"Saving {len(records)} offers to '{self.name}'.")
+        with self.cursor() as cursor:
+            # Offers already stored only get last_seen_at refreshed; xmax = 0 marks rows that were inserted.
+            returned_rows = execute_values(
+                cursor,
+                """
+                INSERT INTO data (title, company, location, salary, url, site_id, add_info,
+                                  salary_min, salary_max, salary_unit, salary_gross)
+                VALUES %s
+                ON CONFLICT (url, title) DO UPDATE SET last_seen_at = EXCLUDED.last_seen_at
+                RETURNING url, title, scraped_at, (xmax = 0) AS inserted
+                """,
+                [self._insert_row(record) for record in records.values()],
+                page_size=INSERT_PAGE_SIZE,
+                fetch=True
+            )
         log.info("Data has been saved.")
 
-        self.disconnect_from_database(conn, cursor)
+        inserted_offers: List[JobOffer] = []
+        inserted_at = {(url, title): scraped_at for url, title, scraped_at, inserted in returned_rows if inserted}
+        for key, record in records.items():
+            if key in inserted_at:
+                record.scraped_at = inserted_at[key]
+                inserted_offers.append(record)
         log.info(f"Inserted {len(inserted_offers)} offers into the database.")
         return inserted_offers
 
-    def reset_database(self):
-        conn, cursor = self.connect_to_database()
+    @staticmethod
+    def _insert_row(record: JobOffer) -> Tuple:
+        salary = parse_salary(record.salary)
+        return (record.title,
+                record.company,
+                record.location,
+                record.salary,
+                record.url,
+                record.site_id,
+                record.add_info,
+                salary.minimum if salary else None,
+                salary.maximum if salary else None,
+                salary.unit if salary else None,
+                salary.gross if salary else None)
 
+    def reset_database(self):
         log.info(f"Resetting data in Supabase.")
-        cursor.execute('TRUNCATE TABLE data RESTART IDENTITY')
+        with self.cursor() as cursor:
+            cursor.execute('TRUNCATE TABLE data RESTART IDENTITY')
         log.info(f"Data has been reset.")
 
-        self.disconnect_from_database(conn, cursor)
+    def read_data(self, columns: Optional[Sequence[str]] = None, filters: Optional[Dict[str, Any]] = None) -> OfferBatch:
+        """Loads the offers into a column-oriented OfferBatch; see iter_data for the arguments."""
+        columns = self._check_columns(columns, filters)
+        batch = OfferBatch()
+        for row in self._stream_rows(columns, filters or {}):
+            batch.append_row(columns, row)
+        return batch
+
+    def read_data_since(self, watermark: Optional[datetime], columns: Optional[Sequence[str]] = None) -> OfferBatch:
+        """Returns the offers scraped after `watermark`, oldest first; every offer when it is None.
+
+        Pass the largest `scraped_at` seen so far as the next watermark.
+        """
+        columns = self._check_columns(columns, None)
+        batch = OfferBatch()
+        for row in self._stream_rows(columns, {}, since=watermark):
+            batch.append_row(columns, row)
+        return batch
+
+    def find_stored_offers(self, keys: Iterable[Tuple[str, str]]) -> Set[Tuple[str, str]]:
+        """Returns which of the (url, title) keys belong to stored offers, in one primary key lookup."""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return set()
+        with self.cursor() as cursor:
+            rows = execute_values(
+                cursor,
+                "SELECT url, title FROM data WHERE (url, title) IN (VALUES %s)",
+                keys,
+                page_size=len(keys),
+                fetch=True
+            )
+        return {(url, title) for url, title in rows}
 
-    def read_data(self):
-        conn, cursor = self.connect_to_database()
+    def read_page(self, after: Optional[Tuple[datetime, str, str]] = None, limit: int = PAGE_SIZE,
+                  columns: Optional[Sequence[str]] = None) -> Tuple[OfferBatch, Optional[Tuple[datetime, str, str]]]:
+        """Returns one page of offers, newest first, and the cursor of the next page.
+
+        Pages are keyset-paginated on (scraped_at, url, title): pass the returned cursor as
+        `after` to read the following page. The cursor is None after the last page. Offers
+        inserted while paging are newer than the cursor and never shift the later pages.
+        """
+        columns = self._check_columns(columns, None)
+        # The cursor is taken from the last row, so the key columns are always read
+        columns += tuple(column for column in RECENCY_KEY if column not in columns)
+        key = sql.SQL(', ').join(map(sql.Identifier, RECENCY_KEY))
+        query = sql.SQL("SELECT {} FROM data").format(sql.SQL(', ').join(map(sql.Identifier, columns)))
+        params: List[Any] = []
+        if after is not None:
+            query = sql.SQL("{} WHERE ({}) < (%s, %s, %s)").format(query, key)
+            params.extend(after)
+        query = sql.SQL("{} ORDER BY {} LIMIT %s").format(
+            query, sql.SQL(', ').join(sql.SQL("{} DESC").format(sql.Identifier(column)) for column in RECENCY_KEY))
+        params.append(limit)
+
+        with self.cursor() as cursor:
+            cursor.execute(query, params)
+            rows = cursor.fetchall()
+        batch = OfferBatch()
+        for row in rows:
+            batch.append_row(columns, row)
+        log.info(f"Read a page of {len(rows)} offers.")
+
+        if len(rows) < limit:
+            return batch, None
+        last = dict(zip(columns, rows[-1]))
+        return batch, tuple(last[column] for column in RECENCY_KEY)
+
+    def iter_data(self, columns: Optional[Sequence[str]] = None, filters: Optional[Dict[str, Any]] = None,
+                  itersize: int = READ_ITERSIZE, since: Optional[datetime] = None) -> Iterator[JobOffer]:
+        """Streams offers through a server-side cursor, fetching `itersize` rows per round trip.
+
+        Args:
+            columns: Offer columns to load; the remaining JobOffer attributes stay None.
+            filters: Column equality filters. A list or tuple value matches any of its items,
+                     None matches NULL.
+            since: Only offers with scraped_at after this timestamp, ordered by scraped_at.
+        """
+        columns = self._check_columns(columns, filters)
+        for row in self._stream_rows(columns, filters or {}, itersize, since):
+            values = dict.fromkeys(OFFER_COLUMNS)
+            values.update(zip(columns, row))
+            yield JobOffer(**values)
+
+    @staticmethod
+    def _check_columns(columns: Optional[Sequence[str]], filters: Optional[Dict[str, Any]]) -> Tuple[str, ...]:
+        columns = tuple(columns) if columns else OFFER_COLUMNS
+        unknown = [column for column in (*columns, *(filters or {})) if column not in OFFER_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown offer columns: {unknown}")
+        return columns
+
+    def _stream_rows(self, columns: Sequence[str], filters: Dict[str, Any], itersize: int = READ_ITERSIZE,
+                     since: Optional[datetime] = None) -> Iterator[Tuple]:
+        query, params = self._build_select(columns, filters, since)
 
         log.info(f"Reading data from Supabase.")
-        cursor.execute('SELECT * FROM data')
-        db_offers = cursor.fetchall()
-        log.info(f"Data has been read.")
-        self.disconnect_from_database(conn, cursor)
+        with self.connection() as conn:
+            # A named cursor keeps the result set on the server and streams it in batches.
+            with conn.cursor(name=f"read_data_{uuid.uuid4().hex}") as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                count = 0
+                for row in cursor:
+                    count += 1
+                    yield row
+        log.info(f"Data has been read. {count} offers streamed.")
+
+    def get_table_state(self) -> Tuple[int, Optional[datetime]]:
+        """Returns the row count and newest scraped_at, which change whenever offers are added or removed."""
+        with self.cursor() as cursor:
+            cursor.execute("SELECT count(*), max(scraped_at) FROM data")
+            row_count, newest = cursor.fetchone()
+        return row_count, newest
+
+    def count_offers(self) -> Tuple[int, int]:
+        """Returns the number of stored offers and how many of them have no salary text."""
+        with self.cursor() as cursor:
+            cursor.execute("SELECT count(*), count(*) FILTER (WHERE salary IS NULL OR btrim(salary) = '') FROM data")
+            total, without_salary = cursor.fetchone()
+        return total, without_salary
+
+    def get_salary_aggregates(self, percentiles: Sequence[float], group_by: Optional[str] = None,
+                              unit: Optional[str] = None, position_keywords: Optional[Dict[str, List[str]]] = None,
+                              other_position_type: str = 'Inne') -> List[Tuple]:
+        """Aggregates the midpoints of the parsed salary ranges inside the database.
+
+        Args:
+            percentiles: Percentiles to compute, from 0 to 100.
+            group_by: None for one overall row, 'site_id', or 'position_type' to group by the
+                      first category of `position_keywords` matching the title.
+            unit: Only salaries with this unit, e.g. 'hourly'.
+
+        Returns:
+            (group, count, average, minimum, maximum, [percentile values]) rows, ordered by group.
+        """
+        params: List[Any] = [[p / 100 for p in percentiles]]
+        if group_by is None:
+            group = sql.SQL("NULL")
+        elif group_by == 'site_id':
+            group = sql.Identifier('site_id')
+        elif group_by == 'position_type':
+            group, case_params = self._position_type_case(position_keywords or {}, other_position_type)
+            params += case_params
+        else:
+            raise ValueError(f"Cannot group salaries by '{group_by}'")
+        condition, condition_params = self._salary_condition(unit)
+        params += condition_params
+
+        query = sql.SQL("""
+            SELECT grp, count(*), avg(value), min(value), max(value),
+                   percentile_cont(%s::float8[]) WITHIN GROUP (ORDER BY value)
+            FROM (SELECT {group} AS grp, {value} AS value FROM data WHERE {condition}) AS salaries
+            GROUP BY grp
+            ORDER BY grp
+        """).format(group=group, value=SALARY_VALUE, condition=condition)
+        with self.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def get_position_type_counts(self, position_keywords: Dict[str, List[str]],
+                                 other_position_type: str = 'Inne') -> Dict[str, int]:
+        """Counts the offers per position type inside the database; only the counts are sent back.
+
+        An offer belongs to the first category of `position_keywords` with a keyword in its
+        lowercased title, or to `other_position_type`.
+        """
+        position_type, params = self._position_type_case(position_keywords, other_position_type)
+        query = sql.SQL("SELECT {} AS position_type, count(*) FROM data GROUP BY position_type").format(position_type)
+        with self.cursor() as cursor:
+            cursor.execute(query, params)
+            return dict(cursor.fetchall())
+
+    def get_site_trends(self) -> List[Tuple[Optional[str], date, int]]:
+        """Counts the offers scraped per site and UTC day, as (site_id, day, count) rows ordered by day."""
+        with self.cursor() as cursor:
+            cursor.execute("""
+                SELECT site_id, (scraped_at AT TIME ZONE 'UTC')::date AS day, count(*)
+                FROM data
+                GROUP BY site_id, day
+                ORDER BY day, site_id
+            """)
+            return cursor.fetchall()
+
+    def get_salary_histogram(self, bin_edges: Sequence[float], unit: Optional[str] = None) -> List[int]:
+        """Counts the salary midpoints per bin; like numpy.histogram the last bin includes its right edge."""
+        bins = len(bin_edges) - 1
+        condition, params = self._salary_condition(unit)
+        query = sql.SQL("""
+            SELECT LEAST(GREATEST(width_bucket({value}, %s::float8[]), 1), %s) AS bucket, count(*)
+            FROM data
+            WHERE {condition}
+            GROUP BY bucket
+        """).format(value=SALARY_VALUE, condition=condition)
+        with self.cursor() as cursor:
+            cursor.execute(query, [list(bin_edges), bins, *params])
+            rows = cursor.fetchall()
+        counts = [0] * bins
+        for bucket, count in rows:
+            counts[bucket - 1] = count
+        return counts
+
+    @staticmethod
+    def _salary_condition(unit: Optional[str]) -> Tuple[sql.Composable, List[Any]]:
+        if unit is None:
+            return sql.SQL("salary_min IS NOT NULL"), []
+        return sql.SQL("salary_min IS NOT NULL AND salary_unit = %s"), [unit]
+
+    @staticmethod
+    def _position_type_case(position_keywords: Dict[str, List[str]], other_position_type: str) -> Tuple[sql.Composable, List[Any]]:
+        """Builds a CASE expression naming the first category with a keyword in the lowercased title.
 
-        offers_to_return: List[JobOffer] = []
-        for offer in db_offers:
-            offers_to_return.append(JobOffer(offer[1], offer[2], offer[3], offer[4], offer[0], offer[5], offer[6]))
+        Keywords are matched literally, so LIKE wildcards in them are escaped. A NULL title
+        falls through to `other_position_type`.
+        """
+        branches = []
+        params: List[Any] = []
+        for position_type, keywords in position_keywords.items():
+            if not keywords:
+                continue
+            branches.append(sql.SQL("WHEN lower(title) LIKE ANY(%s) THEN %s"))
+            params += [[_contains_pattern(keyword.lower()) for keyword in keywords], position_type]
+        params.append(other_position_type)
+        if not branches:
+            return sql.SQL("%s::text"), params
+        return sql.SQL("CASE {} ELSE %s END").format(sql.SQL(' ').join(branches)), params
 
-        return offers_to_return
+    def _build_select(self, columns: Sequence[str], filters: Dict[str, Any],
+                      since: Optional[datetime] = None) -> Tuple[sql.Composed, List[Any]]:
+        query = sql.SQL("SELECT {} FROM data").format(sql.SQL(', ').join(map(sql.Identifier, columns)))
+        conditions = []
+        params: List[Any] = []
+        for column, value in filters.items():
+            if value is None:
+                conditions.append(sql.SQL("{} IS NULL").format(sql.Identifier(column)))
+            elif isinstance(value, (list, tuple, set, frozenset)):
+                conditions.append(sql.SQL("{} = ANY(%s)").format(sql.Identifier(column)))
+                params.append(list(value))
+            else:
+                conditions.append(sql.SQL("{} = %s").format(sql.Identifier(column)))
+                params.append(value)
+        if since is not None:
+            conditions.append(sql.SQL("scraped_at > %s"))
+            params.append(since)
+        if conditions:
+            query = sql.SQL("{} WHERE {}").format(query, sql.SQL(' AND ').join(conditions))
+        if since is not None:
+            query = sql.SQL("{} ORDER BY scraped_at").format(query)
+        return query, params
 
 if __name__ == '__main__':
     dc = DatabaseConfig()
@@ -1,5 +1,6 @@
 import smtplib
 import os
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from dotenv import load_dotenv
@@ -8,6 +9,9 @@ from src.main.config.logger_config import log
 # Load environment variables
 load_dotenv()
 
+# Tries per recipient; a dropped session is reopened between them
+SEND_ATTEMPTS = 2
+
 class EmailSenderService:
     def __init__(self):
         log.info("Initializing EmailSenderService")
@@ -55,45 +59,75 @@ class EmailSenderService:
         
         log.info(f"Preparing to send emails to {len(to_emails)} recipients")
         results = {}
-        
-        for to_email in to_emails:
-            log.info(f"Attempting to send email to: {to_email}")
-            try:
-                # Create message
-                msg = MIMEMultipart()
-                msg['From'] = self.from_email
-                msg['To'] = to_email
-                msg['Subject'] = subject
-                
-                # Add body to email
-                msg.attach(MIMEText(body, 'plain'))
-                log.debug(f"Email message created for {to_email}")
-                
-                # Create SMTP session
-                log.debug(f"Connecting to SMTP server: {self.smtp_server}:{self.smtp_port}")
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                server.starttls()  # Enable security
-                log.debug("STARTTLS enabled")
-                
-                server.login(self.from_email, self.password)
-                log.debug("SMTP authentication successful")
-                
-                # Send email
-                text = msg.as_string()
-                server.sendmail(self.from_email, to_email, text)
-                server.quit()
-                log.debug("SMTP connection closed")
-                
-                log.info(f"Email sent successfully to {to_email}")
-                print(f"Email sent successfully to {to_email}")
-                results[to_email] = True
-                
-            except Exception as e:
-                log.error(f"Error sending email to {to_email}: {str(e)}")
-                print(f"Error sending email to {to_email}: {str(e)}")
-                results[to_email] = False
-        
+        # One authenticated session is shared by all recipients and reopened if the server drops it
+        server = None
+
+        try:
+            for to_email in to_emails:
+                log.info(f"Attempting to send email to: {to_email}")
+                try:
+                    # Create message
+                    msg = MIMEMultipart()
+                    msg['From'] = self.from_email
+                    msg['To'] = to_email
+                    msg['Subject'] = subject
+
+                    # Add body to email
+                    msg.attach(MIMEText(body, 'plain'))
+                    log.debug(f"Email message created for {to_email}")
+
+                    text = msg.as_string()
+                    for attempt in range(1, SEND_ATTEMPTS + 1):
+                        try:
+                            if server is None:
+                                server = self._connect()
+                            server.sendmail(self.from_email, to_email, text)
+                            break
+                        except (smtplib.SMTPServerDisconnected, ConnectionError) as e:
+                            self._close(server)
+                            server = None
+                            if attempt == SEND_ATTEMPTS:
+                                raise
+                            log.warning(f"SMTP session lost ({e}), reconnecting")
+
+                    log.info(f"Email sent successfully to {to_email}")
+                    print(f"Email sent successfully to {to_email}")
+                    results[to_email] = True
+
+                except Exception as e:
+                    log.error(f"Error sending email to {to_email}: {str(e)}")
+                    print(f"Error sending email to {to_email}: {str(e)}")
+                    results[to_email] = False
+        finally:
+            self._close(server)
+
         successful_sends = sum(1 for success in results.values() if success)
         log.info(f"Email sending completed. {successful_sends}/{len(to_emails)} emails sent successfully")
-        
-        return results
\ No newline at end of file
+
+        return results
+
+    def _connect(self) -> smtplib.SMTP:
+        """Opens an SMTP session with STARTTLS and logs in."""
+        log.debug(f"Connecting to SMTP server: {self.smtp_server}:{self.smtp_port}")
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()  # Enable security
+            log.debug("STARTTLS enabled")
+
+            server.login(self.from_email, self.password)
+            log.debug("SMTP authentication successful")
+        except Exception:
+            self._close(server)
+            raise
+        return server
+
+    @staticmethod
+    def _close(server: Optional[smtplib.SMTP]):
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (smtplib.SMTPException, OSError):
+            # The connection is already gone
+            server.close()
+        log.debug("SMTP connection closed")
@@ -0,0 +1,48 @@
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from src.main.model.JobOffer import JobOffer
+from src.main.config.logger_config import log
+
+DEFAULT_BATCH_SIZE = 100
+
+class PipelineService:
+    """Streams scraped offers into the database in batches while the crawl is still running."""
+
+    def __init__(self, scraper, database, settings: Optional[Dict[str, Any]] = None):
+        self.scraper = scraper
+        self.database = database
+        self.settings = settings or {}
+        self.batch_size = max(1, int(self.settings.get('batchSize', DEFAULT_BATCH_SIZE)))
+        log.info(f"PipelineService initialized with batch size {self.batch_size}")
+
+    def run(self, stop: Optional[threading.Event] = None) -> Iterator[List[JobOffer]]:
+        """Yields the offers newly inserted by each database batch.
+
+        Setting `stop` ends the crawl at once; the offers scraped so far are still stored.
+        """
+        return self.store_batches(self.scraper.stream_all_sites(stop))
+
+    def store_batches(self, offer_batches: Iterable[List[JobOffer]]) -> Iterator[List[JobOffer]]:
+        pending: List[JobOffer] = []
+        scraped = 0
+        inserted = 0
+
+        for offers in offer_batches:
+            pending.extend(offers)
+            scraped += len(offers)
+            if len(pending) >= self.batch_size:
+                new_offers = self._flush(pending)
+                inserted += len(new_offers)
+                pending = []
+                yield new_offers
+
+        if pending:
+            new_offers = self._flush(pending)
+            inserted += len(new_offers)
+            yield new_offers
+
+        log.info(f"Pipeline finished. Scraped {scraped} offers, inserted {inserted} new offers.")
+
+    def _flush(self, offers: List[JobOffer]) -> List[JobOffer]:
+        log.info(f"Saving a batch of {len(offers)} offers")
+        return self.database.insert_data(offers)
@@ -0,0 +1,104 @@
+import queue
+import threading
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from src.main.config.logger_config import log
+from src.main.config.SitesConfigLoader import ConfigLoader
+from src.main.service.PipelineService import PipelineService
+from src.main.service.ScraperService import ScraperService
+
+# Kinds of the messages returned by RefreshWorker.poll
+OFFERS = 'offers'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class RefreshWorker:
+    """Scrapes the configured sites and stores the offers on a background thread.
+
+    The worker never touches the GUI. It posts messages that the Tk main loop collects
+    with `poll`, scheduled through `app.after`:
+      (OFFERS, offers)   newly stored offers, sent after each database batch
+      (DONE, cancelled)  the refresh ended, with or without cancellation
+      (FAILED, error)    the refresh stopped on an exception
+    Offers stored since `since` by other runs are sent before DONE, so the caller may
+    receive offers it already has and should skip them.
+    """
+
+    def __init__(self, database, since: Optional[datetime] = None):
+        self.database = database
+        self.since = since
+        self._messages: queue.Queue = queue.Queue()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="refresh", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        """Stops the crawl at once; the offers scraped so far are still stored and kept."""
+        log.info("Cancelling the refresh")
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def join(self, timeout: Optional[float] = None):
+        self._thread.join(timeout)
+
+    def poll(self) -> List[Tuple[str, Any]]:
+        """Returns the messages posted since the previous call, oldest first."""
+        messages = []
+        while True:
+            try:
+                messages.append(self._messages.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def _run(self):
+        try:
+            self._refresh()
+        except Exception as e:
+            log.error(f"Refresh failed: {e}", exc_info=True)
+            self._messages.put((FAILED, e))
+        else:
+            self._messages.put((DONE, self.cancelled))
+
+    def _refresh(self):
+        log.info("Loading the configuration")
+        config = ConfigLoader()
+        websites = config.get_sites_config()
+        if self.cancelled:
+            return
+
+        log.info("Scraping and saving the data")
+        self.database.create_table()
+        # Lets pagination stop at the first page of offers that are already stored
+        scraper = ScraperService(websites, config.get_scraper_settings(), self.database.find_stored_offers)
+        completed = False
+        try:
+            # Cancelling stops the crawl and its retry waits at once, not at the next stored batch
+            batches = PipelineService(scraper, self.database, config.get_pipeline_settings()).run(self._cancelled)
+            try:
+                for new_offers in batches:
+                    if new_offers:
+                        self._messages.put((OFFERS, new_offers))
+                    if self.cancelled:
+                        break
+            finally:
+                # Stops the crawl workers when cancelled
+                batches.close()
+            completed = not self.cancelled
+        finally:
+            # Pages of an interrupted run may hold offers that were never stored
+            scraper.close(persist_cache=completed)
+
+        if completed:
+            # Picks up offers stored meanwhile by other runs
+            stored = list(self.database.read_data_since(self.since))
+            if stored:
+                self._messages.put((OFFERS, stored))
@@ -1,102 +1,406 @@
+import queue
+import random
 import requests
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from requests.adapters import HTTPAdapter
+from concurrent.futures import Future, ThreadPoolExecutor
+import soupsieve
 from bs4 import BeautifulSoup
-from typing import List, Dict, Optional, Any
+from bs4.builder import builder_registry
+from soupsieve import SoupSieve
+from typing import List, Dict, Optional, Any, Callable, Iterable, Iterator, Set, Tuple
 from src.main.model.JobOffer import JobOffer
+from src.main.persistance.HttpCache import HttpCache
 from src.main.config.logger_config import log 
 from urllib.parse import urljoin, urlparse
 
+DEFAULT_PARSER = 'lxml'
+FALLBACK_PARSER = 'html.parser'
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_PER_HOST_LIMIT = 2
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
 class ScraperService:
-    def __init__(self, sites_config: List[Dict[str, Any]]):
+    def __init__(self, sites_config: List[Dict[str, Any]], settings: Optional[Dict[str, Any]] = None,
+                 find_stored_offers: Optional[Callable[[List[Tuple[str, str]]], Set[Tuple[str, str]]]] = None):
         if not sites_config:
             log.warning("ScraperService initialized with no site configurations.")
         self.sites_config = sites_config
-        log.info(f"ScraperService initialized with {len(sites_config)} site configurations.")
+        self.settings = settings or {}
+        # Returns which of the given (url, title) keys are stored already; pagination stops
+        # at a page made only of stored offers.
+        self.find_stored_offers = find_stored_offers
+
+        concurrency = self.settings.get('concurrency') or {}
+        self.max_workers = max(1, int(concurrency.get('maxWorkers', DEFAULT_MAX_WORKERS)))
+        self.per_host_limit = max(1, int(concurrency.get('perHost', DEFAULT_PER_HOST_LIMIT)))
+        self._host_semaphores: Dict[str, threading.Semaphore] = {}
+        self._host_semaphores_lock = threading.Lock()
+
+        http = self.settings.get('http') or {}
+        self.pool_size = max(1, int(http.get('poolSize', DEFAULT_POOL_SIZE)))
+        self.timeout = float(http.get('timeout', DEFAULT_TIMEOUT))
+        self.max_retries = max(0, int(http.get('maxRetries', DEFAULT_MAX_RETRIES)))
+        self.backoff_factor = float(http.get('backoffFactor', DEFAULT_BACKOFF_FACTOR))
+        self.max_backoff = float(http.get('maxBackoff', DEFAULT_MAX_BACKOFF))
+        self.session = self._create_session()
+
+        self.parser = self._resolve_parser(self.settings.get('parser', DEFAULT_PARSER))
+
+        cache = self.settings.get('cache') or {}
+        self.http_cache = HttpCache(cache['path']) if cache.get('enabled') and cache.get('path') else None
+
+        log.info(f"ScraperService initialized with {len(sites_config)} site configurations "
+                 f"(max workers: {self.max_workers}, per host: {self.per_host_limit}, pool size: {self.pool_size}).")
+
+    @staticmethod
+    def _resolve_parser(parser: str) -> str:
+        """Returns the configured BeautifulSoup tree builder, or html.parser when it is not installed."""
+        if builder_registry.lookup(parser) is None:
+            log.warning(f"HTML parser '{parser}' is not available. Falling back to '{FALLBACK_PARSER}'.")
+            return FALLBACK_PARSER
+        return parser
+
+    def _compile_selectors(self, site_id: str, selectors: Dict[str, Optional[str]]) -> Optional[Dict[str, SoupSieve]]:
+        """Compiles every configured CSS selector of a site once, so boxes are matched without re-parsing them."""
+        compiled: Dict[str, SoupSieve] = {}
+        for name, selector in selectors.items():
+            if not selector:
+                continue
+            try:
+                compiled[name] = soupsieve.compile(selector)
+            except soupsieve.SelectorSyntaxError as e:
+                log.error(f"Invalid '{name}' selector '{selector}' for site '{site_id}': {e}")
+                return None
+        return compiled
+
+    def _create_session(self) -> requests.Session:
+        """Creates the keep-alive session shared by every scrape of this service."""
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        # Retries are handled in _fetch so that Retry-After and jitter can be honoured per request.
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def close(self, persist_cache: bool = True):
+        """Closes the pooled connections held by the session and persists the HTTP cache.
 
-    def _get_element_text(self, parent_element: BeautifulSoup, selector: str) -> Optional[str]:
-        element = parent_element.select_one(selector)
+        Call it only once the scraped offers are stored: pages recorded in the cache
+        are skipped as unchanged on the next run. Pass persist_cache=False when the
+        run was interrupted before all its offers were stored.
+        """
+        self.session.close()
+        if self.http_cache and persist_cache:
+            self.http_cache.save()
+        log.debug("ScraperService HTTP session closed.")
+
+    def _get_host_semaphore(self, url: str) -> threading.Semaphore:
+        """Returns the semaphore limiting concurrent requests to the host of the given URL."""
+        host = urlparse(url).netloc.lower()
+        with self._host_semaphores_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.Semaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _get_retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Returns the seconds to wait before retry number `attempt` (0-based).
+
+        A Retry-After header sent with the response wins; otherwise exponential
+        backoff with full jitter is used. Both are capped at max_backoff.
+        """
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    retry_at = parsedate_to_datetime(retry_after)
+                    if retry_at.tzinfo is None:
+                        retry_at = retry_at.replace(tzinfo=timezone.utc)
+                    delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+                except (TypeError, ValueError):
+                    log.debug(f"Ignoring unparsable Retry-After header: '{retry_after}'")
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * (2 ** attempt)))
+
+    @staticmethod
+    def _wait_for_retry(delay: float, stop: Optional[threading.Event]) -> bool:
+        """Sleeps before a retry; returns True, as soon as it happens, when `stop` is set meanwhile."""
+        if stop is None:
+            time.sleep(delay)
+            return False
+        return stop.wait(delay)
+
+    def _fetch(self, url: str, site_id: str, timeout: Optional[float] = None,
+               headers: Optional[Dict[str, str]] = None, stop: Optional[threading.Event] = None) -> requests.Response:
+        """GETs the URL through the pooled session, retrying 429/5xx responses and network errors.
+
+        Setting `stop` cuts a retry wait short; the failure that caused the retry is raised.
+        """
+        timeout = timeout if timeout is not None else self.timeout
+        request_kwargs = {'timeout': timeout}
+        if headers:
+            request_kwargs['headers'] = headers
+        for attempt in range(self.max_retries + 1):
+            is_last_attempt = attempt == self.max_retries
+            try:
+                with self._get_host_semaphore(url):
+                    response = self.session.get(url, **request_kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if is_last_attempt:
+                    raise
+                delay = self._get_retry_delay(attempt)
+                log.warning(f"Request to {url} for site '{site_id}' failed ({e}). Retrying in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{self.max_retries}).")
+                if self._wait_for_retry(delay, stop):
+                    raise
+                continue
+
+            if response.status_code in RETRY_STATUS_CODES and not is_last_attempt:
+                delay = self._get_retry_delay(attempt, response)
+                log.warning(f"Received status {response.status_code} from {url} for site '{site_id}'. Retrying in {delay:.2f}s "
+                            f"(attempt {attempt + 1}/{self.max_retries}).")
+                response.close()
+                if self._wait_for_retry(delay, stop):
+                    response.raise_for_status()
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def _get_element_text(self, parent_element: BeautifulSoup, selector: Optional[SoupSieve]) -> Optional[str]:
+        if selector is None:
+            return None
+        element = selector.select_one(parent_element)
         if element:
             return element.get_text(strip=True)
-        log.debug(f"Element not found with selector '{selector}' in parent.")
+        log.debug(f"Element not found with selector '{selector.pattern}' in parent.")
         return None
 
-    def _get_element_href(self, parent_element: BeautifulSoup, selector: str, base_url: Optional[str] = None) -> Optional[str]:
-        element = parent_element.select_one(selector)
+    def _get_element_href(self, parent_element: BeautifulSoup, selector: SoupSieve, base_url: Optional[str] = None) -> Optional[str]:
+        element = selector.select_one(parent_element)
         if element and element.has_attr('href'):
             href = element['href']
             if base_url and not href.startswith(('http://', 'https://')):
                 return urljoin(base_url, href)
             return href
-        log.debug(f"Href not found for selector '{selector}' or element missing 'href' attribute.")
+        log.debug(f"Href not found for selector '{selector.pattern}' or element missing 'href' attribute.")
         return None
 
     def scrape_site(self, site_config: Dict[str, Any]) -> List[JobOffer]:
         site_id = site_config.get('id', 'UnknownSite') # Use .get for safer access
+        job_offers: List[JobOffer] = []
+        for page_offers in self.iter_site_pages(site_config):
+            job_offers.extend(page_offers)
+
+        log.info(f"Finished scraping site '{site_id}'. Found {len(job_offers)} valid job offers.")
+        return job_offers
+
+    def iter_site_pages(self, site_config: Dict[str, Any], stop: Optional[threading.Event] = None) -> Iterator[List[JobOffer]]:
+        """Yields the offers of each listing page of a site.
+
+        Page N+1 is requested in the background while page N is being parsed.
+        Crawling stops after `pagination.maxPages` pages, when no next page can be
+        determined, when a page holds only offers that were already seen, or when
+        `stop` is set.
+        """
+        site_id = site_config.get('id', 'UnknownSite')
         url = site_config.get('url')
         selectors = site_config.get('selectors')
 
         if not url or not selectors:
             log.error(f"Missing 'url' or 'selectors' in site config for site_id '{site_id}'. Skipping.")
-            return []
-        
-        log.info(f"Starting to scrape site: '{site_id}' from URL: {url}")
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-
-        try:
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status() 
-            log.debug(f"Successfully fetched URL: {url} with status code {response.status_code}")
-        except requests.RequestException as e:
-            log.error(f"Error fetching {url} for site '{site_id}': {e}", exc_info=True)
-            return []
+            return
+
+        if not selectors.get('offerBox'):
+            log.warning(f"No 'offerBox' selector defined for site '{site_id}'. Cannot find offer items.")
+            return
+
+        if not selectors.get('title') or not selectors.get('url'):
+            log.error(f"Core selectors 'title' or 'url' are missing for site_id '{site_id}'. Cannot process offers.")
+            return
+
+        pagination = site_config.get('pagination') or {}
+        max_pages = max(1, int(pagination.get('maxPages', 1)))
+        url_template = pagination.get('urlTemplate')
+
+        compiled_selectors = self._compile_selectors(site_id, {**selectors, 'nextPage': pagination.get('nextPage')})
+        if compiled_selectors is None:
+            return
+        next_page_selector = compiled_selectors.pop('nextPage', None)
+        timeout = site_config.get('timeout')
+
+        log.info(f"Starting to scrape site: '{site_id}' from URL: {url} (up to {max_pages} pages)")
+
+        crawled_offers = set()
+        visited_urls = set()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"prefetch-{site_id}") as prefetcher:
+            def prefetch(next_url: Optional[str]) -> Optional[Future]:
+                if next_url and next_url not in visited_urls:
+                    return prefetcher.submit(self._fetch_page, next_url, site_id, timeout, stop)
+                return None
+
+            page_url = url
+            pending = prefetcher.submit(self._fetch_page, page_url, site_id, timeout, stop)
+            for page in range(1, max_pages + 1):
+                visited_urls.add(page_url)
+                try:
+                    response, unchanged = pending.result()
+                    log.debug(f"Successfully fetched URL: {page_url} with status code {response.status_code}")
+                except requests.RequestException as e:
+                    if stop is not None and stop.is_set():
+                        log.info(f"Crawl of '{site_id}' stopped while fetching {page_url}.")
+                    else:
+                        log.error(f"Error fetching {page_url} for site '{site_id}': {e}", exc_info=True)
+                    return
+
+                if unchanged:
+                    # The listing did not move since the last run, so neither did the pages after it.
+                    log.info(f"Page {page} of '{site_id}' is unchanged since the last run. Skipping parsing and further pages.")
+                    return
+
+                # A templated next URL is known up front, so that page downloads while this one is parsed.
+                next_url = url_template.format(page=page + 1) if url_template and page < max_pages else None
+                pending = prefetch(next_url)
+
+                soup = BeautifulSoup(response.content, self.parser)
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+                # A next page link is known only once the tree is built, so the download overlaps offer extraction only.
+                if not url_template and page < max_pages:
+                    next_url = self._get_next_page_url(soup, page_url, next_page_selector)
+                    pending = prefetch(next_url)
+
+                page_offers = self._parse_offers(soup, site_id, page_url, compiled_selectors, page)
+
+                keys = [(offer.url, offer.title) for offer in page_offers]
+                only_seen = bool(page_offers) and self._only_seen(keys, crawled_offers)
+
+                # Listings repeat promoted offers across pages; keep the first occurrence only.
+                unique_offers = []
+                for key, offer in zip(keys, page_offers):
+                    if key not in crawled_offers:
+                        crawled_offers.add(key)
+                        unique_offers.append(offer)
+                yield unique_offers
+                # Recorded only once the consumer took the offers, so a page it never got is fetched in full next time.
+                if self.http_cache:
+                    self.http_cache.record(page_url, response)
+
+                if only_seen:
+                    log.info(f"Page {page} of '{site_id}' contains only already seen offers. Stopping pagination.")
+                stopped = stop is not None and stop.is_set()
+                if only_seen or not page_offers or pending is None or stopped:
+                    self._cancel_prefetch(pending)
+                    return
+                page_url = next_url
+
+    def _only_seen(self, keys: List[Tuple[str, str]], crawled_offers: Set[Tuple[str, str]]) -> bool:
+        """Whether every key was crawled before or, by one lookup of the page's keys, is stored already."""
+        unseen = {key for key in keys if key not in crawled_offers}
+        if not unseen:
+            return True
+        if self.find_stored_offers is None:
+            return False
+        return unseen <= self.find_stored_offers(list(unseen))
+
+    def _fetch_page(self, url: str, site_id: str, timeout: Optional[float] = None,
+                    stop: Optional[threading.Event] = None) -> Tuple[requests.Response, bool]:
+        """Fetches a listing page, conditionally when it is cached.
+
+        Returns the response and whether it is unchanged since the last run.
+        """
+        if not self.http_cache:
+            return self._fetch(url, site_id, timeout, stop=stop), False
+
+        response = self._fetch(url, site_id, timeout, self.http_cache.get_conditional_headers(url), stop)
+        return response, self.http_cache.is_unchanged(url, response)
+
+    def _cancel_prefetch(self, pending: Optional[Future]):
+        if pending is not None and not pending.cancel():
+            # The request is already running; drain it so the connection returns to the pool.
+            try:
+                response, _ = pending.result()
+                response.close()
+            except requests.RequestException:
+                pass
+
+    def _get_next_page_url(self, soup: BeautifulSoup, page_url: str,
+                           next_page_selector: Optional[SoupSieve]) -> Optional[str]:
+        if next_page_selector is not None:
+            next_url = self._get_element_href(soup, next_page_selector, page_url)
+            if not next_url:
+                log.info(f"No next page link found on {page_url}. Last page reached.")
+            return next_url
+        return None
+
+    def _parse_offers(self, soup: BeautifulSoup, site_id: str, page_url: str,
+                      selectors: Dict[str, SoupSieve], page: int = 1) -> List[JobOffer]:
         job_offers: List[JobOffer] = []
 
-        offer_box_selector = selectors.get('offerBox')
-        if not offer_box_selector:
-            log.warning(f"No 'offerBox' selector defined for site '{site_id}'. Cannot find offer items.")
-            return []
+        # Matching boxes only inside the listing keeps selectors away from headers, ads and footers.
+        scope = soup
+        container_selector = selectors.get('offersContainer')
+        if container_selector is not None:
+            container = container_selector.select_one(soup)
+            if container is not None:
+                scope = container
+            else:
+                log.debug(f"Offers container '{container_selector.pattern}' not found on '{site_id}'. Searching the whole page.")
 
-        offer_boxes = soup.select(offer_box_selector)
+        offer_box_selector = selectors['offerBox']
+        offer_boxes = offer_box_selector.select(scope)
         if not offer_boxes:
-            log.warning(f"No offer boxes found for site '{site_id}' with selector '{offer_box_selector}'. Check selectors or website structure.")
-            log.debug(f"HTML snippet for {site_id} (first 2000 chars): {soup.prettify()[:2000]}") 
+            if page == 1:
+                log.warning(f"No offer boxes found for site '{site_id}' with selector '{offer_box_selector.pattern}'. Check selectors or website structure.")
+                log.debug(f"HTML snippet for {site_id} (first 2000 chars): {soup.prettify()[:2000]}")
+            else:
+                log.info(f"No offer boxes found on page {page} of '{site_id}'. Last page reached.")
             return []
-            
-        log.info(f"Found {len(offer_boxes)} potential offer items on '{site_id}'.")
 
-        title_selector = selectors.get('title')
-        url_selector = selectors.get('url')
+        log.info(f"Found {len(offer_boxes)} potential offer items on page {page} of '{site_id}'.")
 
-        if not title_selector or not url_selector:
-            log.error(f"Core selectors 'title' or 'url' are missing for site_id '{site_id}'. Cannot process offers.")
-            return []
+        title_selector = selectors['title']
+        url_selector = selectors['url']
+        company_selector = selectors.get('company')
+        location_selector = selectors.get('location')
+        salary_selector = selectors.get('salary')
+        add_info_selector = selectors.get('addInfo')
+        parsed_url = urlparse(page_url)
+        base_url_for_links = f"{parsed_url.scheme}://{parsed_url.netloc}"
 
         for i, box in enumerate(offer_boxes):
             log.debug(f"Processing item {i+1}/{len(offer_boxes)} for site '{site_id}'.")
             title = self._get_element_text(box, title_selector)
-            company = self._get_element_text(box, selectors.get('company'))
-            location = self._get_element_text(box, selectors.get('location'))
-            salary = self._get_element_text(box, selectors.get('salary'))
-            
-            parsed_url = urlparse(url)
-            base_url_for_links = f"{parsed_url.scheme}://{parsed_url.netloc}"
-            
+            company = self._get_element_text(box, company_selector)
+            location = self._get_element_text(box, location_selector)
+            salary = self._get_element_text(box, salary_selector)
+
             offer_url = self._get_element_href(box, url_selector, base_url_for_links)
             
             add_info = None
-            add_info_selector = selectors.get('addInfo')
-            if add_info_selector: 
-                add_info_element = box.select_one(add_info_selector)
+            if add_info_selector is not None:
+                add_info_element = add_info_selector.select_one(box)
                 if add_info_element:
                     items = [li.get_text(strip=True) for li in add_info_element.find_all('li')]
                     add_info = ", ".join(items) if items else add_info_element.get_text(strip=True)
                     log.debug(f"Extracted add_info for item {i+1} on '{site_id}': {add_info[:100]}...") 
                 else:
-                    log.debug(f"addInfo element not found for item {i+1} on '{site_id}' with selector '{add_info_selector}'.")
+                    log.debug(f"addInfo element not found for item {i+1} on '{site_id}' with selector '{add_info_selector.pattern}'.")
             else:
                 log.debug(f"'addInfo' selector not configured or empty for site '{site_id}'.")
 
@@ -115,8 +419,6 @@ class ScraperService:
             else:
                 log.warning(f"Skipping an item on '{site_id}' due to missing title or URL. Title: '{title}', URL: '{offer_url}'. Box snippet: {str(box)[:200]}")
 
-
-        log.info(f"Finished scraping site '{site_id}'. Found {len(job_offers)} valid job offers.")
         return job_offers
 
     def scrape_all_sites(self) -> List[JobOffer]:
@@ -125,11 +427,101 @@ class ScraperService:
         if not self.sites_config:
             log.warning("No sites configured to scrape.")
             return []
-            
-        for site_config in self.sites_config:
-            log.info(f"Initiating scrape for site ID: {site_config.get('id', 'Unknown site')}")
-            offers = self.scrape_site(site_config)
-            all_offers.extend(offers)
-            log.info(f"Completed scraping for site ID: {site_config.get('id', 'Unknown site')}. Found {len(offers)} offers.")
+
+        workers = min(self.max_workers, len(self.sites_config))
+        log.info(f"Scraping {len(self.sites_config)} sites with {workers} workers.")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            # map() yields results in submission order, so the merged output
+            # does not depend on which site finishes first.
+            results = executor.map(self._scrape_site_task, self.sites_config)
+            for site_config, offers in zip(self.sites_config, results):
+                all_offers.extend(offers)
+                log.info(f"Completed scraping for site ID: {site_config.get('id', 'Unknown site')}. Found {len(offers)} offers.")
         log.info(f"Finished scraping all sites. Total offers found: {len(all_offers)}.")
-        return all_offers
\ No newline at end of file
+        return all_offers
+
+    def stream_all_sites(self, stop: Optional[threading.Event] = None) -> Iterator[List[JobOffer]]:
+        """Yields offers page by page while the sites are still being crawled.
+
+        Pages come in the order they finish; the pages of one site stay in page order.
+        `sort_by_site` restores the order of scrape_all_sites. The hand-off queue is
+        bounded, so workers pause when the consumer falls behind and memory stays flat.
+
+        Setting `stop` ends the stream at once, also cutting short the fetches and retry
+        waits in progress; pages not yielded yet are dropped. The stream sets it itself
+        when the consumer stops early.
+        """
+        log.info("Starting to stream all configured sites.")
+        if not self.sites_config:
+            log.warning("No sites configured to scrape.")
+            return
+
+        workers = min(self.max_workers, len(self.sites_config))
+        pages: queue.Queue = queue.Queue(maxsize=workers * 2)
+        stop = stop if stop is not None else threading.Event()
+        site_done = object()
+
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def crawl(site_config: Dict[str, Any]):
+            if stop.is_set():
+                return
+            site_id = site_config.get('id', 'Unknown site')
+            log.info(f"Initiating scrape for site ID: {site_id}")
+            found = 0
+            try:
+                for page_offers in self.iter_site_pages(site_config, stop):
+                    found += len(page_offers)
+                    if page_offers and not put(page_offers):
+                        return
+                log.info(f"Completed scraping for site ID: {site_id}. Found {found} offers.")
+            except Exception as e:
+                put(e)
+            finally:
+                put(site_done)
+
+        total = 0
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+            for site_config in self.sites_config:
+                executor.submit(crawl, site_config)
+            remaining = len(self.sites_config)
+            try:
+                while remaining:
+                    if stop.is_set():
+                        log.info("Streaming stopped before all sites were crawled.")
+                        return
+                    try:
+                        item = pages.get(timeout=0.1)
+                    except queue.Empty:
+                        continue
+                    if item is site_done:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        total += len(item)
+                        yield item
+            finally:
+                if remaining:
+                    # The consumer stopped early or the stream was stopped; lets blocked workers exit.
+                    stop.set()
+        log.info(f"Finished streaming all sites. Total offers found: {total}.")
+
+    def sort_by_site(self, offers: Iterable[JobOffer]) -> List[JobOffer]:
+        """Orders streamed offers like scrape_all_sites: by site in configuration order, then by page.
+
+        The sort is stable and every site streams its pages in order, so the page order is kept.
+        """
+        site_order = {site_config.get('id'): index for index, site_config in enumerate(self.sites_config)}
+        return sorted(offers, key=lambda offer: site_order.get(offer.site_id, len(site_order)))
+
+    def _scrape_site_task(self, site_config: Dict[str, Any]) -> List[JobOffer]:
+        log.info(f"Initiating scrape for site ID: {site_config.get('id', 'Unknown site')}")
+        return self.scrape_site(site_config)
@@ -0,0 +1,114 @@
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from src.main.config.logger_config import log
+
+GRAM_SIZE = 3
+
+
+class SearchIndex:
+    """Case-insensitive substring search over offers, backed by a trigram inverted index.
+
+    Each offer is added as a row of `field_count` fields (title, company, location) and is
+    identified by its position in the order rows were added. A query returns, in key order,
+    the keys of every offer with the query in one of its fields.
+
+    Companies, locations and many titles repeat, so trigrams are extracted once per distinct
+    field value. The query is matched against those values and every offer holding a matching
+    value is then selected with one vectorized lookup.
+    """
+
+    def __init__(self, field_count: int = 3):
+        self.field_count = field_count
+        # Value 0 stands for a missing field and never matches
+        self._values: List[str] = ['']
+        self._value_ids: Dict[str, int] = {'': 0}
+        # Trigram -> ascending ids of the values containing it
+        self._postings: Dict[str, array] = {}
+        # Values too short to hold a trigram
+        self._short_value_ids: List[int] = []
+        # Per field, the value id of every offer
+        self._fields: List[array] = [array('i') for _ in range(field_count)]
+        self._last_query: Optional[str] = None
+        self._last_matches: np.ndarray = np.empty(0, dtype=np.intp)
+
+    def __len__(self) -> int:
+        return len(self._fields[0])
+
+    def add_rows(self, rows: Iterable[Sequence[Optional[str]]]):
+        """Indexes further offers, given as rows of `field_count` fields; missing fields may be None."""
+        value_ids = self._value_ids
+        for row in rows:
+            for field, value in zip(self._fields, row):
+                value = value or ''
+                value_id = value_ids.get(value)
+                if value_id is None:
+                    value_id = value_ids[value] = self._add_value(value.lower())
+                field.append(value_id)
+        # Earlier matches do not include the new values
+        self._last_query = None
+        self._last_matches = np.empty(0, dtype=np.intp)
+        log.debug(f"Search index holds {len(self)} offers, {len(self._values)} values and {len(self._postings)} trigrams")
+
+    def _add_value(self, value: str) -> int:
+        value_id = len(self._values)
+        self._values.append(value)
+        if len(value) < GRAM_SIZE:
+            self._short_value_ids.append(value_id)
+        postings = self._postings
+        for gram in {value[i:i + GRAM_SIZE] for i in range(len(value) - GRAM_SIZE + 1)}:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = array('I')
+            posting.append(value_id)
+        return value_id
+
+    def search(self, query: str) -> List[int]:
+        """Returns the keys of the offers containing `query`, ignoring case."""
+        query = query.lower()
+        if not query:
+            return list(range(len(self)))
+
+        matches = self._match_values(query)
+        self._last_query, self._last_matches = query, matches
+        if not matches.size:
+            return []
+
+        matched = np.zeros(len(self._values), dtype=bool)
+        matched[matches] = True
+        selected = np.zeros(len(self), dtype=bool)
+        for field in self._fields:
+            selected |= matched[np.frombuffer(field, dtype=np.int32)]
+        return np.flatnonzero(selected).tolist()
+
+    def _match_values(self, query: str) -> np.ndarray:
+        """Ids of the distinct values containing `query`."""
+        values = self._values
+        if len(query) < GRAM_SIZE:
+            # Every value at least a trigram long that contains the query has a trigram containing it
+            matched = np.zeros(len(values), dtype=bool)
+            for gram, posting in self._postings.items():
+                if query in gram:
+                    matched[np.frombuffer(posting, dtype=np.uint32)] = True
+            for value_id in self._short_value_ids:
+                matched[value_id] = query in values[value_id]
+            return np.flatnonzero(matched)
+
+        grams = {query[i:i + GRAM_SIZE] for i in range(len(query) - GRAM_SIZE + 1)}
+        postings = [self._postings.get(gram) for gram in grams]
+        if any(posting is None for posting in postings):
+            return np.empty(0, dtype=np.intp)
+        # A copy, as a view would keep the posting from growing while the matches are remembered
+        candidates = np.array(min(postings, key=len), dtype=np.uint32)
+        if len(query) == GRAM_SIZE:
+            # The trigram's own posting is exactly the values containing the query
+            return candidates
+        # A query extending the previous one can only match values the previous one matched
+        if self._last_query is not None and self._last_query in query and self._last_matches.size < candidates.size:
+            candidates = self._last_matches
+        found = np.fromiter((query in values[value_id] for value_id in candidates.tolist()), dtype=bool, count=candidates.size)
+        return candidates[found]
+
+    def stats(self) -> Tuple[int, int, int]:
+        """Returns the number of indexed offers, distinct field values and distinct trigrams."""
+        return len(self), len(self._values) - 1, len(self._postings)
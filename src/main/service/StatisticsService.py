@@ -1,171 +1,484 @@
-from typing import Dict, List, Optional
-from collections import Counter, defaultdict
+import copy
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Pattern, Sequence, Tuple
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from math import nan as NAN
 import re
+import numpy as np
 from src.main.persistance.Supabase import DatabaseConfig
+from src.main.model.JobOffer import JobOffer
+from src.main.model.Salary import Salary, parse_salary
 from src.main.config.logger_config import log 
 
+# Columns the statistics need; the rest of each row is never loaded
+STATISTICS_COLUMNS = ('url', 'title', 'salary', 'site_id', 'scraped_at')
+# Delta reads look back this far so rows committed late by a concurrent insert are not skipped
+WATERMARK_OVERLAP = timedelta(minutes=5)
+# Category of offers whose title matches no keyword
+OTHER_POSITION_TYPE = "Inne"
+
+DEFAULT_POSITION_KEYWORDS = {
+    "Sprzedawca/Konsultant": [
+        "sprzedawca", "sprzedawczyni", "konsultant", "doradca", "handlowiec",
+        "ambasador", "marki", "doradca klienta", "obsługa klienta"
+    ],
+    "Recepcjonista": [
+        "recepcjonista", "recepcjonistka", "recepcji", "recepcja"
+    ],
+    "Gastronomia": [
+        "kelner", "kelnerka", "barista", "barman", "sushi", "kucharz",
+        "restauracji", "kawiarnia", "lodziarnio", "bistro", "burgers"
+    ],
+    "Medyczny": [
+        "rejestrator medyczny", "rejestratorka medyczna", "medyczny", "medyczna",
+        "fizjoterapia", "sanepid"
+    ],
+    "Asystent/Pomoc": [
+        "asystent", "asystentka", "pomoc", "pomocnik", "pomocnica",
+        "asystent nauczyciela", "gym assistant"
+    ],
+    "Księgowość/Biuro": [
+        "księgowy", "księgowa", "biurowa", "biuro", "biurowy"
+    ],
+    "Transport/Dostawa": [
+        "dostawca", "kierowca", "podjazdowy", "transport", "dostawa"
+    ],
+    "Lektor/Nauczyciel": [
+        "lektor", "lektorka", "nauczyciel", "nauczycielka", "językowa"
+    ],
+    "Specjalista": [
+        "specjalista", "specialist", "depilacji", "wynajmu"
+    ],
+    "Produkcja": [
+        "produkcja", "pracownik produkcji", "production"
+    ]
+}
+
+
+def _keyword_items(position_keywords: Dict[str, List[str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    """Hashable, lowercased form of a keyword dictionary, used as a cache key."""
+    return tuple((position_type, tuple(keyword.lower() for keyword in keywords))
+                 for position_type, keywords in position_keywords.items())
+
+
+@lru_cache(maxsize=32)
+def _compile_position_pattern(keyword_items: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Tuple[Optional[Pattern], List[str]]:
+    """Compiles the categories into one regex, with a branch per category in dictionary order.
+
+    Each branch is a lookahead for any of the category's keywords followed by an empty
+    named group, so `match().lastgroup` names the first category with a keyword anywhere
+    in the title, the same one the per-keyword loop would pick.
+    """
+    branches = []
+    position_types = []
+    for position_type, keywords in keyword_items:
+        if not keywords:
+            # A category without keywords never matches
+            continue
+        alternatives = '|'.join(re.escape(keyword) for keyword in keywords)
+        branches.append(f"(?=.*?(?:{alternatives}))(?P<c{len(position_types)}>)")
+        position_types.append(position_type)
+    if not branches:
+        return None, position_types
+    return re.compile('|'.join(branches), re.DOTALL), position_types
+
+
+def get_position_classifier(position_keywords: Dict[str, List[str]]) -> Callable[[Optional[str]], str]:
+    """Returns a function mapping an offer title to its position type.
+
+    A title belongs to the first category (in dictionary order) with a keyword contained in
+    the lowercased title, or to "Inne" if there is none. The compiled pattern is cached per
+    keyword dictionary, and each returned function remembers the titles it has classified.
+    """
+    pattern, position_types = _compile_position_pattern(_keyword_items(position_keywords))
+    if pattern is None:
+        return lambda title: OTHER_POSITION_TYPE
+    match = pattern.match
+    # The same titles come back run after run, so each distinct title is matched once
+    categories: Dict[str, str] = {}
+
+    def classify(title: Optional[str]) -> str:
+        if not title:
+            return OTHER_POSITION_TYPE
+        position_type = categories.get(title)
+        if position_type is None:
+            m = match(title.lower())
+            position_type = categories[title] = position_types[int(m.lastgroup[1:])] if m else OTHER_POSITION_TYPE
+        return position_type
+
+    return classify
+
+
+SALARY_PERCENTILES = (10, 25, 75, 90)
+# Where statistics are computed: 'python' loads the offers, 'sql' aggregates inside Postgres
+BACKENDS = ('python', 'sql')
+
+
+def _format_salary_summary(average: float, minimum: float, maximum: float, median: float,
+                           percentiles: Sequence[float]) -> Dict[str, Any]:
+    return {
+        "average_salary": round(float(average), 2),
+        "min_salary": float(minimum),
+        "max_salary": float(maximum),
+        "median_salary": round(float(median), 2),
+        "percentiles": {f"p{p}": round(float(value), 2) for p, value in zip(SALARY_PERCENTILES, percentiles)}
+    }
+
+
+def _summarize_salaries(salaries: np.ndarray) -> Dict[str, Any]:
+    """Average, median, range and percentiles of a non-empty salary array."""
+    median, *percentiles = np.percentile(salaries, (50, *SALARY_PERCENTILES))
+    return _format_salary_summary(salaries.mean(), salaries.min(), salaries.max(), median, percentiles)
+
+
+def _empty_salary_statistics(total_offers: int, no_salary_count: int) -> Dict[str, Any]:
+    return {
+        "total_offers": total_offers,
+        "offers_with_salary": 0,
+        "offers_without_salary": no_salary_count,
+        "average_salary": 0,
+        "min_salary": 0,
+        "max_salary": 0,
+        "median_salary": 0,
+        "percentiles": {f"p{p}": 0 for p in SALARY_PERCENTILES},
+        "histogram": {"bin_edges": [], "counts": []},
+        "by_site": {},
+        "by_position_type": {}
+    }
+
+
+def _format_site_trends(rows: Iterable[Tuple[Optional[str], date, int]]) -> Dict[Optional[str], Dict[str, int]]:
+    """Offers per ISO day per site, from (site_id, day, count) rows ordered by day."""
+    trends: Dict[Optional[str], Dict[str, int]] = {}
+    for site_id, day, count in rows:
+        trends.setdefault(site_id, {})[day.isoformat()] = count
+    return trends
+
+
+def _group_salaries(salaries: np.ndarray, groups: List[Optional[str]]) -> Dict[Optional[str], Dict[str, Any]]:
+    """Summarizes the salaries of each group, e.g. each site, in order of first appearance."""
+    codes: Dict[Optional[str], int] = {}
+    group_codes = np.fromiter((codes.setdefault(group, len(codes)) for group in groups), dtype=np.intp, count=len(groups))
+    # Offer indices sorted by group, split into one chunk per group
+    order = np.argsort(group_codes, kind='stable')
+    boundaries = np.cumsum(np.bincount(group_codes, minlength=len(codes)))[:-1]
+    return {
+        group: {"offers_with_salary": int(members.size), **_summarize_salaries(salaries[members])}
+        for group, members in zip(codes, np.split(order, boundaries))
+    }
+
+
+class StatisticsSnapshot:
+    """Columnar store of the offers the statistics are computed from.
+
+    Keeps one row per stored offer: its title, site id, UTC scrape day and the midpoint and
+    unit of its parsed salary. `update` appends the rows of new offers and overwrites those
+    of offers read again, so a delta read costs only its own rows and the offers themselves
+    are never kept.
+    """
+
+    def __init__(self, offers: Iterable[JobOffer] = (), state: Optional[Tuple] = None,
+                 parse: Callable[[str], Optional[Salary]] = parse_salary):
+        self.state = state
+        self._parse = parse
+        # Row of each offer by its (url, title) key
+        self._rows: Dict[Tuple[Optional[str], Optional[str]], int] = {}
+        self.titles: List[Optional[str]] = []
+        self.site_ids: List[Optional[str]] = []
+        # UTC day each offer was scraped on
+        self.days: List[Optional[date]] = []
+        self._has_salary_text: List[bool] = []
+        # Midpoint of each offer's parsed salary, NaN when there is none; read through a NumPy view
+        self._salary_values = array('d')
+        self._salary_units: List[Optional[str]] = []
+        # Position types of every row and the classifier that filled them, per keyword dictionary
+        self._position_types: Dict[Tuple, Tuple[Callable[[Optional[str]], str], List[str]]] = {}
+        self.update(offers, state)
+
+    @property
+    def total_offers(self) -> int:
+        return len(self.titles)
+
+    @property
+    def offers_without_salary(self) -> int:
+        return len(self._has_salary_text) - sum(self._has_salary_text)
+
+    def update(self, offers: Iterable[JobOffer], state: Optional[Tuple] = None):
+        """Appends the offers not in the snapshot yet and overwrites the rows of those that are."""
+        changed: List[int] = []
+        for offer in offers:
+            key = (offer.url, offer.title)
+            row = self._rows.get(key)
+            if row is None:
+                row = self._rows[key] = len(self.titles)
+                self.titles.append(None)
+                self.site_ids.append(None)
+                self.days.append(None)
+                self._has_salary_text.append(False)
+                self._salary_values.append(NAN)
+                self._salary_units.append(None)
+            self._set_row(row, offer)
+            changed.append(row)
+        for classify, position_types in self._position_types.values():
+            position_types.extend([None] * (len(self.titles) - len(position_types)))
+            for row in changed:
+                position_types[row] = classify(self.titles[row])
+        self.state = state
+
+    def _set_row(self, row: int, offer: JobOffer):
+        self.titles[row] = offer.title
+        self.site_ids[row] = offer.site_id
+        self.days[row] = offer.scraped_at.astimezone(timezone.utc).date() if offer.scraped_at else None
+        has_salary_text = bool(offer.salary and offer.salary.strip())
+        salary = self._parse(offer.salary) if has_salary_text else None
+        self._has_salary_text[row] = has_salary_text
+        self._salary_values[row] = salary.midpoint if salary is not None else NAN
+        self._salary_units[row] = salary.unit if salary is not None else None
+
+    def _salaries(self, unit: Optional[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Parsed salaries, optionally of one unit, and the rows of their offers."""
+        values = np.frombuffer(self._salary_values, dtype=float)
+        selected = ~np.isnan(values)
+        if unit is not None:
+            selected &= np.fromiter((row_unit == unit for row_unit in self._salary_units), dtype=bool, count=len(values))
+        rows = np.flatnonzero(selected)
+        # Indexing copies, so no view of the growing array outlives the call
+        return values[rows], rows
+
+    def position_types(self, position_keywords: Dict[str, List[str]]) -> List[str]:
+        """Position type of every offer, classified once per keyword dictionary."""
+        key = _keyword_items(position_keywords)
+        classified = self._position_types.get(key)
+        if classified is None:
+            classify = get_position_classifier(position_keywords)
+            classified = self._position_types[key] = (classify, [classify(title) for title in self.titles])
+        return classified[1]
+
+    def position_type_counts(self, position_keywords: Dict[str, List[str]]) -> Dict[str, int]:
+        return dict(Counter(self.position_types(position_keywords)))
+
+    def site_trends(self) -> Dict[Optional[str], Dict[str, int]]:
+        counts = Counter((day, site_id) for day, site_id in zip(self.days, self.site_ids) if day is not None)
+        return _format_site_trends((site_id, day, count) for (day, site_id), count
+                                   in sorted(counts.items(), key=lambda item: (item[0][0], item[0][1] or '')))
+
+    def salary_statistics(self, bins: int, position_keywords: Dict[str, List[str]],
+                          unit: Optional[str] = None) -> Dict[str, Any]:
+        salaries, salary_offers = self._salaries(unit)
+        if not salaries.size:
+            return _empty_salary_statistics(self.total_offers, self.offers_without_salary)
+
+        counts, bin_edges = np.histogram(salaries, bins=bins)
+        position_types = self.position_types(position_keywords)
+        return {
+            "total_offers": self.total_offers,
+            "offers_with_salary": int(salaries.size),
+            "offers_without_salary": self.offers_without_salary,
+            **_summarize_salaries(salaries),
+            "histogram": {
+                "bin_edges": [round(float(edge), 2) for edge in bin_edges],
+                "counts": counts.tolist()
+            },
+            "by_site": _group_salaries(salaries, [self.site_ids[index] for index in salary_offers]),
+            "by_position_type": _group_salaries(salaries, [position_types[index] for index in salary_offers])
+        }
+
+
 class StatisticsService:
     """Service for generating statistics from job offer data"""
     
-    def __init__(self, data_provider=None):
+    def __init__(self, data_provider=None, backend: str = 'python'):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown statistics backend '{backend}', expected one of {BACKENDS}")
         self.data_provider = data_provider or DatabaseConfig()
-        log.info("StatisticsService initialized")
-    
+        self.backend = backend
+        self._watermark: Optional[datetime] = None
+        self._parsed_salaries: Dict[str, Optional[Salary]] = {}
+        self._snapshot: Optional[StatisticsSnapshot] = None
+        # Reports of the current snapshot by (keywords, bins, unit)
+        self._reports: Dict[Tuple, Dict[str, Any]] = {}
+        # Table state the SQL backend's reports were computed at
+        self._reports_state: Optional[Tuple] = None
+        log.info(f"StatisticsService initialized ({backend} backend)")
+
+    def _read_offers(self) -> Iterable[JobOffer]:
+        """Reads the offers scraped since the previous read, or every offer without a watermark.
+
+        There is no watermark on the first call, or when no offer had a scraped_at.
+        """
+        if self._watermark is None:
+            offers = self.data_provider.read_data(columns=STATISTICS_COLUMNS)
+        else:
+            offers = self.data_provider.read_data_since(self._watermark - WATERMARK_OVERLAP, columns=STATISTICS_COLUMNS)
+            log.debug(f"Read {len(offers)} offers scraped since {self._watermark}")
+
+        for offer in offers:
+            if offer.scraped_at is not None and (self._watermark is None or offer.scraped_at > self._watermark):
+                self._watermark = offer.scraped_at
+        return offers
+
+    def get_snapshot(self) -> StatisticsSnapshot:
+        """Returns the offers in columnar form, reloading them only when the table has changed.
+
+        The table counts as changed when its row count or newest scraped_at differs from the
+        snapshot's; only the new rows are then read into it, and a shrinking table is read again in full.
+        """
+        state = self.data_provider.get_table_state()
+        if self._snapshot is not None:
+            if state == self._snapshot.state:
+                log.debug(f"Table unchanged since the last snapshot ({state}), reusing it")
+                return self._snapshot
+            if state[0] < self._snapshot.state[0]:
+                # Deleted rows cannot be noticed by an incremental read
+                self._snapshot = None
+                self._watermark = None
+
+        try:
+            job_offers = self._read_offers()
+        except Exception as e:
+            log.error(f"Failed to retrieve job offers: {e}")
+            raise
+
+        if self._snapshot is None:
+            self._snapshot = StatisticsSnapshot(job_offers, state, self._parse_salary)
+        else:
+            self._snapshot.update(job_offers, state)
+        log.info(f"Retrieved {len(job_offers)} job offers from database, {self._snapshot.total_offers} in total")
+        self._reports.clear()
+        return self._snapshot
+
+    def get_report(self, position_keywords: Optional[Dict[str, List[str]]] = None, bins: int = 10,
+                   unit: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Position type counts, salary statistics and per-site trends, all computed from the same snapshot.
+
+        Reports are memoized until the table changes. With the SQL backend both are aggregated
+        in the database instead.
+        """
+        if position_keywords is None:
+            position_keywords = DEFAULT_POSITION_KEYWORDS
+        key = (_keyword_items(position_keywords), bins, unit)
+        if self.backend == 'sql':
+            state = self.data_provider.get_table_state()
+            if state != self._reports_state:
+                self._reports.clear()
+                self._reports_state = state
+
+            def compute():
+                return {
+                    "position_type_counts": self.get_position_type_counts(position_keywords),
+                    "salary_statistics": self.get_salary_statistics(bins, position_keywords, unit),
+                    "site_trends": self.get_site_trends()
+                }
+        else:
+            snapshot = self.get_snapshot()
+
+            def compute():
+                return {
+                    "position_type_counts": snapshot.position_type_counts(position_keywords),
+                    "salary_statistics": snapshot.salary_statistics(bins, position_keywords, unit),
+                    "site_trends": snapshot.site_trends()
+                }
+
+        report = self._reports.get(key)
+        if report is None:
+            report = self._reports[key] = compute()
+            log.info(f"Report computed ({self.backend} backend)")
+        # Callers get their own copy, the memoized report stays untouched
+        return copy.deepcopy(report)
+
     def get_position_type_counts(self, position_keywords: Optional[Dict[str, List[str]]] = None) -> Dict[str, int]:
         # Default Polish position keywords if none provided
         if position_keywords is None:
-            position_keywords = {
-                "Sprzedawca/Konsultant": [
-                    "sprzedawca", "sprzedawczyni", "konsultant", "doradca", "handlowiec",
-                    "ambasador", "marki", "doradca klienta", "obsługa klienta"
-                ],
-                "Recepcjonista": [
-                    "recepcjonista", "recepcjonistka", "recepcji", "recepcja"
-                ],
-                "Gastronomia": [
-                    "kelner", "kelnerka", "barista", "barman", "sushi", "kucharz",
-                    "restauracji", "kawiarnia", "lodziarnio", "bistro", "burgers"
-                ],
-                "Medyczny": [
-                    "rejestrator medyczny", "rejestratorka medyczna", "medyczny", "medyczna",
-                    "fizjoterapia", "sanepid"
-                ],
-                "Asystent/Pomoc": [
-                    "asystent", "asystentka", "pomoc", "pomocnik", "pomocnica",
-                    "asystent nauczyciela", "gym assistant"
-                ],
-                "Księgowość/Biuro": [
-                    "księgowy", "księgowa", "biurowa", "biuro", "biurowy"
-                ],
-                "Transport/Dostawa": [
-                    "dostawca", "kierowca", "podjazdowy", "transport", "dostawa"
-                ],
-                "Lektor/Nauczyciel": [
-                    "lektor", "lektorka", "nauczyciel", "nauczycielka", "językowa"
-                ],
-                "Specjalista": [
-                    "specjalista", "specialist", "depilacji", "wynajmu"
-                ],
-                "Produkcja": [
-                    "produkcja", "pracownik produkcji", "production"
-                ]
-            }
+            position_keywords = DEFAULT_POSITION_KEYWORDS
         
         log.info(f"Starting position type analysis with {len(position_keywords)} position categories")
         log.debug(f"Position keywords: {position_keywords}")
         
-        try:
-            job_offers = self.data_provider.read_data()
-            log.info(f"Retrieved {len(job_offers)} job offers from database")
-        except Exception as e:
-            log.error(f"Failed to retrieve job offers: {e}")
-            raise
-            
-        position_counts = defaultdict(int)
-        processed_offers = 0
-        
-        for offer in job_offers:
-            # Handle None titles by categorizing as "Other"
-            if not offer.title:
-                position_counts["Inne"] += 1
-                log.debug(f"Offer with empty title categorized as 'Inne' (ID: {getattr(offer, 'id', 'unknown')})")
-                continue
-                
-            title_lower = offer.title.lower()
-            log.debug(f"Processing offer title: '{offer.title}'")
-            
-            # Classify each offer based on keywords in the title
-            classified = False
-            for position_type, keywords in position_keywords.items():
-                if any(keyword.lower() in title_lower for keyword in keywords):
-                    position_counts[position_type] += 1
-                    log.debug(f"Offer '{offer.title}' classified as '{position_type}'")
-                    classified = True
-                    break
-            
-            # If no match found, categorize as "Inne" (Other in Polish)
-            if not classified:
-                position_counts["Inne"] += 1
-                log.debug(f"Offer '{offer.title}' could not be classified, categorized as 'Inne'")
-            
-            processed_offers += 1
+        if self.backend == 'sql':
+            # Only one row per position type comes back, whatever the size of the table
+            result = self.data_provider.get_position_type_counts(position_keywords, OTHER_POSITION_TYPE)
+            log.info(f"Position type analysis completed in the database. Counted: {sum(result.values())} offers")
+            log.info(f"Position distribution: {result}")
+            return result
+
+        snapshot = self.get_snapshot()
+        # Offers with no title or no matching keyword are categorized as "Inne" (Other in Polish)
+        result = snapshot.position_type_counts(position_keywords)
+        processed_offers = sum(1 for title in snapshot.titles if title)
         
-        result = dict(position_counts)
         log.info(f"Position type analysis completed. Processed: {processed_offers} offers")
         log.info(f"Position distribution: {result}")
         
         return result
     
-    def get_salary_statistics(self) -> Dict[str, any]:
-        """Analyze salary data from Polish job offers"""
+    def get_site_trends(self) -> Dict[Optional[str], Dict[str, int]]:
+        """Offers scraped per site per UTC day, as {site_id: {'YYYY-MM-DD': count}} with days in order."""
+        if self.backend == 'sql':
+            return _format_site_trends(self.data_provider.get_site_trends())
+        return self.get_snapshot().site_trends()
+
+    def _parse_salary(self, salary: str) -> Optional[Salary]:
+        """Parses a salary text, remembering the result as most offers repeat a handful of formats."""
+        if salary not in self._parsed_salaries:
+            self._parsed_salaries[salary] = parse_salary(salary)
+        return self._parsed_salaries[salary]
+
+    def get_salary_statistics(self, bins: int = 10, position_keywords: Optional[Dict[str, List[str]]] = None,
+                              unit: Optional[str] = None) -> Dict[str, Any]:
+        """Analyze salary data from Polish job offers
+
+        Besides the overall figures the result holds salary percentiles, a histogram with
+        `bins` bins and the same figures per site and per position type. `unit` ('hourly'
+        or 'monthly') limits the figures to salaries given in that unit.
+        """
         log.info("Starting salary statistics analysis")
+        if position_keywords is None:
+            position_keywords = DEFAULT_POSITION_KEYWORDS
+        if self.backend == 'sql':
+            return self._get_salary_statistics_in_database(bins, position_keywords, unit)
         
-        try:
-            job_offers = self.data_provider.read_data()
-            log.info(f"Retrieved {len(job_offers)} job offers from database")
-        except Exception as e:
-            log.error(f"Failed to retrieve job offers: {e}")
-            raise
-        
-        salary_data = []
-        salary_ranges = []
-        no_salary_count = 0
-        
-        for offer in job_offers:
-            if not offer.salary or offer.salary.strip() == "":
-                no_salary_count += 1
-                continue
-            
-            # Parse Polish salary formats
-            salary_text = offer.salary.lower()
-            
-            # Extract numbers from salary text
-            numbers = re.findall(r'\d+(?:[,\.]\d+)?', salary_text)
-            
-            if len(numbers) >= 2:
-                # Range format (e.g., "30,50 - 33 zł / godz. brutto")
-                try:
-                    min_salary = float(numbers[0].replace(',', '.'))
-                    max_salary = float(numbers[1].replace(',', '.'))
-                    avg_salary = (min_salary + max_salary) / 2
-                    salary_data.append(avg_salary)
-                    salary_ranges.append((min_salary, max_salary))
-                except ValueError:
-                    continue
-            elif len(numbers) == 1:
-                # Single value
-                try:
-                    salary_value = float(numbers[0].replace(',', '.'))
-                    salary_data.append(salary_value)
-                    salary_ranges.append((salary_value, salary_value))
-                except ValueError:
-                    continue
-        
-        if not salary_data:
+        result = self.get_snapshot().salary_statistics(bins, position_keywords, unit)
+        if not result["offers_with_salary"]:
             log.warning("No valid salary data found")
+        else:
+            log.info(f"Salary analysis completed: average {result['average_salary']}, median {result['median_salary']}")
+        return result
+
+    def _get_salary_statistics_in_database(self, bins: int, position_keywords: Dict[str, List[str]],
+                                           unit: Optional[str]) -> Dict[str, Any]:
+        """Same figures as get_salary_statistics, aggregated by Postgres from the parsed salary columns."""
+        percentiles = (50, *SALARY_PERCENTILES)
+        total_offers, no_salary_count = self.data_provider.count_offers()
+        overall = self.data_provider.get_salary_aggregates(percentiles, unit=unit)
+        if not overall:
+            log.warning("No valid salary data found")
+            return _empty_salary_statistics(total_offers, no_salary_count)
+
+        def summarize(rows) -> Dict[Optional[str], Dict[str, Any]]:
             return {
-                "total_offers": len(job_offers),
-                "offers_with_salary": 0,
-                "offers_without_salary": no_salary_count,
-                "average_salary": 0,
-                "min_salary": 0,
-                "max_salary": 0,
-                "median_salary": 0
+                group: {"offers_with_salary": count, **_format_salary_summary(average, minimum, maximum, values[0], values[1:])}
+                for group, count, average, minimum, maximum, values in rows
             }
-        
-        salary_data.sort()
-        n = len(salary_data)
-        median = salary_data[n//2] if n % 2 == 1 else (salary_data[n//2-1] + salary_data[n//2]) / 2
-        
+
+        _, offers_with_salary, average, minimum, maximum, values = overall[0]
+        bin_edges = np.histogram_bin_edges(np.array([minimum, maximum], dtype=float), bins=bins)
+        summary = _format_salary_summary(average, minimum, maximum, values[0], values[1:])
         result = {
-            "total_offers": len(job_offers),
-            "offers_with_salary": len(salary_data),
+            "total_offers": total_offers,
+            "offers_with_salary": offers_with_salary,
             "offers_without_salary": no_salary_count,
-            "average_salary": round(sum(salary_data) / len(salary_data), 2),
-            "min_salary": min(salary_data),
-            "max_salary": max(salary_data),
-            "median_salary": round(median, 2)
+            **summary,
+            "histogram": {
+                "bin_edges": [round(float(edge), 2) for edge in bin_edges],
+                "counts": self.data_provider.get_salary_histogram(bin_edges.tolist(), unit=unit)
+            },
+            "by_site": summarize(self.data_provider.get_salary_aggregates(percentiles, group_by='site_id', unit=unit)),
+            "by_position_type": summarize(self.data_provider.get_salary_aggregates(
+                percentiles, group_by='position_type', unit=unit,
+                position_keywords=position_keywords, other_position_type=OTHER_POSITION_TYPE))
         }
-        
-        log.info(f"Salary analysis completed: {result}")
-        return result
\ No newline at end of file
+
+        log.info(f"Salary analysis completed in the database: {summary}")
+        return result
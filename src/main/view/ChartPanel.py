@@ -0,0 +1,72 @@
+from typing import Any, Dict, Optional, Set
+import customtkinter as ctk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+from src.main.view.Charts import CHARTS
+
+
+class ChartPanel(ctk.CTkToplevel):
+    """Window with the statistics charts, each embedded as its own matplotlib figure.
+
+    The window is hidden rather than destroyed when closed, and every chart keeps its
+    figure, so reopening the window or switching between charts only shows what was
+    already drawn. Reports are computed elsewhere and handed over with `set_report`; a
+    chart is redrawn only when it is shown and the report changed since it was drawn.
+    """
+
+    def __init__(self, master, **kwargs):
+        super().__init__(master, **kwargs)
+        self.title("Statistics")
+        self.geometry("900x600")
+        self.protocol("WM_DELETE_WINDOW", self.withdraw)
+        self._report: Optional[Dict[str, Any]] = None
+        self._canvases: Dict[str, FigureCanvasTkAgg] = {}
+        # Charts drawn from the current report
+        self._drawn: Set[str] = set()
+        self._shown: Optional[str] = None
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(1, weight=1)
+        self._selector = ctk.CTkSegmentedButton(self, values=list(CHARTS), command=self._show_chart,
+                                                font=("Roboto", 12))
+        self._selector.set(next(iter(CHARTS)))
+        self._selector.grid(row=0, column=0, pady=(10, 0))
+
+        self._status_label = ctk.CTkLabel(self, text="", font=("Roboto", 12))
+        self._status_label.grid(row=2, column=0, pady=(0, 10))
+
+    def show(self):
+        self.deiconify()
+        self.lift()
+
+    def is_shown(self) -> bool:
+        return self.winfo_exists() and self.state() != "withdrawn"
+
+    def set_status(self, text: str):
+        self._status_label.configure(text=text)
+
+    def set_report(self, report: Dict[str, Any]):
+        """Shows a StatisticsService report; nothing is redrawn when it equals the one shown."""
+        if report != self._report:
+            self._report = report
+            self._drawn.clear()
+            self._show_chart(self._selector.get())
+
+    def _show_chart(self, name: str):
+        if self._report is None:
+            return
+        canvas = self._canvases.get(name)
+        if canvas is None:
+            canvas = self._canvases[name] = FigureCanvasTkAgg(Figure(figsize=(9, 5.5)), master=self)
+        if name not in self._drawn:
+            figure = canvas.figure
+            figure.clear()
+            CHARTS[name](figure.add_subplot(), self._report)
+            figure.tight_layout()
+            canvas.draw_idle()
+            self._drawn.add(name)
+        if name != self._shown:
+            if self._shown is not None:
+                self._canvases[self._shown].get_tk_widget().grid_remove()
+            canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew", padx=10, pady=10)
+            self._shown = name
@@ -0,0 +1,73 @@
+from datetime import date
+from typing import Any, Callable, Dict
+from matplotlib.axes import Axes
+from matplotlib.dates import AutoDateLocator, ConciseDateFormatter
+import numpy as np
+from src.main.model.Salary import HOURLY
+
+BAR_COLOR = 'orange'
+# Salaries are charted in one unit, as hourly and monthly rates do not mix; most offers are hourly
+SALARY_UNIT = HOURLY
+
+
+def _no_data(axes: Axes, message: str):
+    axes.text(0.5, 0.5, message, ha='center', va='center', transform=axes.transAxes, fontsize=12)
+    axes.set_axis_off()
+
+
+def plot_position_types(axes: Axes, report: Dict[str, Any]):
+    counts = report["position_type_counts"]
+    axes.bar(list(counts.keys()), list(counts.values()), color=BAR_COLOR)
+
+    axes.set_title('Number of offers in different areas', fontsize=16)
+    axes.set_xlabel('Position', fontsize=12)
+    axes.set_ylabel('Number of offers', fontsize=12)
+    axes.tick_params(axis='x', labelrotation=45)
+    for label in axes.get_xticklabels():
+        label.set_horizontalalignment('right')
+    axes.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def plot_salary_distribution(axes: Axes, report: Dict[str, Any]):
+    """Expects a report of SALARY_UNIT salaries."""
+    statistics = report["salary_statistics"]
+    edges = statistics["histogram"]["bin_edges"]
+    if not statistics["offers_with_salary"] or len(edges) < 2:
+        _no_data(axes, 'No salary data')
+        return
+    axes.bar(edges[:-1], statistics["histogram"]["counts"], width=np.diff(edges), align='edge',
+             color=BAR_COLOR, edgecolor='white')
+    axes.axvline(statistics["median_salary"], color='black', linestyle='--', label=f'Median {statistics["median_salary"]} zł')
+
+    axes.set_title('Hourly salary distribution', fontsize=16)
+    axes.set_xlabel('Hourly salary (zł, midpoint of the range)', fontsize=12)
+    axes.set_ylabel('Number of offers', fontsize=12)
+    axes.legend()
+    axes.grid(axis='y', linestyle='--', alpha=0.7)
+
+
+def plot_site_trends(axes: Axes, report: Dict[str, Any]):
+    trends = report["site_trends"]
+    if not trends:
+        _no_data(axes, 'No offers with a scrape date')
+        return
+    for site_id, counts in trends.items():
+        days = [date.fromisoformat(day) for day in counts]
+        axes.plot(days, list(counts.values()), marker='o', label=site_id or 'unknown')
+    locator = AutoDateLocator()
+    axes.xaxis.set_major_locator(locator)
+    axes.xaxis.set_major_formatter(ConciseDateFormatter(locator))
+
+    axes.set_title('Offers scraped per day', fontsize=16)
+    axes.set_xlabel('Day', fontsize=12)
+    axes.set_ylabel('Number of offers', fontsize=12)
+    axes.legend()
+    axes.grid(linestyle='--', alpha=0.7)
+
+
+# Charts of a StatisticsService report, by the name shown in the chart panel
+CHARTS: Dict[str, Callable[[Axes, Dict[str, Any]], None]] = {
+    "Positions": plot_position_types,
+    "Salaries": plot_salary_distribution,
+    "Sites": plot_site_trends,
+}
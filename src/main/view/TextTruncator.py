@@ -0,0 +1,66 @@
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Callable, Dict
+
+ELLIPSIS = ' ...'
+
+
+class TextTruncator:
+    """Shortens texts to fit a pixel width, e.g. offer titles in the list.
+
+    A text wider than `max_width` is cut to its longest prefix that fits and its last
+    four characters are replaced with ' ...'. `measure` returns the width of a string
+    in pixels, usually tkinter.font.Font.measure, and each call is a Tk round trip.
+
+    Each distinct character is measured once and the prefix widths are estimated from
+    those glyph widths, so most texts take one measurement to confirm the estimate, or
+    two when cut. Where kerning makes the estimate wrong, the cut is found with a
+    binary search over exact measurements. Results are memoized by text.
+    """
+
+    def __init__(self, measure: Callable[[str], int], max_width: int):
+        self.measure = measure
+        self.max_width = max_width
+        self._glyph_widths: Dict[str, int] = {}
+        self._results: Dict[str, str] = {}
+
+    def __call__(self, text: str) -> str:
+        result = self._results.get(text)
+        if result is None:
+            result = self._results[text] = self._truncate(text)
+        return result
+
+    def _glyph_width(self, char: str) -> int:
+        width = self._glyph_widths.get(char)
+        if width is None:
+            width = self._glyph_widths[char] = self.measure(char)
+        return width
+
+    def _truncate(self, text: str) -> str:
+        if not text:
+            return text
+        prefix_widths = list(accumulate(self._glyph_width(char) for char in text))
+        # Longest prefix whose estimated width fits
+        length = bisect_right(prefix_widths, self.max_width)
+        if not self._is_longest_fitting(text, length):
+            length = self._search_length(text)
+        if length == len(text):
+            return text
+        return text[:length][:-4] + ELLIPSIS
+
+    def _fits(self, text: str, length: int) -> bool:
+        return length == 0 or self.measure(text[:length]) <= self.max_width
+
+    def _is_longest_fitting(self, text: str, length: int) -> bool:
+        return self._fits(text, length) and (length == len(text) or not self._fits(text, length + 1))
+
+    def _search_length(self, text: str) -> int:
+        """Longest prefix that fits, by exact measurement."""
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self._fits(text, middle):
+                low = middle
+            else:
+                high = middle - 1
+        return low
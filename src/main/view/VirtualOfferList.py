@@ -0,0 +1,137 @@
+import math
+from typing import Callable, List, Optional, Sequence
+import customtkinter as ctk
+
+ROW_COLOR = "#3a3a3a"
+SELECTED_ROW_COLOR = "#1f6aa5"
+
+
+class VirtualOfferList(ctk.CTkFrame):
+    """Scrollable list of offer titles that only creates widgets for the rows on screen.
+
+    Rows are identified by keys (indices into the caller's offers). A small pool of buttons,
+    just enough to fill the visible height, is re-labelled as the list scrolls, so the cost of
+    showing or filtering the list does not depend on the number of offers.
+
+    `on_scroll_end` is called whenever the list is shown within one screen of its last row,
+    so further rows can be loaded before they are scrolled to.
+    """
+
+    def __init__(self, master, on_select: Callable[[int], None], row_height: int = 36,
+                 on_scroll_end: Optional[Callable[[], None]] = None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.on_select = on_select
+        self.on_scroll_end = on_scroll_end
+        self.row_height = row_height
+        self._keys: List[int] = []
+        self._titles: Sequence[str] = []
+        self._selected_key: Optional[int] = None
+        # Pixel offset of the top of the viewport within the full list
+        self._offset = 0
+        self._buttons: List[ctk.CTkButton] = []
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(0, weight=1)
+        self._viewport = ctk.CTkFrame(self, fg_color="transparent", corner_radius=0)
+        self._viewport.grid(row=0, column=0, sticky="nsew", padx=(8, 1), pady=2)
+        self._scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar)
+        self._scrollbar.grid(row=0, column=1, sticky="ns", pady=2)
+
+        self._viewport.bind("<Configure>", lambda event: self._render())
+        # Wheel events go to the widget under the pointer, usually one of the row buttons
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.bind_all(sequence, self._on_wheel, add="+")
+
+    def set_items(self, keys: Sequence[int], titles: Sequence[str]):
+        """Shows the rows `keys`, labelled with `titles[key]`, scrolled to the top and with no row selected."""
+        self._keys = list(keys)
+        self._titles = titles
+        self._selected_key = None
+        self._offset = 0
+        self._render()
+
+    def extend(self, keys: Sequence[int]):
+        """Appends rows without moving the current scroll position."""
+        self._keys.extend(keys)
+        self._render()
+
+    def prepend(self, keys: Sequence[int]):
+        """Inserts rows at the top; the rows on screen stay in place unless the list is scrolled to the top."""
+        self._keys[:0] = keys
+        if self._offset:
+            self._offset += len(keys) * self.row_height
+        self._render()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _max_offset(self) -> int:
+        return max(0, len(self._keys) * self.row_height - self._viewport.winfo_height())
+
+    def _scroll_to(self, offset: float):
+        offset = int(min(max(offset, 0), self._max_offset()))
+        if offset != self._offset:
+            self._offset = offset
+            self._render()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self._scroll_to(float(amount) * len(self._keys) * self.row_height)
+        elif action == "scroll":
+            step = self._viewport.winfo_height() if unit == "pages" else self.row_height
+            self._scroll_to(self._offset + int(amount) * step)
+
+    def _on_wheel(self, event):
+        widget = str(event.widget)
+        # The scrollbar handles the wheel itself
+        if not widget.startswith(str(self)) or widget.startswith(str(self._scrollbar)):
+            return
+        if getattr(event, "num", None) in (4, 5):
+            # X11 reports the wheel as buttons 4 and 5
+            direction = -1 if event.num == 4 else 1
+        else:
+            direction = -1 if event.delta > 0 else 1
+        self._scroll_to(self._offset + direction * self.row_height * 3)
+
+    def _ensure_pool(self, size: int):
+        while len(self._buttons) < size:
+            slot = len(self._buttons)
+            button = ctk.CTkButton(self._viewport, text="", anchor="w", fg_color=ROW_COLOR, hover=True,
+                                   corner_radius=4, font=("Roboto", 12), height=self.row_height - 8,
+                                   command=lambda s=slot: self._on_click(s))
+            self._buttons.append(button)
+
+    def _on_click(self, slot: int):
+        index = self._offset // self.row_height + slot
+        if index < len(self._keys):
+            self._selected_key = self._keys[index]
+            self._render()
+            self.on_select(self._selected_key)
+
+    def _render(self):
+        """Places one pooled button per visible row and updates the scrollbar."""
+        height = self._viewport.winfo_height()
+        self._offset = min(self._offset, self._max_offset())
+        visible_rows = math.ceil(height / self.row_height)
+        self._ensure_pool(visible_rows + 1)
+
+        first = self._offset // self.row_height
+        shift = self._offset % self.row_height
+        for slot, button in enumerate(self._buttons):
+            index = first + slot
+            if index >= len(self._keys) or slot * self.row_height - shift > height:
+                button.place_forget()
+                continue
+            key = self._keys[index]
+            button.configure(text=self._titles[key],
+                             fg_color=SELECTED_ROW_COLOR if key == self._selected_key else ROW_COLOR)
+            button.place(x=0, y=slot * self.row_height - shift + 8, relwidth=1.0)
+
+        total = len(self._keys) * self.row_height
+        if total <= height:
+            self._scrollbar.set(0.0, 1.0)
+        else:
+            self._scrollbar.set(self._offset / total, (self._offset + height) / total)
+
+        if self.on_scroll_end and first + 2 * visible_rows >= len(self._keys):
+            self.on_scroll_end()
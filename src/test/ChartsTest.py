@@ -0,0 +1,66 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from matplotlib.figure import Figure
+from src.main.model.JobOffer import JobOffer
+from src.main.service.StatisticsService import StatisticsService
+from src.main.view.Charts import CHARTS, SALARY_UNIT, plot_position_types, plot_salary_distribution, plot_site_trends
+
+
+def make_report(offers):
+    provider = MagicMock()
+    provider.read_data.return_value = offers
+    return StatisticsService(provider).get_report(unit=SALARY_UNIT)
+
+
+class TestCharts(unittest.TestCase):
+
+    def setUp(self):
+        scraped_at = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+        self.report = make_report([
+            JobOffer("Kelner", None, None, "30 zł / godz. brutto", "https://example.com/1", "olx.pl", scraped_at=scraped_at),
+            JobOffer("Barista", None, None, "32 - 36 zł / godz. brutto", "https://example.com/2", "olx.pl", scraped_at=scraped_at),
+            JobOffer("Kierowca", None, None, "6000 zł / mies. brutto", "https://example.com/3", "pracuj.pl", scraped_at=scraped_at),
+        ])
+        self.axes = Figure().add_subplot()
+
+    def test_position_types_are_bars_per_type(self):
+        plot_position_types(self.axes, self.report)
+
+        self.assertEqual(len(self.axes.patches), len(self.report["position_type_counts"]))
+        self.assertEqual(sorted(patch.get_height() for patch in self.axes.patches), [1, 2])
+
+    def test_salary_distribution_draws_the_histogram_of_one_unit(self):
+        plot_salary_distribution(self.axes, self.report)
+
+        counts = self.report["salary_statistics"]["histogram"]["counts"]
+        self.assertEqual([patch.get_height() for patch in self.axes.patches], counts)
+        self.assertEqual(sum(counts), 2)
+
+    def test_salary_distribution_without_salaries(self):
+        plot_salary_distribution(self.axes, make_report([]))
+
+        self.assertEqual(len(self.axes.patches), 0)
+        self.assertEqual(self.axes.texts[0].get_text(), 'No salary data')
+
+    def test_site_trends_draw_one_line_per_site(self):
+        plot_site_trends(self.axes, self.report)
+
+        self.assertEqual(sorted(line.get_label() for line in self.axes.get_lines()), ["olx.pl", "pracuj.pl"])
+
+    def test_every_chart_renders_with_and_without_offers(self):
+        for report in (self.report, make_report([])):
+            for chart in CHARTS.values():
+                figure = Figure()
+                chart(figure.add_subplot(), report)
+                figure.canvas.draw()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+import psycopg2
+from src.main.persistance import ConnectionPool as pool_module
+from src.main.persistance.ConnectionPool import ConnectionPool, get_shared_pool
+
+
+class FakeThreadedConnectionPool:
+    """Stands in for psycopg2's pool and hands out mock connections."""
+
+    def __init__(self, minconn, maxconn, **kwargs):
+        self.created = []
+        self.closed = []
+        self.idle = []
+
+    def _new_connection(self):
+        conn = MagicMock()
+        conn.closed = 0
+        self.created.append(conn)
+        return conn
+
+    def getconn(self):
+        return self.idle.pop() if self.idle else self._new_connection()
+
+    def putconn(self, conn, close=False):
+        if close:
+            self.closed.append(conn)
+        else:
+            self.idle.append(conn)
+
+    def closeall(self):
+        pass
+
+
+@patch.object(pool_module, 'ThreadedConnectionPool', FakeThreadedConnectionPool)
+class TestConnectionPool(unittest.TestCase):
+
+    def test_connection_commits_and_is_reused(self):
+        pool = ConnectionPool(1, 2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            pass
+
+        self.assertIs(first, second)
+        first.commit.assert_called()
+        self.assertEqual(len(pool._pool.created), 1)
+
+    def test_connection_rolls_back_on_error(self):
+        pool = ConnectionPool(1, 2)
+        with self.assertRaises(ValueError):
+            with pool.connection() as conn:
+                raise ValueError("boom")
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        self.assertIn(conn, pool._pool.idle)
+
+    def test_abandoned_stream_rolls_back(self):
+        pool = ConnectionPool(1, 2)
+
+        def stream():
+            with pool.connection() as conn:
+                yield conn
+                yield conn
+
+        reader = stream()
+        conn = next(reader)
+        reader.close()
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        self.assertIn(conn, pool._pool.idle)
+
+    def test_closed_connection_is_replaced(self):
+        pool = ConnectionPool(1, 2)
+        with pool.connection() as first:
+            pass
+        first.closed = 1
+
+        with pool.connection() as second:
+            pass
+
+        self.assertIsNot(first, second)
+        self.assertIn(first, pool._pool.closed)
+
+    def test_idle_connection_is_pinged(self):
+        pool = ConnectionPool(1, 2)
+        with pool.connection() as conn:
+            pass
+        pool._last_used[id(conn)] -= pool_module.HEALTH_CHECK_AFTER + 1
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError("gone")
+
+        with pool.connection() as replacement:
+            pass
+
+        self.assertIsNot(conn, replacement)
+        self.assertIn(conn, pool._pool.closed)
+
+    def test_checkout_waits_for_a_free_connection(self):
+        pool = ConnectionPool(1, 1, acquire_timeout=2)
+        conn = pool.getconn()
+        threading.Timer(0.1, pool.putconn, args=(conn,)).start()
+
+        start = time.monotonic()
+        self.assertIs(pool.getconn(), conn)
+        self.assertGreaterEqual(time.monotonic() - start, 0.05)
+
+    def test_checkout_times_out_when_pool_is_exhausted(self):
+        pool = ConnectionPool(1, 1, acquire_timeout=0.05)
+        pool.getconn()
+        with self.assertRaises(TimeoutError):
+            pool.getconn()
+
+    def test_shared_pool_is_reused_for_same_parameters(self):
+        self.addCleanup(pool_module._shared_pools.clear)
+        first = get_shared_pool(host='db.example', port='5432')
+        second = get_shared_pool(port='5432', host='db.example')
+        other = get_shared_pool(host='other.example', port='5432')
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+if __name__ == '__main__':
+    unittest.main()
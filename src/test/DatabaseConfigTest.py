@@ -0,0 +1,338 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.persistance.Supabase import ADDED_COLUMNS, INDEXES, OFFER_COLUMNS, DatabaseConfig
+from src.main.model.JobOffer import JobOffer
+
+
+SCRAPED_AT = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def returned_row(offer, inserted=True):
+    return (offer.url, offer.title, SCRAPED_AT, inserted)
+
+
+def make_offer(i, title=None):
+    return JobOffer(title or f"Offer {i}", "Company", "Wrocław", "30 zł / godz. brutto", f"https://example.com/{i}", "olx.pl")
+
+
+class TestDatabaseConfigInsert(unittest.TestCase):
+
+    def setUp(self):
+        self.database = DatabaseConfig()
+        self.cursor = MagicMock()
+        cursor = patch.object(self.database, 'cursor')
+        cursor.start().return_value.__enter__.return_value = self.cursor
+        self.addCleanup(cursor.stop)
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_insert_sends_one_batched_statement(self, mock_execute_values):
+        offers = [make_offer(i) for i in range(3)]
+        mock_execute_values.return_value = []
+
+        self.database.insert_data(offers)
+
+        mock_execute_values.assert_called_once()
+        args, kwargs = mock_execute_values.call_args
+        self.assertIn("RETURNING url, title, scraped_at", args[1])
+        self.assertEqual(len(args[2]), 3)
+        self.assertTrue(kwargs['fetch'])
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_insert_returns_exactly_the_new_offers(self, mock_execute_values):
+        offers = [make_offer(i) for i in range(4)]
+        mock_execute_values.return_value = [returned_row(offers[3]), returned_row(offers[1]),
+                                            returned_row(offers[0], inserted=False)]
+
+        inserted = self.database.insert_data(offers)
+
+        self.assertEqual(inserted, [offers[1], offers[3]])
+        self.assertEqual(inserted[0].scraped_at, SCRAPED_AT)
+        self.assertIsNone(offers[0].scraped_at)
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_existing_offers_refresh_last_seen(self, mock_execute_values):
+        mock_execute_values.return_value = []
+
+        self.database.insert_data([make_offer(1)])
+
+        self.assertIn("DO UPDATE SET last_seen_at", mock_execute_values.call_args.args[1])
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_duplicates_in_batch_are_sent_once(self, mock_execute_values):
+        first = make_offer(1)
+        duplicate = make_offer(1)
+        other = make_offer(1, title="Other title")
+        mock_execute_values.return_value = [returned_row(first), returned_row(other)]
+
+        inserted = self.database.insert_data([first, duplicate, other])
+
+        self.assertEqual(len(mock_execute_values.call_args.args[2]), 2)
+        self.assertEqual(inserted, [first, other])
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_parsed_salary_is_stored_with_the_offer(self, mock_execute_values):
+        mock_execute_values.return_value = []
+        no_salary = make_offer(2)
+        no_salary.salary = "do uzgodnienia"
+
+        self.database.insert_data([make_offer(1), no_salary])
+
+        rows = mock_execute_values.call_args.args[2]
+        self.assertEqual(rows[0][-4:], (30.0, 30.0, 'hourly', True))
+        self.assertEqual(rows[1][-4:], (None, None, None, None))
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_create_table_upgrades_old_tables_and_backfills_salaries(self, mock_execute_values):
+        self.cursor.fetchall.side_effect = [
+            [(column,) for column in OFFER_COLUMNS if column != 'scraped_at'],
+            [],
+            [("30,50 - 33 zł / godz. brutto",), ("do uzgodnienia",)],
+        ]
+
+        self.database.create_table()
+
+        statements = [repr(call.args[0]) for call in self.cursor.execute.call_args_list]
+        self.assertEqual(sum('ALTER TABLE' in statement for statement in statements), 1)
+        self.assertEqual(sum('CREATE INDEX' in statement for statement in statements), len(INDEXES))
+        args, kwargs = mock_execute_values.call_args
+        self.assertIn("UPDATE data", args[1])
+        self.assertEqual(args[2], [("30,50 - 33 zł / godz. brutto", 30.5, 33.0, 'hourly', True)])
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_create_table_leaves_an_up_to_date_table_alone(self, mock_execute_values):
+        self.cursor.fetchall.side_effect = [
+            [(column,) for column in (*OFFER_COLUMNS, *ADDED_COLUMNS)],
+            [(index,) for index in INDEXES],
+        ]
+
+        self.database.create_table()
+
+        statements = [repr(call.args[0]) for call in self.cursor.execute.call_args_list]
+        self.assertFalse(any('ALTER TABLE' in statement or 'CREATE INDEX' in statement for statement in statements))
+        mock_execute_values.assert_not_called()
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_empty_input_skips_the_database(self, mock_execute_values):
+        self.assertEqual(self.database.insert_data([]), [])
+        mock_execute_values.assert_not_called()
+
+
+class TestDatabaseConfigRead(unittest.TestCase):
+
+    def setUp(self):
+        self.database = DatabaseConfig()
+        self.conn = MagicMock()
+        self.named_cursor = self.conn.cursor.return_value.__enter__.return_value
+        connection = patch.object(self.database, 'connection')
+        connection.start().return_value.__enter__.return_value = self.conn
+        self.addCleanup(connection.stop)
+
+    def test_iter_data_uses_named_cursor_with_itersize(self):
+        self.named_cursor.__iter__.return_value = iter([])
+
+        list(self.database.iter_data(itersize=321))
+
+        self.assertTrue(self.conn.cursor.call_args.kwargs['name'].startswith('read_data_'))
+        self.assertEqual(self.named_cursor.itersize, 321)
+
+    def test_iter_data_is_lazy(self):
+        rows = iter([("https://example.com/1", "Kelner")])
+        self.named_cursor.__iter__.return_value = rows
+
+        stream = self.database.iter_data(columns=('url', 'title'))
+        self.conn.cursor.assert_not_called()
+        next(stream)
+        self.conn.cursor.assert_called_once()
+
+    def test_projected_columns_are_mapped_by_name(self):
+        self.named_cursor.__iter__.return_value = iter([("Kelner", "33 zł / godz. brutto")])
+
+        offers = self.database.read_data(columns=('title', 'salary'))
+
+        self.assertEqual(len(offers), 1)
+        self.assertEqual(offers[0].title, "Kelner")
+        self.assertEqual(offers[0].salary, "33 zł / godz. brutto")
+        self.assertIsNone(offers[0].url)
+        self.assertIsNone(offers[0].site_id)
+
+    def test_full_rows_are_mapped_to_all_attributes(self):
+        row = ("https://example.com/1", "Kelner", "Bistro", "Wrocław", "31 zł", "olx.pl", "Umowa zlecenie", SCRAPED_AT)
+        self.named_cursor.__iter__.return_value = iter([row])
+
+        offer = self.database.read_data()[0]
+
+        self.assertEqual((offer.url, offer.title, offer.company, offer.location, offer.salary, offer.site_id,
+                          offer.add_info, offer.scraped_at), row)
+
+    def test_read_data_since_filters_and_orders_by_watermark(self):
+        self.named_cursor.__iter__.return_value = iter([])
+        with patch.object(self.database, '_build_select', wraps=self.database._build_select) as build_select:
+            self.database.read_data_since(SCRAPED_AT, columns=('title', 'scraped_at'))
+
+        self.assertEqual(build_select.call_args.args[2], SCRAPED_AT)
+        query, params = self.named_cursor.execute.call_args.args
+        self.assertEqual(params, [SCRAPED_AT])
+        self.assertIn('ORDER BY scraped_at', repr(query))
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_stored_offers_are_looked_up_by_key_in_one_query(self, mock_execute_values):
+        keys = [("https://example.com/1", "Kelner"), ("https://example.com/2", "Barista"), ("https://example.com/1", "Kelner")]
+        mock_execute_values.return_value = [("https://example.com/2", "Barista")]
+
+        stored = self.database.find_stored_offers(keys)
+
+        self.assertEqual(stored, {("https://example.com/2", "Barista")})
+        mock_execute_values.assert_called_once()
+        args, kwargs = mock_execute_values.call_args
+        self.assertIn("WHERE (url, title) IN (VALUES %s)", args[1])
+        self.assertEqual(args[2], keys[:2])
+        self.assertTrue(kwargs['fetch'])
+
+    @patch('src.main.persistance.Supabase.execute_values')
+    def test_no_keys_skip_the_lookup(self, mock_execute_values):
+        self.assertEqual(self.database.find_stored_offers([]), set())
+        mock_execute_values.assert_not_called()
+
+    def test_filters_become_query_parameters(self):
+        self.named_cursor.__iter__.return_value = iter([])
+
+        self.database.read_data(filters={'site_id': 'olx.pl', 'location': ['Wrocław', 'Kraków'], 'salary': None})
+
+        query, params = self.named_cursor.execute.call_args.args
+        self.assertEqual(params, ['olx.pl', ['Wrocław', 'Kraków']])
+
+    def test_unknown_columns_are_rejected(self):
+        with self.assertRaises(ValueError):
+            self.database.read_data(columns=('title', 'password'))
+        with self.assertRaises(ValueError):
+            self.database.read_data(filters={'1=1; --': 'x'})
+
+
+class TestDatabaseConfigSalaryAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.database = DatabaseConfig()
+        self.cursor = MagicMock()
+        cursor = patch.object(self.database, 'cursor')
+        cursor.start().return_value.__enter__.return_value = self.cursor
+        self.addCleanup(cursor.stop)
+
+    def test_aggregates_pass_percentiles_as_fractions(self):
+        self.cursor.fetchall.return_value = [(None, 2, 31.0, 30.0, 32.0, [31.0])]
+
+        rows = self.database.get_salary_aggregates((50,), unit='hourly')
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertEqual(params, [[0.5], 'hourly'])
+        self.assertIn('percentile_cont', repr(query))
+        self.assertEqual(rows, [(None, 2, 31.0, 30.0, 32.0, [31.0])])
+
+    def test_position_type_groups_use_escaped_like_patterns(self):
+        self.cursor.fetchall.return_value = []
+        keywords = {"Sprzedaż": ["Sprzedawca", "100%_bonus"], "Pusta": [], "Kuchnia": ["kucharz"]}
+
+        self.database.get_salary_aggregates((50,), group_by='position_type', position_keywords=keywords)
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertEqual(params, [[0.5], ['%sprzedawca%', '%100\\%\\_bonus%'], "Sprzedaż", ['%kucharz%'], "Kuchnia", "Inne"])
+        self.assertIn('LIKE ANY', repr(query))
+
+    def test_position_type_counts_come_back_as_one_row_per_type(self):
+        self.cursor.fetchall.return_value = [("Gastronomia", 12), ("Inne", 3)]
+
+        counts = self.database.get_position_type_counts({"Gastronomia": ["kelner"]})
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertEqual(params, [['%kelner%'], "Gastronomia", "Inne"])
+        self.assertIn('GROUP BY position_type', repr(query))
+        self.assertEqual(counts, {"Gastronomia": 12, "Inne": 3})
+
+    def test_position_type_counts_without_categories(self):
+        self.cursor.fetchall.return_value = [("Inne", 15)]
+
+        self.database.get_position_type_counts({"Pusta": []})
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertEqual(params, ["Inne"])
+        self.assertNotIn('CASE', repr(query))
+
+    def test_unknown_grouping_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.database.get_salary_aggregates((50,), group_by='company')
+
+    def test_table_state_is_row_count_and_newest_offer(self):
+        self.cursor.fetchone.return_value = (42, SCRAPED_AT)
+
+        self.assertEqual(self.database.get_table_state(), (42, SCRAPED_AT))
+        self.assertIn("max(scraped_at)", self.cursor.execute.call_args.args[0])
+
+    def test_histogram_fills_empty_bins(self):
+        self.cursor.fetchall.return_value = [(1, 4), (3, 1)]
+
+        counts = self.database.get_salary_histogram([30, 35, 40, 45])
+
+        self.assertEqual(counts, [4, 0, 1])
+        self.assertEqual(self.cursor.execute.call_args.args[1], [[30, 35, 40, 45], 3])
+
+    def test_site_trends_are_grouped_by_utc_day(self):
+        rows = [("olx.pl", SCRAPED_AT.date(), 4)]
+        self.cursor.fetchall.return_value = rows
+
+        self.assertEqual(self.database.get_site_trends(), rows)
+        query = self.cursor.execute.call_args.args[0]
+        self.assertIn("AT TIME ZONE 'UTC'", query)
+        self.assertIn("GROUP BY site_id, day", query)
+
+
+class TestDatabaseConfigPages(unittest.TestCase):
+
+    def setUp(self):
+        self.database = DatabaseConfig()
+        self.cursor = MagicMock()
+        cursor = patch.object(self.database, 'cursor')
+        cursor.start().return_value.__enter__.return_value = self.cursor
+        self.addCleanup(cursor.stop)
+
+    def test_first_page_is_newest_first_with_a_cursor_after_its_last_row(self):
+        rows = [("https://example.com/2", "Kelner", SCRAPED_AT), ("https://example.com/1", "Barista", SCRAPED_AT)]
+        self.cursor.fetchall.return_value = rows
+
+        page, after = self.database.read_page(limit=2, columns=('url', 'title', 'scraped_at'))
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertNotIn('WHERE', repr(query))
+        self.assertIn('DESC', repr(query))
+        self.assertEqual(params, [2])
+        self.assertEqual([offer.title for offer in page], ["Kelner", "Barista"])
+        self.assertEqual(after, (SCRAPED_AT, "https://example.com/1", "Barista"))
+
+    def test_next_page_starts_after_the_cursor(self):
+        self.cursor.fetchall.return_value = []
+        after = (SCRAPED_AT, "https://example.com/1", "Barista")
+
+        page, next_after = self.database.read_page(after, limit=2)
+
+        query, params = self.cursor.execute.call_args.args
+        self.assertIn('WHERE', repr(query))
+        self.assertEqual(params, [SCRAPED_AT, "https://example.com/1", "Barista", 2])
+        self.assertEqual(len(page), 0)
+        self.assertIsNone(next_after)
+
+    def test_short_page_is_the_last(self):
+        self.cursor.fetchall.return_value = [("Kelner", SCRAPED_AT, "https://example.com/1")]
+
+        page, after = self.database.read_page(limit=2, columns=('title',))
+
+        # The key columns are read for the cursor even when not asked for
+        self.assertEqual(page[0].url, "https://example.com/1")
+        self.assertIsNone(after)
+
+if __name__ == '__main__':
+    unittest.main()
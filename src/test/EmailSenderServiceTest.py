@@ -3,7 +3,9 @@ import sys
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
+import smtplib
 import unittest
+from unittest.mock import MagicMock, patch
 from src.main.service.EmailSenderService import EmailSenderService
 from src.main.model.JobOffer import JobOffer
 from src.main.service.EmailFormatService import EmailFormatService
@@ -162,6 +164,80 @@ class TestEmailSenderService(unittest.TestCase):
         self.assertIsInstance(self.email_sender.smtp_port, int, "SMTP_PORT should be an integer")
         self.assertGreater(self.email_sender.smtp_port, 0, "SMTP_PORT should be positive")
 
+
+@patch.dict(os.environ, {'FROM_EMAIL': 'sender@example.com', 'GMAIL_PASSWORD': 'secret', 'TO_EMAILS': '',
+                         'SMTP_SERVER': 'smtp.example.com', 'SMTP_PORT': '587'})
+class TestEmailSenderSession(unittest.TestCase):
+    """Runs without a mail server; smtplib.SMTP is replaced by mocks."""
+
+    def setUp(self):
+        self.recipients = ['a@example.com', 'b@example.com', 'c@example.com']
+        smtp = patch('src.main.service.EmailSenderService.smtplib.SMTP')
+        self.smtp = smtp.start()
+        self.addCleanup(smtp.stop)
+        self.sessions = []
+
+        def open_session(*args):
+            session = MagicMock()
+            self.sessions.append(session)
+            return session
+        self.smtp.side_effect = open_session
+
+    def test_one_session_serves_every_recipient(self):
+        results = EmailSenderService().send_email("Body", "Subject", self.recipients)
+
+        self.assertEqual(results, dict.fromkeys(self.recipients, True))
+        self.assertEqual(len(self.sessions), 1)
+        session = self.sessions[0]
+        session.starttls.assert_called_once()
+        session.login.assert_called_once_with('sender@example.com', 'secret')
+        self.assertEqual([call.args[1] for call in session.sendmail.call_args_list], self.recipients)
+        session.quit.assert_called_once()
+
+    def test_dropped_session_is_reopened(self):
+        def open_session(*args):
+            session = MagicMock()
+            if not self.sessions:
+                # The first session drops while sending the second message
+                session.sendmail.side_effect = [None, smtplib.SMTPServerDisconnected("Connection unexpectedly closed")]
+            self.sessions.append(session)
+            return session
+        self.smtp.side_effect = open_session
+
+        results = EmailSenderService().send_email("Body", "Subject", self.recipients)
+
+        self.assertEqual(results, dict.fromkeys(self.recipients, True))
+        self.assertEqual(len(self.sessions), 2)
+        self.assertEqual([call.args[1] for call in self.sessions[1].sendmail.call_args_list],
+                         ['b@example.com', 'c@example.com'])
+        self.sessions[1].login.assert_called_once()
+
+    def test_rejected_recipient_keeps_the_session(self):
+        def open_session(*args):
+            session = MagicMock()
+            session.sendmail.side_effect = [None, smtplib.SMTPRecipientsRefused({'b@example.com': (550, b'No such user')}), None]
+            self.sessions.append(session)
+            return session
+        self.smtp.side_effect = open_session
+
+        results = EmailSenderService().send_email("Body", "Subject", self.recipients)
+
+        self.assertEqual(results, {'a@example.com': True, 'b@example.com': False, 'c@example.com': True})
+        self.assertEqual(len(self.sessions), 1)
+
+    def test_failed_login_closes_the_connection(self):
+        def open_session(*args):
+            session = MagicMock()
+            session.login.side_effect = smtplib.SMTPAuthenticationError(535, b'Bad credentials')
+            self.sessions.append(session)
+            return session
+        self.smtp.side_effect = open_session
+
+        results = EmailSenderService().send_email("Body", "Subject", self.recipients[:1])
+
+        self.assertEqual(results, {'a@example.com': False})
+        self.sessions[0].quit.assert_called_once()
+
 if __name__ == '__main__':
     log.info("Starting EmailSenderService tests")
     unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+import os
+import sys
+import unittest
+from concurrent.futures import Future
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.GUI import GUI, PAGE_RETRY_MS
+from src.main.model.JobOffer import JobOffer
+from src.main.model.OfferBatch import OfferBatch
+from src.main.service.SearchIndex import SearchIndex
+
+START = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+
+
+def make_offer(title, hours):
+    return JobOffer(title, None, None, None, f"https://example.com/{title}", 'example.com',
+                    scraped_at=START + timedelta(hours=hours))
+
+
+def make_gui():
+    """A GUI without a window; the widgets are mocked, so no display is needed."""
+    gui = GUI.__new__(GUI)
+    gui.app = MagicMock()
+    gui.refresh_button = MagicMock()
+    gui.settings_status_label = MagicMock()
+    gui.offer_list = MagicMock()
+    gui.search_var = MagicMock()
+    gui.search_var.get.return_value = ""
+    gui.search_index = SearchIndex()
+    gui.truncate_title = lambda text: text
+    gui.refresh_worker = None
+    gui.data = OfferBatch()
+    gui.offer_keys = set()
+    gui.refreshed_keys = []
+    gui.paged_keys = []
+    gui.ranks = []
+    gui.top_rank = 0
+    gui.titles = []
+    gui.watermark = None
+    gui.page_cursor = None
+    gui.all_pages_loaded = False
+    return gui
+
+
+class TestGUIPageLoading(unittest.TestCase):
+
+    def setUp(self):
+        self.gui = make_gui()
+
+    def finish_page_job(self, error):
+        job = Future()
+        job.set_exception(error)
+        self.gui.page_job = job
+        self.gui.on_page_progress()
+
+    def test_failed_first_page_enables_refresh_and_is_retried(self):
+        self.finish_page_job(ConnectionError("database unreachable"))
+
+        self.gui.settings_status_label.configure.assert_called_with(text="LOADING FAILED")
+        self.gui.refresh_button.configure.assert_called_once_with(state="normal")
+        self.gui.app.after.assert_called_once_with(PAGE_RETRY_MS, self.gui.load_next_page)
+        self.assertIsNone(self.gui.page_job)
+
+    def test_failed_page_during_a_refresh_leaves_the_button_alone(self):
+        self.gui.refresh_worker = MagicMock()
+
+        self.finish_page_job(ConnectionError("database unreachable"))
+
+        self.gui.refresh_button.configure.assert_not_called()
+
+
+class TestGUIOfferOrder(unittest.TestCase):
+
+    def setUp(self):
+        self.gui = make_gui()
+        self.gui.add_offers([make_offer("Kelner", 3), make_offer("Barista", 2)])
+        # A refresh stores offers newer than every page, in any order
+        self.gui.add_offers([make_offer("Kasjer", 5), make_offer("Kucharz", 6)], newest=True)
+        # A page read after the refresh is older than everything loaded
+        self.gui.add_offers([make_offer("Kierowca", 1)])
+
+    def shown_titles(self):
+        keys, titles = self.gui.offer_list.set_items.call_args.args
+        return [titles[key] for key in keys]
+
+    def test_refreshed_offers_go_on_top_and_later_pages_at_the_bottom(self):
+        self.gui.offer_list.prepend.assert_called_once_with(range(2, 4))
+        self.assertEqual([call.args[0] for call in self.gui.offer_list.extend.call_args_list], [range(0, 2), range(4, 5)])
+
+        self.gui.fill_listbox()
+
+        self.assertEqual(self.shown_titles(), ["Kucharz", "Kasjer", "Kelner", "Barista", "Kierowca"])
+
+    def test_search_results_keep_the_list_order(self):
+        self.gui.fill_listbox(self.gui.search_index.search("k"))
+
+        self.assertEqual(self.shown_titles(), ["Kucharz", "Kasjer", "Kelner", "Kierowca"])
+
+    def test_matching_refreshed_offers_are_prepended_while_searching(self):
+        self.gui.search_var.get.return_value = "ucha"
+
+        self.gui.add_offers([make_offer("Kucharka", 7), make_offer("Barman", 8)], newest=True)
+
+        self.assertEqual(self.gui.offer_list.prepend.call_args.args[0], [6])
+        self.assertEqual(self.gui.data[6].title, "Kucharka")
+
+
+if __name__ == '__main__':
+    unittest.main()
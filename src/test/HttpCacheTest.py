@@ -0,0 +1,92 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+import requests
+from src.main.persistance.HttpCache import HttpCache
+
+
+def make_response(status_code=200, content=b'<html>page</html>', headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.raw = io.BytesIO(content)
+    response.headers.update(headers or {})
+    return response
+
+
+class TestHttpCache(unittest.TestCase):
+
+    URL = 'https://jobs.example/praca'
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, 'nested', 'http_cache.json')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_unknown_url_has_no_conditional_headers(self):
+        cache = HttpCache(self.path)
+        self.assertEqual(cache.get_conditional_headers(self.URL), {})
+
+    def test_first_response_is_changed_and_recorded(self):
+        cache = HttpCache(self.path)
+        response = make_response(headers={'ETag': '"v1"', 'Last-Modified': 'Wed, 01 Oct 2025 08:00:00 GMT'})
+
+        self.assertFalse(cache.is_unchanged(self.URL, response))
+        cache.record(self.URL, response)
+        self.assertEqual(cache.get_conditional_headers(self.URL), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Wed, 01 Oct 2025 08:00:00 GMT',
+        })
+
+    def test_not_modified_response_is_unchanged(self):
+        cache = HttpCache(self.path)
+        cache.record(self.URL, make_response(headers={'ETag': '"v1"'}))
+
+        self.assertTrue(cache.is_unchanged(self.URL, make_response(304, b'')))
+        cache.record(self.URL, make_response(304, b''))
+        self.assertEqual(cache.get_conditional_headers(self.URL), {'If-None-Match': '"v1"'})
+
+    def test_same_body_is_unchanged_and_new_body_is_not(self):
+        cache = HttpCache(self.path)
+        cache.record(self.URL, make_response(content=b'first'))
+
+        self.assertTrue(cache.is_unchanged(self.URL, make_response(content=b'first')))
+        self.assertFalse(cache.is_unchanged(self.URL, make_response(content=b'second')))
+
+    def test_cache_survives_save_and_reload(self):
+        cache = HttpCache(self.path)
+        cache.record(self.URL, make_response(content=b'first', headers={'ETag': '"v1"'}))
+        cache.save()
+
+        reloaded = HttpCache(self.path)
+        self.assertEqual(reloaded.get_conditional_headers(self.URL), {'If-None-Match': '"v1"'})
+        self.assertTrue(reloaded.is_unchanged(self.URL, make_response(content=b'first')))
+
+    def test_checked_response_is_not_recorded(self):
+        cache = HttpCache(self.path)
+        cache.is_unchanged(self.URL, make_response(content=b'first', headers={'ETag': '"v1"'}))
+        cache.save()
+
+        self.assertEqual(cache.get_conditional_headers(self.URL), {})
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(cache.is_unchanged(self.URL, make_response(content=b'first')))
+
+    def test_corrupted_cache_file_starts_empty(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{not json')
+
+        cache = HttpCache(self.path)
+        self.assertEqual(cache.get_conditional_headers(self.URL), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import logging
+import os
+import queue
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.config import logger_config
+from src.main.config.logger_config import _ContextualLogger, _BatchingFileHandler, _BoundedQueueHandler
+
+
+class TestContextualLogger(unittest.TestCase):
+
+    def setUp(self):
+        self.created = []
+
+        def fake_get_logger(name="offer_scraper", level=logging.INFO):
+            self.created.append(name)
+            logger = logging.getLogger(f"logger_config_test.{name}")
+            logger.setLevel(level)
+            return logger
+
+        get_logger = patch.object(logger_config, 'get_logger', side_effect=fake_get_logger)
+        get_logger.start()
+        self.addCleanup(get_logger.stop)
+        self.proxy = _ContextualLogger()
+
+    def test_logger_is_named_after_calling_module(self):
+        self.proxy.info("hello")
+        self.assertEqual(self.created, [__name__])
+
+    def test_call_site_is_resolved_once(self):
+        for _ in range(3):
+            self.proxy.warning("repeated")
+        self.assertEqual(self.created, [__name__])
+        self.assertEqual(len(self.proxy._names_by_code), 1)
+
+    def test_disabled_level_skips_the_logger(self):
+        with patch.object(logging.Logger, '_log') as mock_log:
+            self.proxy.debug("filtered")
+            mock_log.assert_not_called()
+            self.proxy.info("emitted")
+            mock_log.assert_called_once()
+
+    def test_non_logging_attributes_are_forwarded(self):
+        self.assertEqual(self.proxy.name, f"logger_config_test.{__name__}")
+        self.assertTrue(self.proxy.isEnabledFor(logging.INFO))
+
+    def test_main_module_uses_file_name(self):
+        code = compile("proxy.info('from script')", os.path.join('scripts', 'run_job.py'), 'exec')
+        exec(code, {'__name__': '__main__', 'proxy': self.proxy})
+        self.assertEqual(self.created, ['run_job'])
+
+
+class TestLogHandlers(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.log_path = os.path.join(self.tmp_dir.name, 'test.log')
+
+    def make_record(self, message, level=logging.INFO):
+        return logging.LogRecord('logger_config_test', level, __file__, 0, message, None, None)
+
+    def read_log(self):
+        with open(self.log_path, encoding='utf-8') as f:
+            return f.read()
+
+    def test_batching_file_handler_flushes_every_n_records(self):
+        handler = _BatchingFileHandler(self.log_path, flush_every=3, flush_interval=3600, encoding='utf-8')
+        self.addCleanup(handler.close)
+        with patch.object(logging.FileHandler, 'flush') as mock_flush:
+            for i in range(5):
+                handler.emit(self.make_record(f"line {i}"))
+            self.assertEqual(mock_flush.call_count, 1)
+            handler.emit(self.make_record("failure", logging.ERROR))
+            self.assertEqual(mock_flush.call_count, 2)
+
+    def test_batching_file_handler_writes_pending_records_on_close(self):
+        handler = _BatchingFileHandler(self.log_path, flush_every=1000, flush_interval=3600, encoding='utf-8')
+        handler.emit(self.make_record("buffered"))
+        handler.close()
+        self.assertIn("buffered", self.read_log())
+
+    def test_bounded_queue_handler_drops_when_full(self):
+        log_queue = queue.Queue(maxsize=2)
+        handler = _BoundedQueueHandler(log_queue, overflow='drop')
+        for i in range(5):
+            handler.emit(self.make_record(f"line {i}"))
+        self.assertEqual(log_queue.qsize(), 2)
+        self.assertEqual(handler.dropped, 3)
+
+    def test_async_mode_writes_through_listener(self):
+        settings = dict(logger_config.DEFAULT_LOGGING_SETTINGS, mode='async')
+        with patch.object(logger_config, 'LOG_FILE_PATH', self.log_path), \
+                patch.object(logger_config, '_handlers', None), \
+                patch.object(logger_config.atexit, 'register'):
+            handlers = logger_config.get_handlers(settings)
+            self.assertIs(logger_config.get_handlers(), handlers)
+            self.assertEqual(len(handlers), 1)
+            self.assertIsInstance(handlers[0], _BoundedQueueHandler)
+
+            handlers[0].handle(self.make_record("through the queue"))
+            logger_config.stop_logging(handlers[0])
+        self.assertIn("through the queue", self.read_log())
+
+    def test_loggers_share_one_file_handler(self):
+        for name in ('logger_config_test.shared_a', 'logger_config_test.shared_b'):
+            # Keeps handlers of the test runner's root logger from counting as already configured
+            logging.getLogger(name).propagate = False
+        with patch.object(logger_config, 'LOG_FILE_PATH', self.log_path), \
+                patch.object(logger_config, '_handlers', None):
+            first = logger_config.get_logger('logger_config_test.shared_a')
+            second = logger_config.get_logger('logger_config_test.shared_b')
+            self.addCleanup(first.handlers[1].close)
+        for logger in (first, second):
+            self.addCleanup(logger.handlers.clear)
+        self.assertEqual(first.handlers, second.handlers)
+
+    def test_settings_fall_back_to_defaults(self):
+        config_path = os.path.join(self.tmp_dir.name, 'config.yml')
+        with open(config_path, 'w', encoding='utf-8') as f:
+            f.write("logging:\n  mode: async\n  overflow: block\n")
+        settings = logger_config.load_logging_settings(config_path)
+        self.assertEqual(settings['mode'], 'async')
+        self.assertEqual(settings['overflow'], 'block')
+        self.assertEqual(settings['queueSize'], logger_config.DEFAULT_LOGGING_SETTINGS['queueSize'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timezone
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.model.JobOffer import JobOffer
+from src.main.model.OfferBatch import OfferBatch
+
+
+def make_offer(i):
+    return JobOffer(f"Offer {i}", "Company", "Wrocław", "30 zł / godz. brutto", f"https://example.com/{i}", "olx.pl",
+                    scraped_at=datetime(2025, 10, 1, 8, i, tzinfo=timezone.utc))
+
+
+class TestJobOffer(unittest.TestCase):
+
+    def test_offers_have_no_instance_dict(self):
+        offer = make_offer(1)
+        self.assertFalse(hasattr(offer, '__dict__'))
+        with self.assertRaises(AttributeError):
+            offer.unknown = 1
+        offer.scraped_at = None
+        self.assertIsNone(offer.scraped_at)
+
+
+class TestOfferBatch(unittest.TestCase):
+
+    def test_iteration_and_indexing_rebuild_offers(self):
+        offers = [make_offer(i) for i in range(3)]
+        batch = OfferBatch(offers)
+
+        self.assertEqual(len(batch), 3)
+        for original, offer in zip(offers, batch):
+            self.assertEqual([getattr(offer, name) for name in JobOffer.__slots__],
+                             [getattr(original, name) for name in JobOffer.__slots__])
+        self.assertEqual(batch[-1].url, "https://example.com/2")
+        self.assertEqual([offer.title for offer in batch[1:]], ["Offer 1", "Offer 2"])
+
+    def test_rows_fill_missing_columns_with_none(self):
+        batch = OfferBatch()
+        batch.append_row(('title', 'site_id'), ("Kelner", "olx.pl"))
+
+        offer = batch[0]
+        self.assertEqual((offer.title, offer.site_id), ("Kelner", "olx.pl"))
+        self.assertIsNone(offer.url)
+        self.assertEqual(batch.column('title'), ["Kelner"])
+
+    def test_repeated_strings_are_interned(self):
+        batch = OfferBatch()
+        for i in range(2):
+            # Built at runtime, like strings decoded from database rows
+            batch.append_row(('title', 'site_id', 'location'), (f"Offer {i}", ''.join(['olx', '.pl']), ''.join(['Wro', 'cław'])))
+
+        self.assertIs(batch.column('site_id')[0], batch.column('site_id')[1])
+        self.assertIs(batch.column('location')[0], batch.column('location')[1])
+
+    def test_in_place_add_extends_the_batch(self):
+        batch = OfferBatch([make_offer(0)])
+        batch += [make_offer(1), make_offer(2)]
+        self.assertEqual(batch.column('url')[-1], "https://example.com/2")
+        self.assertEqual(len(batch), 3)
+
+if __name__ == '__main__':
+    unittest.main()
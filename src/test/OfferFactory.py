@@ -0,0 +1,6 @@
+from src.main.model.JobOffer import JobOffer
+
+
+def make_offers(prefix, count):
+    """Returns `count` offers with distinct titles and URLs built from `prefix`."""
+    return [JobOffer(f"{prefix} {i}", None, None, None, f"https://example.com/{prefix}/{i}", 'example.com') for i in range(count)]
@@ -0,0 +1,75 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.service.PipelineService import PipelineService
+from src.test.OfferFactory import make_offers
+
+
+class TestPipelineService(unittest.TestCase):
+
+    def setUp(self):
+        self.database = MagicMock()
+        # Pretend every second offer of a batch is already stored.
+        self.database.insert_data.side_effect = lambda offers: offers[::2]
+
+    def test_pages_are_grouped_into_database_batches(self):
+        pages = [make_offers('a', 3), make_offers('b', 3), make_offers('c', 1)]
+        pipeline = PipelineService(MagicMock(), self.database, {'batchSize': 5})
+
+        batches = list(pipeline.store_batches(iter(pages)))
+
+        inserted_sizes = [len(call.args[0]) for call in self.database.insert_data.call_args_list]
+        self.assertEqual(inserted_sizes, [6, 1])
+        self.assertEqual([len(batch) for batch in batches], [3, 1])
+
+    def test_only_newly_inserted_offers_are_yielded(self):
+        page = make_offers('a', 4)
+        pipeline = PipelineService(MagicMock(), self.database, {'batchSize': 2})
+
+        inserted = [offer for batch in pipeline.store_batches([page]) for offer in batch]
+
+        self.assertEqual(inserted, [page[0], page[2]])
+
+    def test_first_batch_is_written_before_the_crawl_ends(self):
+        def pages():
+            yield make_offers('a', 2)
+            self.assertEqual(self.database.insert_data.call_count, 1)
+            yield make_offers('b', 2)
+
+        pipeline = PipelineService(MagicMock(), self.database, {'batchSize': 2})
+        list(pipeline.store_batches(pages()))
+
+        self.assertEqual(self.database.insert_data.call_count, 2)
+
+    def test_run_streams_from_the_scraper(self):
+        scraper = MagicMock()
+        scraper.stream_all_sites.return_value = iter([make_offers('a', 2)])
+        pipeline = PipelineService(scraper, self.database)
+
+        inserted = [offer for batch in pipeline.run() for offer in batch]
+
+        scraper.stream_all_sites.assert_called_once_with(None)
+        self.assertEqual(len(inserted), 1)
+
+    def test_run_hands_the_stop_event_to_the_crawl(self):
+        scraper = MagicMock()
+        scraper.stream_all_sites.return_value = iter([])
+        stop = threading.Event()
+
+        list(PipelineService(scraper, self.database).run(stop))
+
+        scraper.stream_all_sites.assert_called_once_with(stop)
+
+    def test_empty_crawl_does_not_touch_the_database(self):
+        pipeline = PipelineService(MagicMock(), self.database)
+        self.assertEqual(list(pipeline.store_batches([])), [])
+        self.database.insert_data.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
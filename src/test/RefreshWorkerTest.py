@@ -0,0 +1,103 @@
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.service.RefreshWorker import RefreshWorker, OFFERS, DONE, FAILED
+from src.test.OfferFactory import make_offers
+
+
+class TestRefreshWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.database = MagicMock()
+        self.database.read_data_since.return_value = []
+        self.scraper = MagicMock()
+        patches = [patch('src.main.service.RefreshWorker.ConfigLoader'),
+                   patch('src.main.service.RefreshWorker.ScraperService', return_value=self.scraper),
+                   patch('src.main.service.RefreshWorker.PipelineService')]
+        mocks = [p.start() for p in patches]
+        for p in patches:
+            self.addCleanup(p.stop)
+        self.scraper_class = mocks[1]
+        self.pipeline_class = mocks[2]
+
+    def run_worker(self, batches, since=None):
+        self.pipeline_class.return_value.run.return_value = batches
+        worker = RefreshWorker(self.database, since)
+        worker.start()
+        worker.join(timeout=5)
+        self.assertFalse(worker.is_alive())
+        return worker
+
+    def test_each_stored_batch_is_posted_before_done(self):
+        first, second = make_offers('a', 2), make_offers('b', 1)
+        worker = self.run_worker(batch for batch in [first, [], second])
+
+        self.assertEqual(worker.poll(), [(OFFERS, first), (OFFERS, second), (DONE, False)])
+        self.assertEqual(worker.poll(), [])
+        self.scraper.close.assert_called_once_with(persist_cache=True)
+
+    def test_scraper_knows_the_stored_offers(self):
+        self.run_worker(batch for batch in [])
+
+        self.assertEqual(self.scraper_class.call_args.args[2], self.database.find_stored_offers)
+
+    def test_offers_stored_by_other_runs_are_posted_after_the_crawl(self):
+        stored = make_offers('other', 1)
+        self.database.read_data_since.return_value = stored
+
+        worker = self.run_worker((batch for batch in [make_offers('a', 1)]), since='since')
+
+        self.database.read_data_since.assert_called_once_with('since')
+        self.assertEqual(worker.poll()[-2:], [(OFFERS, stored), (DONE, False)])
+
+    def test_cancel_stops_the_crawl_after_the_current_batch(self):
+        release = threading.Event()
+        closed = []
+
+        def batches():
+            try:
+                yield make_offers('a', 1)
+                release.wait(5)
+                yield make_offers('b', 1)
+                yield make_offers('c', 1)
+            finally:
+                closed.append(True)
+
+        self.pipeline_class.return_value.run.return_value = batches()
+        worker = RefreshWorker(self.database)
+        worker.start()
+        worker.cancel()
+        release.set()
+        worker.join(timeout=5)
+
+        messages = worker.poll()
+        self.assertEqual(messages[-1], (DONE, True))
+        self.assertLessEqual(len(messages), 3)
+        self.assertEqual(closed, [True])
+        # The crawl is handed the cancel event, so it stops without waiting for a stored batch
+        self.assertIs(self.pipeline_class.return_value.run.call_args.args[0], worker._cancelled)
+        # Unstored pages must not be skipped as unchanged next time
+        self.scraper.close.assert_called_once_with(persist_cache=False)
+        self.database.read_data_since.assert_not_called()
+
+    def test_errors_are_posted_as_failed(self):
+        error = RuntimeError("connection lost")
+
+        def batches():
+            yield make_offers('a', 1)
+            raise error
+
+        worker = self.run_worker(batches())
+
+        self.assertEqual(worker.poll()[-1], (FAILED, error))
+        self.scraper.close.assert_called_once_with(persist_cache=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.model.Salary import HOURLY, MONTHLY, Salary, parse_salary
+
+
+class TestParseSalary(unittest.TestCase):
+
+    def test_hourly_range(self):
+        self.assertEqual(parse_salary("30,50 - 33 zł / godz. brutto"), Salary(30.5, 33, HOURLY, True))
+
+    def test_single_value_is_both_ends_of_the_range(self):
+        salary = parse_salary("31 zł / godz. brutto")
+        self.assertEqual(salary, Salary(31, 31, HOURLY, True))
+        self.assertEqual(salary.midpoint, 31)
+
+    def test_monthly_net_with_grouped_thousands(self):
+        self.assertEqual(parse_salary("4 500 - 5 600 zł / mies. netto"), Salary(4500, 5600, MONTHLY, False))
+
+    def test_unit_and_tax_may_be_missing(self):
+        self.assertEqual(parse_salary("33 - 53 zł"), Salary(33, 53))
+        self.assertEqual(parse_salary("25.5 PLN/h"), Salary(25.5, 25.5, HOURLY))
+
+    def test_text_without_numbers(self):
+        self.assertIsNone(parse_salary("do uzgodnienia"))
+        self.assertIsNone(parse_salary(""))
+        self.assertIsNone(parse_salary(None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,13 @@
 import unittest
+import io
 import os
 import sys
+import threading
+import time
+from unittest.mock import patch, MagicMock
+import requests
+import tempfile
+from bs4 import BeautifulSoup
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
@@ -68,6 +75,503 @@ class TestScraperService(unittest.TestCase):
                     self.assertEqual(offer.site_id, site_id, f"Offer {i} from {site_id} has incorrect site_id '{offer.site_id}'.")
         log.info("Finished test: test_scrape_first_few_offers_all_sites")
 
+
+class TestScraperServiceConcurrency(unittest.TestCase):
+
+    SITES = [
+        {'id': 'slow.example', 'url': 'https://slow.example/jobs', 'selectors': {}},
+        {'id': 'fast.example', 'url': 'https://fast.example/jobs', 'selectors': {}},
+        {'id': 'medium.example', 'url': 'https://medium.example/jobs', 'selectors': {}},
+    ]
+    DELAYS = {'slow.example': 0.2, 'fast.example': 0.0, 'medium.example': 0.1}
+
+    def _fake_scrape_site(self, site_config):
+        site_id = site_config['id']
+        time.sleep(self.DELAYS[site_id])
+        return [JobOffer(f"{site_id} offer {i}", None, None, None, f"{site_config['url']}/{i}", site_id) for i in range(2)]
+
+    def test_scrape_all_sites_keeps_config_order(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 3, 'perHost': 1}})
+        with patch.object(scraper, 'scrape_site', side_effect=self._fake_scrape_site):
+            offers = scraper.scrape_all_sites()
+
+        self.assertEqual([offer.site_id for offer in offers],
+                         ['slow.example', 'slow.example', 'fast.example', 'fast.example', 'medium.example', 'medium.example'])
+
+    def test_scrape_all_sites_runs_sites_concurrently(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 3}})
+        with patch.object(scraper, 'scrape_site', side_effect=self._fake_scrape_site):
+            start = time.perf_counter()
+            scraper.scrape_all_sites()
+            elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, sum(self.DELAYS.values()))
+
+    def _fake_iter_site_pages(self, site_config, stop=None):
+        site_id = site_config['id']
+        for page in range(2):
+            time.sleep(self.DELAYS[site_id])
+            yield [JobOffer(f"{site_id} page {page}", None, None, None, f"{site_config['url']}/{page}", site_id)]
+
+    def test_stream_all_sites_yields_every_page(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 3}})
+        with patch.object(scraper, 'iter_site_pages', side_effect=self._fake_iter_site_pages):
+            pages = list(scraper.stream_all_sites())
+
+        self.assertEqual(len(pages), 6)
+        self.assertEqual(pages[0][0].site_id, 'fast.example')
+        self.assertEqual(sorted(page[0].title for page in pages),
+                         sorted(f"{site['id']} page {page}" for site in self.SITES for page in range(2)))
+
+    def test_streamed_offers_sorted_by_site_match_scrape_all_sites(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 3}})
+        with patch.object(scraper, 'iter_site_pages', side_effect=self._fake_iter_site_pages):
+            streamed = [offer for page in scraper.stream_all_sites() for offer in page]
+            collected = scraper.scrape_all_sites()
+
+        self.assertNotEqual([offer.title for offer in streamed], [offer.title for offer in collected])
+        self.assertEqual([offer.title for offer in scraper.sort_by_site(streamed)], [offer.title for offer in collected])
+
+    def test_stream_all_sites_stops_when_consumer_stops(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 1}})
+        with patch.object(scraper, 'iter_site_pages', side_effect=self._fake_iter_site_pages) as mock_pages:
+            stream = scraper.stream_all_sites()
+            first = next(stream)
+            stream.close()
+
+        self.assertEqual(first[0].site_id, 'slow.example')
+        self.assertLess(mock_pages.call_count, len(self.SITES))
+
+    def test_stream_all_sites_ends_at_once_when_stopped(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 3}})
+        stop = threading.Event()
+        with patch.object(scraper, 'iter_site_pages', side_effect=self._fake_iter_site_pages):
+            stream = scraper.stream_all_sites(stop)
+            first = next(stream)
+            stop.set()
+            rest = list(stream)
+
+        self.assertEqual(first[0].site_id, 'fast.example')
+        self.assertEqual(rest, [])
+
+    def test_stream_all_sites_leaves_the_stop_event_unset_when_finished(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'maxWorkers': 3}})
+        stop = threading.Event()
+        with patch.object(scraper, 'iter_site_pages', side_effect=self._fake_iter_site_pages):
+            self.assertEqual(len(list(scraper.stream_all_sites(stop))), 6)
+
+        self.assertFalse(stop.is_set())
+
+    def test_stream_all_sites_propagates_errors(self):
+        scraper = ScraperService(self.SITES[:1])
+        with patch.object(scraper, 'iter_site_pages', side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                list(scraper.stream_all_sites())
+
+    def test_host_semaphore_is_shared_per_host(self):
+        scraper = ScraperService(self.SITES, {'concurrency': {'perHost': 1}})
+        first = scraper._get_host_semaphore('https://olx.pl/praca/?page=1')
+        second = scraper._get_host_semaphore('https://OLX.pl/praca/?page=2')
+        other = scraper._get_host_semaphore('https://pracuj.pl/praca')
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIsInstance(first, type(threading.Semaphore()))
+
+    def test_default_concurrency_settings(self):
+        scraper = ScraperService(self.SITES)
+        self.assertGreaterEqual(scraper.max_workers, 1)
+        self.assertGreaterEqual(scraper.per_host_limit, 1)
+
+
+class TestScraperServiceHttp(unittest.TestCase):
+
+    URL = 'https://olx.example/praca'
+
+    def _response(self, status_code, headers=None, content=b'<html></html>'):
+        response = requests.Response()
+        response.status_code = status_code
+        response.headers.update(headers or {})
+        response._content = content
+        response.raw = io.BytesIO(content)
+        response.url = self.URL
+        return response
+
+    def _scraper(self, **http):
+        settings = {'http': {'maxRetries': 3, 'backoffFactor': 0.5, 'maxBackoff': 30, **http}}
+        scraper = ScraperService([], settings)
+        scraper.session = MagicMock()
+        return scraper
+
+    def test_session_is_pooled_and_shared(self):
+        scraper = ScraperService([], {'http': {'poolSize': 7}})
+        adapter = scraper.session.get_adapter(self.URL)
+        self.assertEqual(adapter._pool_maxsize, 7)
+        self.assertIs(scraper.session, scraper.session)
+        scraper.close()
+
+    @patch('src.main.service.ScraperService.time.sleep')
+    def test_fetch_retries_server_errors(self, mock_sleep):
+        scraper = self._scraper()
+        scraper.session.get.side_effect = [self._response(503), self._response(502), self._response(200)]
+
+        response = scraper._fetch(self.URL, 'olx.example')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(scraper.session.get.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    @patch('src.main.service.ScraperService.time.sleep')
+    def test_fetch_honours_retry_after(self, mock_sleep):
+        scraper = self._scraper()
+        scraper.session.get.side_effect = [self._response(429, {'Retry-After': '7'}), self._response(200)]
+
+        scraper._fetch(self.URL, 'olx.example')
+
+        mock_sleep.assert_called_once_with(7.0)
+
+    @patch('src.main.service.ScraperService.time.sleep')
+    def test_fetch_gives_up_after_max_retries(self, mock_sleep):
+        scraper = self._scraper(maxRetries=2)
+        scraper.session.get.side_effect = [self._response(500) for _ in range(3)]
+
+        with self.assertRaises(requests.HTTPError):
+            scraper._fetch(self.URL, 'olx.example')
+        self.assertEqual(scraper.session.get.call_count, 3)
+
+    def test_stop_cuts_the_retry_wait_short(self):
+        scraper = self._scraper(maxBackoff=60)
+        scraper.session.get.side_effect = [self._response(429, {'Retry-After': '60'}), self._response(200)]
+        stop = threading.Event()
+        threading.Timer(0.05, stop.set).start()
+
+        start = time.perf_counter()
+        with self.assertRaises(requests.HTTPError):
+            scraper._fetch(self.URL, 'olx.example', stop=stop)
+
+        self.assertLess(time.perf_counter() - start, 5)
+        scraper.session.get.assert_called_once()
+
+    @patch('src.main.service.ScraperService.time.sleep')
+    def test_fetch_does_not_retry_client_errors(self, mock_sleep):
+        scraper = self._scraper()
+        scraper.session.get.return_value = self._response(404)
+
+        with self.assertRaises(requests.HTTPError):
+            scraper._fetch(self.URL, 'olx.example')
+        scraper.session.get.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch('src.main.service.ScraperService.time.sleep')
+    def test_fetch_uses_per_site_timeout(self, mock_sleep):
+        scraper = self._scraper(timeout=10)
+        scraper.session.get.return_value = self._response(200)
+
+        scraper._fetch(self.URL, 'olx.example', 25)
+        scraper.session.get.assert_called_with(self.URL, timeout=25)
+
+        scraper._fetch(self.URL, 'olx.example')
+        scraper.session.get.assert_called_with(self.URL, timeout=10.0)
+
+    def test_retry_delay_is_capped_exponential_backoff(self):
+        scraper = self._scraper(backoffFactor=1, maxBackoff=5)
+        for attempt in range(6):
+            delay = scraper._get_retry_delay(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5, 2 ** attempt))
+
+        self.assertEqual(scraper._get_retry_delay(0, self._response(429, {'Retry-After': '120'})), 5)
+
+
+def build_listing_page(offers, next_href=None):
+    cards = "".join(
+        f'<div class="offer"><a href="/oferta/{slug}"><h4>{title}</h4></a>'
+        f'<p class="company">Company {slug}</p><ul class="info"><li>Umowa zlecenie</li><li>Praca dorywcza</li></ul></div>'
+        for slug, title in offers
+    )
+    pagination = f'<a class="next" href="{next_href}">next</a>' if next_href else ''
+    return f'<html><body><div class="listing">{cards}</div>{pagination}</body></html>'.encode('utf-8')
+
+
+class TestScraperServicePagination(unittest.TestCase):
+
+    BASE_URL = 'https://jobs.example/praca'
+    SELECTORS = {
+        'offersContainer': 'div.listing',
+        'offerBox': 'div.offer',
+        'title': 'a h4',
+        'company': 'p.company',
+        'url': 'a[href]',
+        'addInfo': 'ul.info',
+    }
+
+    def _site(self, **pagination):
+        return {'id': 'jobs.example', 'url': self.BASE_URL, 'selectors': self.SELECTORS, 'pagination': pagination}
+
+    def _scraper(self, pages, find_stored_offers=None):
+        scraper = ScraperService([], find_stored_offers=find_stored_offers)
+        fetched = []
+
+        def fake_fetch(url, site_id, timeout=None, headers=None, stop=None):
+            fetched.append(url)
+            if url not in pages:
+                raise requests.HTTPError(f"404 for {url}")
+            response = requests.Response()
+            response.status_code = 200
+            response._content = pages[url]
+            response.raw = io.BytesIO(pages[url])
+            return response
+
+        scraper._fetch = fake_fetch
+        return scraper, fetched
+
+    def test_single_page_without_pagination(self):
+        scraper, fetched = self._scraper({self.BASE_URL: build_listing_page([('a', 'Kelner'), ('b', 'Barista')])})
+        site = {'id': 'jobs.example', 'url': self.BASE_URL, 'selectors': self.SELECTORS}
+
+        offers = scraper.scrape_site(site)
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner', 'Barista'])
+        self.assertEqual(offers[0].url, 'https://jobs.example/oferta/a')
+        self.assertEqual(offers[0].company, 'Company a')
+        self.assertEqual(offers[0].add_info, 'Umowa zlecenie, Praca dorywcza')
+        self.assertEqual(fetched, [self.BASE_URL])
+
+    def test_url_template_pagination_respects_max_pages(self):
+        template = self.BASE_URL + '?page={page}'
+        pages = {self.BASE_URL: build_listing_page([('a', 'Kelner')])}
+        for page in range(2, 6):
+            pages[template.format(page=page)] = build_listing_page([(f'p{page}', f'Offer {page}')])
+        scraper, fetched = self._scraper(pages)
+
+        offers = scraper.scrape_site(self._site(urlTemplate=template, maxPages=3))
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner', 'Offer 2', 'Offer 3'])
+        self.assertEqual(fetched, [self.BASE_URL, template.format(page=2), template.format(page=3)])
+
+    def test_templated_next_page_downloads_while_the_tree_is_built(self):
+        template = self.BASE_URL + '?page={page}'
+        pages = {self.BASE_URL: build_listing_page([('a', 'Kelner')]),
+                 template.format(page=2): build_listing_page([('b', 'Barista')])}
+        scraper, fetched = self._scraper(pages)
+        fetch = scraper._fetch
+        second_page_requested = threading.Event()
+
+        def fetch_and_signal(url, *args, **kwargs):
+            if url == template.format(page=2):
+                second_page_requested.set()
+            return fetch(url, *args, **kwargs)
+
+        overlapped = []
+
+        def build_tree(content, parser):
+            if content == pages[self.BASE_URL]:
+                overlapped.append(second_page_requested.wait(timeout=1))
+            return BeautifulSoup(content, parser)
+
+        scraper._fetch = fetch_and_signal
+        with patch('src.main.service.ScraperService.BeautifulSoup', side_effect=build_tree):
+            offers = scraper.scrape_site(self._site(urlTemplate=template, maxPages=2))
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner', 'Barista'])
+        self.assertEqual(overlapped, [True])
+
+    def test_next_page_selector_pagination_stops_on_last_page(self):
+        pages = {
+            self.BASE_URL: build_listing_page([('a', 'Kelner')], next_href='/praca?page=2'),
+            self.BASE_URL + '?page=2': build_listing_page([('b', 'Barista')]),
+        }
+        scraper, fetched = self._scraper(pages)
+
+        offers = scraper.scrape_site(self._site(nextPage='a.next', maxPages=10))
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner', 'Barista'])
+        self.assertEqual(len(fetched), 2)
+
+    def test_pagination_stops_when_page_has_only_seen_offers(self):
+        template = self.BASE_URL + '?page={page}'
+        pages = {
+            self.BASE_URL: build_listing_page([('a', 'Kelner'), ('b', 'Barista')]),
+            template.format(page=2): build_listing_page([('c', 'Kucharz')]),
+            template.format(page=3): build_listing_page([('d', 'Lektor')]),
+            template.format(page=4): build_listing_page([('e', 'Kierowca')]),
+        }
+        stored = {('https://jobs.example/oferta/c', 'Kucharz')}
+        lookups = []
+
+        def find_stored_offers(keys):
+            lookups.append(keys)
+            return stored.intersection(keys)
+
+        scraper, fetched = self._scraper(pages, find_stored_offers)
+
+        pages_yielded = list(scraper.iter_site_pages(self._site(urlTemplate=template, maxPages=10)))
+
+        self.assertEqual([[offer.title for offer in page] for page in pages_yielded], [['Kelner', 'Barista'], ['Kucharz']])
+        self.assertNotIn(template.format(page=4), fetched)
+        # Only the keys of each page are looked up, never the whole table
+        self.assertEqual([sorted(keys) for keys in lookups],
+                         [[('https://jobs.example/oferta/a', 'Kelner'), ('https://jobs.example/oferta/b', 'Barista')],
+                          [('https://jobs.example/oferta/c', 'Kucharz')]])
+
+    def test_duplicate_offers_across_pages_are_dropped(self):
+        template = self.BASE_URL + '?page={page}'
+        pages = {
+            self.BASE_URL: build_listing_page([('a', 'Kelner'), ('b', 'Barista')]),
+            template.format(page=2): build_listing_page([('a', 'Kelner'), ('c', 'Kucharz')]),
+        }
+        scraper, _ = self._scraper(pages)
+
+        offers = scraper.scrape_site(self._site(urlTemplate=template, maxPages=2))
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner', 'Barista', 'Kucharz'])
+
+    def test_failed_next_page_keeps_earlier_offers(self):
+        template = self.BASE_URL + '?page={page}'
+        scraper, _ = self._scraper({self.BASE_URL: build_listing_page([('a', 'Kelner')])})
+
+        offers = scraper.scrape_site(self._site(urlTemplate=template, maxPages=3))
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner'])
+
+
+class TestScraperServiceHttpCache(unittest.TestCase):
+
+    URL = 'https://jobs.example/praca'
+    SITE = {
+        'id': 'jobs.example',
+        'url': URL,
+        'selectors': {'offerBox': 'div.offer', 'title': 'a h4', 'url': 'a[href]'},
+        'pagination': {'urlTemplate': URL + '?page={page}', 'maxPages': 3},
+    }
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.settings = {'cache': {'enabled': True, 'path': os.path.join(self.tmp_dir.name, 'http_cache.json')}}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _scraper(self, responses):
+        scraper = ScraperService([], self.settings)
+        requests_sent = []
+
+        def fake_fetch(url, site_id, timeout=None, headers=None, stop=None):
+            requests_sent.append((url, headers))
+            if url not in responses:
+                raise requests.HTTPError(f"404 for {url}")
+            status_code, content = responses[url]
+            response = requests.Response()
+            response.status_code = status_code
+            response._content = content
+            response.raw = io.BytesIO(content)
+            response.headers['ETag'] = f'"{hash(content)}"'
+            return response
+
+        scraper._fetch = fake_fetch
+        return scraper, requests_sent
+
+    def test_unchanged_listing_is_not_parsed_on_next_run(self):
+        page_one = build_listing_page([('a', 'Kelner')])
+        responses = {
+            self.URL: (200, page_one),
+            self.URL + '?page=2': (200, build_listing_page([('b', 'Barista')])),
+            self.URL + '?page=3': (200, build_listing_page([('c', 'Kucharz')])),
+        }
+        first_run, _ = self._scraper(responses)
+        self.assertEqual(len(first_run.scrape_site(self.SITE)), 3)
+        first_run.close()
+
+        second_run, requests_sent = self._scraper(responses)
+        with patch.object(second_run, '_parse_offers') as mock_parse:
+            offers = second_run.scrape_site(self.SITE)
+
+        self.assertEqual(offers, [])
+        mock_parse.assert_not_called()
+        self.assertIn('If-None-Match', requests_sent[0][1])
+
+    def test_not_modified_response_skips_site(self):
+        first_run, _ = self._scraper({self.URL: (200, build_listing_page([('a', 'Kelner')])),
+                                      self.URL + '?page=2': (200, build_listing_page([]))})
+        first_run.scrape_site(self.SITE)
+        first_run.close()
+
+        second_run, _ = self._scraper({self.URL: (304, b'')})
+        self.assertEqual(second_run.scrape_site(self.SITE), [])
+
+    def test_prefetched_page_that_was_not_consumed_is_not_cached(self):
+        responses = {
+            self.URL: (200, build_listing_page([('a', 'Kelner')])),
+            self.URL + '?page=2': (200, build_listing_page([('b', 'Barista')])),
+            self.URL + '?page=3': (200, build_listing_page([('c', 'Kucharz')])),
+        }
+        first_run, _ = self._scraper(responses)
+        pages = first_run.iter_site_pages(self.SITE)
+        self.assertEqual([offer.title for offer in next(pages)], ['Kelner'])
+        # Page 2 is prefetched by now, but its offers never reach the consumer
+        pages.close()
+        first_run.close()
+
+        second_run, requests_sent = self._scraper(responses)
+        offers = second_run.scrape_site(self.SITE)
+
+        self.assertEqual([offer.title for offer in offers], ['Kelner', 'Barista', 'Kucharz'])
+        self.assertEqual([headers for _, headers in requests_sent], [{}, {}, {}])
+
+    def test_cache_is_not_persisted_without_close(self):
+        responses = {self.URL: (200, build_listing_page([('a', 'Kelner')])),
+                     self.URL + '?page=2': (200, build_listing_page([]))}
+        first_run, _ = self._scraper(responses)
+        first_run.scrape_site(self.SITE)
+
+        second_run, _ = self._scraper(responses)
+        self.assertEqual(len(second_run.scrape_site(self.SITE)), 1)
+
+
+class TestScraperServiceParsing(unittest.TestCase):
+
+    FIXTURE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'resources', 'olx_listing_page.html')
+    PAGE_URL = 'https://www.olx.pl/praca/wroclaw/q-praca-dla-studenta/'
+
+    @classmethod
+    def setUpClass(cls):
+        with open(cls.FIXTURE_PATH, 'rb') as f:
+            cls.content = f.read()
+        config_loader = ConfigLoader(config_path=TestScraperService.CONFIG_PATH)
+        cls.olx_site = next(site for site in config_loader.get_sites_config() if site['id'] == 'olx.pl')
+
+    def _parse(self, parser):
+        scraper = ScraperService([], {'parser': parser})
+        compiled = scraper._compile_selectors('olx.pl', self.olx_site['selectors'])
+        soup = BeautifulSoup(self.content, scraper.parser)
+        return scraper._parse_offers(soup, 'olx.pl', self.PAGE_URL, compiled)
+
+    def test_olx_fixture_is_parsed_with_configured_selectors(self):
+        offers = self._parse('lxml')
+
+        self.assertEqual(len(offers), 52)
+        first = offers[0]
+        self.assertTrue(first.url.startswith('https://www.olx.pl/oferta/praca/'))
+        self.assertTrue(first.location.startswith('Wrocław, '))
+        self.assertIn('zł', first.salary)
+        self.assertEqual(first.add_info, 'Umowa zlecenie, Niepełny etat, Dla studentów')
+        self.assertTrue(all(offer.title and offer.company for offer in offers))
+
+    def test_lxml_and_html_parser_extract_the_same_offers(self):
+        as_tuples = lambda offers: [(o.title, o.company, o.location, o.salary, o.url, o.add_info) for o in offers]
+        self.assertEqual(as_tuples(self._parse('lxml')), as_tuples(self._parse('html.parser')))
+
+    def test_unknown_parser_falls_back_to_html_parser(self):
+        scraper = ScraperService([], {'parser': 'no-such-parser'})
+        self.assertEqual(scraper.parser, 'html.parser')
+
+    def test_invalid_selector_skips_site(self):
+        scraper = ScraperService([])
+        site = {'id': 'broken', 'url': self.PAGE_URL, 'selectors': {'offerBox': 'div[', 'title': 'h4', 'url': 'a'}}
+        with patch.object(scraper, '_fetch') as mock_fetch:
+            self.assertEqual(scraper.scrape_site(site), [])
+        mock_fetch.assert_not_called()
+
 if __name__ == '__main__':
     log.info("Running ScraperService tests...")
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,77 @@
+import os
+import sys
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.service.SearchIndex import SearchIndex
+
+ROWS = [
+    ("Kelner / Kelnerka", "Restauracja Odra", "Wrocław, Stare Miasto"),
+    ("Barista", "Kawiarnia Kelnerów", "Wrocław, Krzyki"),
+    ("Magazynier", None, "Wrocław, Fabryczna"),
+    ("Kasjer", "Sklep AB", None),
+    ("Barista", "Sklep AB", "Oława"),
+]
+
+
+def scan(rows, query):
+    query = query.lower()
+    return [key for key, row in enumerate(rows) if any(query in (value or '').lower() for value in row)]
+
+
+class TestSearchIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = SearchIndex()
+        self.index.add_rows(ROWS)
+
+    def test_matches_substrings_of_any_field_ignoring_case(self):
+        self.assertEqual(self.index.search("kelner"), [0, 1])
+        self.assertEqual(self.index.search("KRZYKI"), [1])
+        self.assertEqual(self.index.search("sklep ab"), [3, 4])
+        self.assertEqual(self.index.search("ława"), [4])
+
+    def test_matches_the_same_offers_as_a_linear_scan(self):
+        for query in ["a", "ab", "wro", "aw", "b", "sta", "ta, s", "rela", "zz", "Restauracja Odra", " ", "/"]:
+            self.index._last_query = None
+            self.assertEqual(self.index.search(query), scan(ROWS, query), query)
+
+    def test_query_does_not_match_across_fields(self):
+        self.assertEqual(self.index.search("baristasklep"), [])
+        self.assertEqual(self.index.search("odrawrocław"), [])
+
+    def test_empty_query_returns_every_offer(self):
+        self.assertEqual(self.index.search(""), [0, 1, 2, 3, 4])
+
+    def test_missing_fields_never_match(self):
+        self.assertEqual(self.index.search("none"), [])
+
+    def test_narrowing_an_extended_query_gives_the_full_result(self):
+        for query in ["w", "wr", "wro", "wroc", "wrocł", "wrocław, ", "wrocław, k"]:
+            self.assertEqual(self.index.search(query), scan(ROWS, query), query)
+        for query in ["bar", "barista", "ba", "a"]:
+            self.assertEqual(self.index.search(query), scan(ROWS, query), query)
+
+    def test_added_rows_are_found_by_repeated_query(self):
+        self.assertEqual(self.index.search("kasjer"), [3])
+        self.index.add_rows([("Kasjer / Kasjerka", "Market", "Wrocław")])
+
+        self.assertEqual(self.index.search("kasjer"), [3, 5])
+        self.assertEqual(self.index.search("kasjerk"), [5])
+        self.assertEqual(len(self.index), 6)
+        self.assertEqual(self.index.stats()[0], 6)
+
+    def test_rows_can_be_added_after_a_trigram_query(self):
+        self.assertEqual(self.index.search("kel"), [0, 1])
+
+        # The trigram's posting list grows while its matches are remembered
+        self.index.add_rows([("Kelnerka", None, None)])
+
+        self.assertEqual(self.index.search("kel"), [0, 1, 5])
+        self.assertEqual(self.index.search("kelnerka"), [0, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,14 @@
+import random
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+from datetime import datetime, timedelta, timezone
 import sys
 import os
 
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 sys.path.insert(0, project_root)
 
-from src.main.service.StatisticsService import StatisticsService
+from src.main.service.StatisticsService import StatisticsService, StatisticsSnapshot, DEFAULT_POSITION_KEYWORDS, get_position_classifier, _compile_position_pattern
 from src.main.model.JobOffer import JobOffer
 
 class TestStatisticsService(unittest.TestCase):
@@ -126,6 +128,27 @@ class TestStatisticsService(unittest.TestCase):
         self.assertGreater(result["min_salary"], 25)
         self.assertLess(result["max_salary"], 60)
         
+    def test_get_salary_statistics_distribution(self):
+        """Test percentiles, histogram and breakdowns of the salary statistics"""
+        self.mock_offers[0].site_id = "pracuj.pl"
+        result = self.service.get_salary_statistics(bins=4)
+
+        # Offer averages: 43, 30.55, 31, 32.75 and 30 zł/h
+        self.assertEqual(result["median_salary"], 31)
+        self.assertEqual(result["average_salary"], 33.46)
+        self.assertEqual(result["min_salary"], 30)
+        self.assertEqual(result["max_salary"], 43)
+        self.assertEqual(result["percentiles"], {"p10": 30.22, "p25": 30.55, "p75": 32.75, "p90": 38.9})
+        self.assertEqual(result["histogram"]["bin_edges"], [30, 33.25, 36.5, 39.75, 43])
+        self.assertEqual(result["histogram"]["counts"], [4, 0, 0, 1])
+
+        self.assertEqual(list(result["by_site"]), ["pracuj.pl", "olx.pl"])
+        self.assertEqual(result["by_site"]["pracuj.pl"]["offers_with_salary"], 1)
+        self.assertEqual(result["by_site"]["olx.pl"]["offers_with_salary"], 4)
+        self.assertAlmostEqual(result["by_site"]["olx.pl"]["median_salary"], 30.775, delta=0.01)
+        self.assertEqual(result["by_position_type"]["Sprzedawca/Konsultant"]["average_salary"], 43)
+        self.assertEqual(result["by_position_type"]["Inne"]["max_salary"], 30)
+
     def test_get_salary_statistics_no_salary_data(self):
         """Test salary statistics when no salary data is available"""
         # Create offers without salary data
@@ -153,6 +176,242 @@ class TestStatisticsService(unittest.TestCase):
         self.assertEqual(result["min_salary"], 0)
         self.assertEqual(result["max_salary"], 0)
         self.assertEqual(result["median_salary"], 0)
+        self.assertEqual(result["histogram"]["counts"], [])
+        self.assertEqual(result["by_site"], {})
+
+    def test_get_salary_statistics_for_one_unit(self):
+        self.mock_offers[0].salary = "4 500 - 5 500 zł / mies. brutto"
+
+        hourly = self.service.get_salary_statistics(unit="hourly")
+        monthly = self.service.get_salary_statistics(unit="monthly")
+
+        self.assertEqual(hourly["offers_with_salary"], 4)
+        self.assertEqual(hourly["max_salary"], 32.75)
+        self.assertEqual(monthly["offers_with_salary"], 1)
+        self.assertEqual(monthly["average_salary"], 5000)
+
+    def test_sql_backend_aggregates_in_the_database(self):
+        mock_provider = MagicMock()
+        mock_provider.count_offers.return_value = (6, 1)
+        overall = [(None, 5, 33.46, 30.0, 43.0, [31.0, 30.22, 30.55, 32.75, 38.9])]
+        by_site = [("olx.pl", 5, 33.46, 30.0, 43.0, [31.0, 30.22, 30.55, 32.75, 38.9])]
+        by_position_type = [("Gastronomia", 1, 30.55, 30.55, 30.55, [30.55] * 5)]
+        mock_provider.get_salary_aggregates.side_effect = [overall, by_site, by_position_type]
+        mock_provider.get_salary_histogram.return_value = [4, 0, 0, 1]
+        service = StatisticsService(mock_provider, backend='sql')
+
+        result = service.get_salary_statistics(bins=4)
+
+        mock_provider.read_data.assert_not_called()
+        self.assertEqual(result["total_offers"], 6)
+        self.assertEqual(result["offers_with_salary"], 5)
+        self.assertEqual(result["offers_without_salary"], 1)
+        self.assertEqual(result["median_salary"], 31)
+        self.assertEqual(result["percentiles"], {"p10": 30.22, "p25": 30.55, "p75": 32.75, "p90": 38.9})
+        self.assertEqual(result["histogram"], {"bin_edges": [30, 33.25, 36.5, 39.75, 43], "counts": [4, 0, 0, 1]})
+        self.assertEqual(result["by_site"]["olx.pl"]["offers_with_salary"], 5)
+        self.assertEqual(result["by_position_type"]["Gastronomia"]["average_salary"], 30.55)
+        group_by = [call.kwargs.get('group_by') for call in mock_provider.get_salary_aggregates.call_args_list]
+        self.assertEqual(group_by, [None, 'site_id', 'position_type'])
+
+    def test_sql_backend_without_salaries(self):
+        mock_provider = MagicMock()
+        mock_provider.count_offers.return_value = (3, 3)
+        mock_provider.get_salary_aggregates.return_value = []
+        result = StatisticsService(mock_provider, backend='sql').get_salary_statistics()
+
+        self.assertEqual(result["offers_with_salary"], 0)
+        self.assertEqual(result["offers_without_salary"], 3)
+        mock_provider.get_salary_histogram.assert_not_called()
+
+    def test_sql_backend_counts_position_types_in_the_database(self):
+        mock_provider = MagicMock()
+        mock_provider.get_position_type_counts.return_value = {"Gastronomia": 2, "Inne": 1}
+        service = StatisticsService(mock_provider, backend='sql')
+
+        result = service.get_position_type_counts({"Gastronomia": ["kelner"]})
+
+        self.assertEqual(result, {"Gastronomia": 2, "Inne": 1})
+        mock_provider.get_position_type_counts.assert_called_once_with({"Gastronomia": ["kelner"]}, "Inne")
+        mock_provider.read_data.assert_not_called()
+
+    def test_sql_backend_report_is_memoized_per_table_state(self):
+        mock_provider = MagicMock()
+        mock_provider.get_position_type_counts.return_value = {"Inne": 1}
+        mock_provider.count_offers.return_value = (1, 1)
+        mock_provider.get_salary_aggregates.return_value = []
+        mock_provider.get_table_state.side_effect = [(1, None), (1, None), (2, None)]
+        service = StatisticsService(mock_provider, backend='sql')
+
+        for _ in range(3):
+            report = service.get_report()
+
+        self.assertEqual(report["position_type_counts"], {"Inne": 1})
+        self.assertEqual(mock_provider.get_position_type_counts.call_count, 2)
+        mock_provider.read_data.assert_not_called()
+
+    def test_unknown_backend_is_rejected(self):
+        with self.assertRaises(ValueError):
+            StatisticsService(MagicMock(), backend='spark')
+
+    def test_later_calls_read_only_new_offers(self):
+        scraped_at = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+        for i, offer in enumerate(self.mock_offers):
+            offer.scraped_at = scraped_at + timedelta(minutes=i)
+        new_offer = JobOffer(
+            title="Barista",
+            company="Test Cafe",
+            location="Wrocław",
+            salary="35 zł / godz. brutto",
+            url="https://example.com/7",
+            site_id="olx.pl",
+            scraped_at=scraped_at + timedelta(hours=1)
+        )
+        mock_provider = MagicMock()
+        mock_provider.read_data.return_value = self.mock_offers
+        # The overlap window returns the newest known offer again; it must not be counted twice
+        mock_provider.read_data_since.return_value = [self.mock_offers[-1], new_offer]
+        mock_provider.get_table_state.side_effect = [(6, self.mock_offers[-1].scraped_at),
+                                                     (7, new_offer.scraped_at), (7, new_offer.scraped_at)]
+        service = StatisticsService(mock_provider)
+
+        first = service.get_salary_statistics()
+        second = service.get_salary_statistics()
+
+        mock_provider.read_data.assert_called_once()
+        watermark = mock_provider.read_data_since.call_args.args[0]
+        self.assertLessEqual(watermark, self.mock_offers[-1].scraped_at)
+        self.assertEqual(first["total_offers"], 6)
+        self.assertEqual(second["total_offers"], 7)
+        self.assertEqual(service.get_position_type_counts().get("Gastronomia", 0), 2)
+
+    def test_new_offers_update_the_snapshot_in_place(self):
+        scraped_at = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+        for offer in self.mock_offers:
+            offer.scraped_at = scraped_at
+        reread = JobOffer(self.mock_offers[1].title, None, None, "40 zł / godz. brutto", self.mock_offers[1].url,
+                          "olx.pl", scraped_at=scraped_at)
+        new_offer = JobOffer("Kucharz", None, None, "", "https://example.com/7", "olx.pl",
+                             scraped_at=scraped_at + timedelta(hours=1))
+        mock_provider = MagicMock()
+        mock_provider.read_data.return_value = self.mock_offers
+        mock_provider.read_data_since.return_value = [reread, new_offer]
+        mock_provider.get_table_state.side_effect = [(6, scraped_at), (7, new_offer.scraped_at)]
+        service = StatisticsService(mock_provider)
+        snapshot = service.get_snapshot()
+        self.assertEqual(snapshot.position_type_counts(DEFAULT_POSITION_KEYWORDS).get("Gastronomia", 0), 1)
+
+        self.assertIs(service.get_snapshot(), snapshot)
+
+        # The re-read offer's row is overwritten and the new one appended, classified with the cached keywords
+        self.assertEqual(snapshot.total_offers, 7)
+        self.assertEqual(snapshot.offers_without_salary, 1)
+        self.assertEqual(snapshot.titles[-1], "Kucharz")
+        self.assertEqual(snapshot.position_type_counts(DEFAULT_POSITION_KEYWORDS)["Gastronomia"], 2)
+        self.assertEqual(snapshot.salary_statistics(10, DEFAULT_POSITION_KEYWORDS)["offers_with_salary"], 6)
+
+    def test_report_reuses_snapshot_until_table_changes(self):
+        mock_provider = MagicMock()
+        mock_provider.read_data.return_value = self.mock_offers
+        mock_provider.get_table_state.return_value = (6, None)
+        service = StatisticsService(mock_provider)
+
+        report = service.get_report()
+        service.get_position_type_counts()
+        service.get_salary_statistics()
+        report["position_type_counts"]["Inne"] = 100
+
+        mock_provider.read_data.assert_called_once()
+        self.assertEqual(report["salary_statistics"]["offers_with_salary"], 5)
+        self.assertEqual(service.get_report()["position_type_counts"]["Inne"], 1)
+
+        with patch.object(StatisticsSnapshot, 'salary_statistics', wraps=service.get_snapshot().salary_statistics) as compute:
+            service.get_report()
+            compute.assert_not_called()
+            service.get_report(bins=5)
+            compute.assert_called_once()
+
+    def test_shrinking_table_is_read_again_in_full(self):
+        scraped_at = datetime(2025, 10, 1, 8, 0, tzinfo=timezone.utc)
+        for offer in self.mock_offers:
+            offer.scraped_at = scraped_at
+        mock_provider = MagicMock()
+        mock_provider.read_data.side_effect = [self.mock_offers, self.mock_offers[:2]]
+        mock_provider.get_table_state.side_effect = [(6, scraped_at), (2, scraped_at)]
+        service = StatisticsService(mock_provider)
+
+        self.assertEqual(service.get_snapshot().total_offers, 6)
+        self.assertEqual(service.get_snapshot().total_offers, 2)
+        self.assertEqual(mock_provider.read_data.call_count, 2)
+        mock_provider.read_data_since.assert_not_called()
+
+    def test_site_trends_count_offers_per_site_and_utc_day(self):
+        first_day = datetime(2025, 10, 2, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+        for i, offer in enumerate(self.mock_offers):
+            offer.scraped_at = first_day + timedelta(days=i % 2)
+        self.mock_offers[0].site_id = "pracuj.pl"
+        self.mock_offers[1].scraped_at = None
+
+        trends = self.service.get_site_trends()
+
+        self.assertEqual(trends, {"pracuj.pl": {"2025-10-01": 1},
+                                  "olx.pl": {"2025-10-01": 2, "2025-10-02": 2}})
+        self.assertEqual(list(trends["olx.pl"]), ["2025-10-01", "2025-10-02"])
+        self.assertEqual(self.service.get_report()["site_trends"], trends)
+
+    def test_sql_backend_counts_site_trends_in_the_database(self):
+        mock_provider = MagicMock()
+        mock_provider.get_site_trends.return_value = [("olx.pl", datetime(2025, 10, 1).date(), 3),
+                                                      ("olx.pl", datetime(2025, 10, 2).date(), 1)]
+        service = StatisticsService(mock_provider, backend='sql')
+
+        self.assertEqual(service.get_site_trends(), {"olx.pl": {"2025-10-01": 3, "2025-10-02": 1}})
+        mock_provider.read_data.assert_not_called()
+
+
+class TestPositionClassifier(unittest.TestCase):
+    @staticmethod
+    def classify_with_loop(title, position_keywords):
+        """The original per-keyword classification the compiled matcher must agree with."""
+        if not title:
+            return "Inne"
+        title_lower = title.lower()
+        for position_type, keywords in position_keywords.items():
+            if any(keyword.lower() in title_lower for keyword in keywords):
+                return position_type
+        return "Inne"
+
+    def test_first_matching_category_wins(self):
+        keywords = {"Pierwsza": ["klienta"], "Druga": ["doradca klienta", "doradca"]}
+        classify = get_position_classifier(keywords)
+        # The second category's keyword starts earlier in the title, the first category still wins
+        self.assertEqual(classify("Doradca Klienta"), "Pierwsza")
+        self.assertEqual(classify("Doradca"), "Druga")
+        self.assertEqual(classify("Magazynier"), "Inne")
+        self.assertEqual(classify(None), "Inne")
+
+    def test_keywords_are_matched_literally(self):
+        classify = get_position_classifier({"C++": ["c++"], "Dowolna": [".*"], "Pusta": []})
+        self.assertEqual(classify("Programista C++"), "C++")
+        self.assertEqual(classify("Programista Python"), "Inne")
+        self.assertEqual(classify("Praca .* dla każdego"), "Dowolna")
+
+    def test_matches_loop_on_default_keywords(self):
+        keywords = [keyword for group in DEFAULT_POSITION_KEYWORDS.values() for keyword in group]
+        words = keywords + ["praca", "student", "wrocław", "Obsługa", "KELNERKA", "\n", "(", "ę"]
+        rng = random.Random(0)
+        classify = get_position_classifier(DEFAULT_POSITION_KEYWORDS)
+        for _ in range(2000):
+            title = " ".join(rng.choice(words) for _ in range(rng.randint(0, 5)))
+            self.assertEqual(classify(title), self.classify_with_loop(title, DEFAULT_POSITION_KEYWORDS), title)
+
+    def test_pattern_is_compiled_once_per_keyword_dictionary(self):
+        keywords = {"Kuchnia": ["kucharz"]}
+        get_position_classifier(keywords)
+        misses = _compile_position_pattern.cache_info().misses
+        classify = get_position_classifier(dict(keywords))
+        self.assertEqual(_compile_position_pattern.cache_info().misses, misses)
+        self.assertEqual(classify("Kucharz"), "Kuchnia")
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,111 @@
+import os
+import random
+import sys
+import unittest
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.view.TextTruncator import TextTruncator
+
+GLYPH_WIDTHS = {'i': 3, 'l': 3, ' ': 4, 'm': 11, 'w': 10, 'W': 13, 'A': 8, 'V': 8, '職': 16, '業': 16}
+
+
+class FakeFont:
+    """Sums glyph widths like Tk does for most fonts; `kerning` narrows each "AV" pair."""
+
+    def __init__(self, kerning=0):
+        self.kerning = kerning
+        self.calls = 0
+
+    def measure(self, text):
+        self.calls += 1
+        return sum(GLYPH_WIDTHS.get(char, 7) for char in text) - self.kerning * text.count("AV")
+
+
+def truncate_by_removal(measure, text, max_width):
+    """The previous GUI.fix_text, kept as the reference."""
+    if_changed = False
+    while measure(text) > max_width and len(text) > 0:
+        text = text[:-1]
+        if_changed = True
+    if if_changed:
+        text = text[:-4] + ' ...'
+    return text
+
+
+def random_titles(count, rng):
+    alphabet = "ilmwWAV abcdeKelnrószł"
+    return [''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 80))) for _ in range(count)]
+
+
+class TestTextTruncator(unittest.TestCase):
+
+    def test_matches_removing_one_character_at_a_time(self):
+        for kerning in (0, 3):
+            font = FakeFont(kerning)
+            truncate = TextTruncator(font.measure, 200)
+            for title in random_titles(500, random.Random(kerning)):
+                self.assertEqual(truncate(title), truncate_by_removal(font.measure, title, 200), (kerning, title))
+
+    def test_short_text_is_unchanged(self):
+        truncate = TextTruncator(FakeFont().measure, 200)
+        self.assertEqual(truncate("Kelner"), "Kelner")
+        self.assertEqual(truncate(""), "")
+
+    def test_empty_text_is_not_measured(self):
+        font = FakeFont()
+        truncate = TextTruncator(font.measure, 0)
+
+        self.assertEqual(truncate(""), "")
+        self.assertEqual(font.calls, 0)
+
+    def test_text_exactly_at_the_width_is_unchanged(self):
+        font = FakeFont()
+        text = "Kelner / Kelnerka"
+        width = font.measure(text)
+
+        self.assertEqual(TextTruncator(font.measure, width)(text), text)
+        self.assertEqual(TextTruncator(font.measure, width - 1)(text), "Kelner / Kel ...")
+
+    def test_wide_and_non_ascii_characters_are_cut_whole(self):
+        font = FakeFont()
+        for text in ["Kucharz łódź żółw ćma", "職業 Kelner 職業職業", "職業職業職業職業職業職業"]:
+            for width in (40, 70, 100):
+                truncate = TextTruncator(font.measure, width)
+                self.assertEqual(truncate(text), truncate_by_removal(font.measure, text, width), (text, width))
+                self.assertTrue(text.startswith(truncate(text).removesuffix(' ...')))
+
+    def test_long_text_is_cut_with_an_ellipsis(self):
+        font = FakeFont()
+        truncate = TextTruncator(font.measure, 70)
+
+        result = truncate("Magazynier / Magazynierka")
+
+        self.assertEqual(result, "Magazyn ...")
+        self.assertLessEqual(font.measure("Magazynier "), 70)
+        self.assertGreater(font.measure("Magazynier /"), 70)
+
+    def test_results_are_memoized(self):
+        font = FakeFont()
+        truncate = TextTruncator(font.measure, 70)
+        truncate("Magazynier / Magazynierka")
+        calls = font.calls
+
+        truncate("Magazynier / Magazynierka")
+
+        self.assertEqual(font.calls, calls)
+
+    def test_each_title_costs_at_most_two_measurements_after_its_glyphs(self):
+        font = FakeFont()
+        truncate = TextTruncator(font.measure, 200)
+        titles = random_titles(200, random.Random(0))
+        for title in titles:
+            truncate(title)
+
+        glyphs = len(set(''.join(titles)))
+        self.assertLessEqual(font.calls, glyphs + 2 * len(set(titles)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.view.VirtualOfferList import VirtualOfferList
+
+ROW_HEIGHT = 36
+VIEWPORT_HEIGHT = 100
+
+
+def make_list(count):
+    """A list without a window; the viewport, scrollbar and row buttons are mocked."""
+    offer_list = VirtualOfferList.__new__(VirtualOfferList)
+    offer_list.on_select = MagicMock()
+    offer_list.on_scroll_end = MagicMock()
+    offer_list.row_height = ROW_HEIGHT
+    offer_list._keys = []
+    offer_list._titles = []
+    offer_list._selected_key = None
+    offer_list._offset = 0
+    offer_list._buttons = []
+    offer_list._viewport = MagicMock()
+    offer_list._viewport.winfo_height.return_value = VIEWPORT_HEIGHT
+    offer_list._scrollbar = MagicMock()
+    # Keys run backwards, so a key never equals its row
+    offer_list.set_items(range(count - 1, -1, -1), [f"Offer {key}" for key in range(count + 100)])
+    offer_list.on_scroll_end.reset_mock()
+    return offer_list
+
+
+class TestVirtualOfferList(unittest.TestCase):
+
+    def setUp(self):
+        buttons = patch('src.main.view.VirtualOfferList.ctk.CTkButton', side_effect=lambda *args, **kwargs: MagicMock())
+        buttons.start()
+        self.addCleanup(buttons.stop)
+
+    def shown_titles(self, offer_list):
+        """Titles of the buttons placed by the last render."""
+        shown = []
+        for button in offer_list._buttons:
+            placements = [name for name, _, _ in button.method_calls if name in ('place', 'place_forget')]
+            if placements[-1] == 'place':
+                shown.append(button.configure.call_args.kwargs['text'])
+        return shown
+
+    def test_only_the_visible_rows_get_buttons(self):
+        offer_list = make_list(1000)
+
+        # Three rows fill the viewport; a fourth button is kept for the row partly shown while scrolling
+        self.assertEqual(len(offer_list._buttons), 4)
+        self.assertEqual(self.shown_titles(offer_list), ["Offer 999", "Offer 998", "Offer 997"])
+
+        offer_list._scroll_to(ROW_HEIGHT // 2)
+        self.assertEqual(self.shown_titles(offer_list), ["Offer 999", "Offer 998", "Offer 997", "Offer 996"])
+
+    def test_click_selects_the_key_of_the_row_under_the_slot(self):
+        offer_list = make_list(20)
+        offer_list._scroll_to(2 * ROW_HEIGHT + 10)
+
+        offer_list._on_click(1)
+
+        # Rows 2 to 5 are on screen, so slot 1 shows row 3, whose key is 16
+        offer_list.on_select.assert_called_once_with(16)
+        self.assertEqual(offer_list._selected_key, 16)
+
+    def test_click_below_the_last_row_is_ignored(self):
+        offer_list = make_list(2)
+
+        offer_list._on_click(3)
+
+        offer_list.on_select.assert_not_called()
+
+    def test_extend_keeps_the_scroll_offset(self):
+        offer_list = make_list(20)
+        offer_list._scroll_to(5 * ROW_HEIGHT)
+
+        offer_list.extend([100, 101])
+
+        self.assertEqual(offer_list._offset, 5 * ROW_HEIGHT)
+        self.assertEqual(len(offer_list), 22)
+
+    def test_prepend_keeps_the_rows_on_screen_in_place(self):
+        offer_list = make_list(20)
+        offer_list._scroll_to(5 * ROW_HEIGHT)
+
+        offer_list.prepend([100, 101])
+
+        self.assertEqual(offer_list._offset, 7 * ROW_HEIGHT)
+        self.assertEqual(offer_list._keys[:3], [100, 101, 19])
+
+    def test_prepend_at_the_top_shows_the_new_rows(self):
+        offer_list = make_list(20)
+
+        offer_list.prepend([100, 101])
+
+        self.assertEqual(offer_list._offset, 0)
+        self.assertEqual(self.shown_titles(offer_list), ["Offer 100", "Offer 101", "Offer 19"])
+
+    def test_scrolling_is_clamped_to_the_list(self):
+        offer_list = make_list(10)
+        max_offset = 10 * ROW_HEIGHT - VIEWPORT_HEIGHT
+        self.assertEqual(offer_list._max_offset(), max_offset)
+
+        offer_list._scroll_to(10_000)
+        self.assertEqual(offer_list._offset, max_offset)
+        offer_list._scroll_to(-50)
+        self.assertEqual(offer_list._offset, 0)
+
+    def test_list_shorter_than_the_viewport_does_not_scroll(self):
+        offer_list = make_list(2)
+
+        self.assertEqual(offer_list._max_offset(), 0)
+        offer_list._scroll_to(ROW_HEIGHT)
+        self.assertEqual(offer_list._offset, 0)
+        offer_list._scrollbar.set.assert_called_with(0.0, 1.0)
+
+    def test_scroll_end_fires_within_one_screen_of_the_last_row(self):
+        offer_list = make_list(20)
+
+        # Rows 7 to 10 are on screen, more than a screen above the last row
+        offer_list._scroll_to(7 * ROW_HEIGHT)
+        offer_list.on_scroll_end.assert_not_called()
+
+        # Rows 14 to 17 are on screen, within a screen of the last row
+        offer_list._scroll_to(14 * ROW_HEIGHT)
+        offer_list.on_scroll_end.assert_called()
+
+    def test_short_list_asks_for_more_rows_at_once(self):
+        offer_list = make_list(20)
+
+        offer_list.set_items([1, 2], offer_list._titles)
+
+        offer_list.on_scroll_end.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Benchmark of position type classification over a synthetic offer history.
+
+Compares the previous per-category, per-keyword `any()` loop with the compiled
+classifier from StatisticsService, on unique titles and on a history where
+titles repeat as they do across daily scrapes.
+
+Run from the project root:
+    python -m src.test.benchmark.ClassifierBenchmark [titles]
+"""
+import os
+import random
+import sys
+import timeit
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.service.StatisticsService import DEFAULT_POSITION_KEYWORDS, get_position_classifier
+
+FILLER_WORDS = "praca student wrocław pełny etat magazyn sklep kasjer zmiana weekend umowa zlecenie".split()
+
+
+def classify_with_loop(title, position_keywords=DEFAULT_POSITION_KEYWORDS):
+    """The previous implementation, kept here as the baseline."""
+    if not title:
+        return "Inne"
+    title_lower = title.lower()
+    for position_type, keywords in position_keywords.items():
+        if any(keyword.lower() in title_lower for keyword in keywords):
+            return position_type
+    return "Inne"
+
+
+def make_titles(count, rng):
+    keywords = [keyword for group in DEFAULT_POSITION_KEYWORDS.values() for keyword in group]
+    titles = []
+    for _ in range(count):
+        words = rng.sample(FILLER_WORDS, 5)
+        if rng.random() < 0.6:
+            words.insert(rng.randint(0, 5), rng.choice(keywords))
+        titles.append(' '.join(words).title())
+    return titles
+
+
+def main(count: int = 100000):
+    rng = random.Random(0)
+    unique = make_titles(count, rng)
+    # Roughly 20 scrapes of the same 5% of titles
+    repeated = [rng.choice(unique[:max(1, count // 20)]) for _ in range(count)]
+
+    print(f"{'titles':<12}{'implementation':<20}{'seconds':>10}")
+    for name, titles in [('unique', unique), ('repeated', repeated)]:
+        runs = [('any() loop', lambda: [classify_with_loop(t) for t in titles]),
+                # A fresh classifier per run, as get_position_type_counts builds one per call
+                ('compiled', lambda: list(map(get_position_classifier(DEFAULT_POSITION_KEYWORDS), titles)))]
+        for implementation, run in runs:
+            best = min(timeit.repeat(run, number=1, repeat=3))
+            print(f"{name:<12}{implementation:<20}{best:>10.3f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,68 @@
+"""Micro-benchmark of the per-call overhead of the module-aware `log` proxy.
+
+Compares the previous inspect.stack() based caller lookup with the current
+sys._getframe lookup cached per code object, for a filtered-out log.debug
+call and for an emitted log.info call (records go to a NullHandler).
+
+Run from the project root:
+    python -m src.test.benchmark.LoggerBenchmark [calls]
+"""
+import inspect
+import logging
+import os
+import sys
+import timeit
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.config import logger_config
+from src.main.config.logger_config import _ContextualLogger
+
+
+class _InspectStackLogger:
+    """The previous proxy implementation, kept here as the baseline."""
+
+    def __init__(self):
+        self._cached_loggers = {}
+
+    def _get_actual_logger(self):
+        frame = inspect.stack()[2]
+        module = inspect.getmodule(frame[0])
+        logger_name = "unknown_module"
+        if module:
+            if module.__name__ == '__main__':
+                logger_name = os.path.splitext(os.path.basename(frame.filename))[0]
+            else:
+                logger_name = module.__name__
+        if logger_name not in self._cached_loggers:
+            self._cached_loggers[logger_name] = logger_config.get_logger(logger_name)
+        return self._cached_loggers[logger_name]
+
+    def __getattr__(self, name):
+        return getattr(self._get_actual_logger(), name)
+
+
+def silent_logger(name="offer_scraper", level=logging.INFO):
+    logger = logging.getLogger(f"logger_benchmark.{name}")
+    logger.propagate = False
+    logger.setLevel(level)
+    if not logger.handlers:
+        logger.addHandler(logging.NullHandler())
+    return logger
+
+
+def main(calls: int = 2000):
+    with patch.object(logger_config, 'get_logger', silent_logger):
+        proxies = [('inspect.stack (previous)', _InspectStackLogger()), ('sys._getframe + cache', _ContextualLogger())]
+        print(f"{'implementation':<28}{'call':<14}{'us/call':>10}")
+        for name, proxy in proxies:
+            for call, run in [('log.debug', lambda: proxy.debug("filtered %s", 1)),
+                              ('log.info', lambda: proxy.info("emitted %s", 1))]:
+                best = min(timeit.repeat(run, number=calls, repeat=3)) / calls
+                print(f"{name:<28}{call:<14}{best * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
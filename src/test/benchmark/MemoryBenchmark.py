@@ -0,0 +1,77 @@
+"""Memory per offer of the different ways of holding a loaded table of offers.
+
+Compares a list of the previous __dict__ based JobOffer, a list of the current
+__slots__ JobOffer and an OfferBatch with interned columns. Every string is
+built at runtime, as it would be when decoded from database rows.
+
+Run from the project root:
+    python -m src.test.benchmark.MemoryBenchmark [offers]
+"""
+import os
+import random
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.model.JobOffer import JobOffer
+from src.main.model.OfferBatch import OfferBatch
+
+SITES = ['olx.pl', 'pracuj.pl']
+LOCATIONS = ['Wrocław, Stare Miasto', 'Wrocław, Krzyki', 'Wrocław, Fabryczna', 'Wrocław, Psie Pole']
+COMPANIES = [f"Firma {i}" for i in range(200)]
+
+
+class DictJobOffer:
+    """The previous JobOffer, kept here as the baseline."""
+
+    def __init__(self, title, company, location, salary, url, site_id, add_info=None, scraped_at=None):
+        self.title = title
+        self.company = company
+        self.location = location
+        self.salary = salary
+        self.url = url
+        self.site_id = site_id
+        self.add_info = add_info
+        self.scraped_at = scraped_at
+
+
+def make_rows(count):
+    rng = random.Random(0)
+    start = datetime(2025, 10, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        # ''.join makes a new string object per row, as the database driver does
+        yield (f"Oferta pracy numer {i}",
+               ''.join(rng.choice(COMPANIES)),
+               ''.join(rng.choice(LOCATIONS)),
+               f"{rng.randint(28, 40)} zł / godz. brutto",
+               f"https://www.olx.pl/oferta/praca/oferta-{i}.html",
+               ''.join(rng.choice(SITES)),
+               None,
+               start + timedelta(seconds=i))
+
+
+def measure(build, count):
+    tracemalloc.start()
+    held = build(make_rows(count))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del held
+    return size / count
+
+
+def main(count: int = 100000):
+    builders = [
+        ('list of dict JobOffer', lambda rows: [DictJobOffer(*row) for row in rows]),
+        ('list of slots JobOffer', lambda rows: [JobOffer(*row) for row in rows]),
+        ('OfferBatch', lambda rows: OfferBatch(JobOffer(*row) for row in rows)),
+    ]
+    print(f"{'container':<26}{'bytes/offer':>12}")
+    for name, build in builders:
+        print(f"{name:<26}{measure(build, count):>12.0f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,80 @@
+"""Micro-benchmark of listing page parsing: html.parser with string selectors (the
+previous implementation) against lxml with selectors compiled once per site.
+
+Run from the project root:
+    python -m src.test.benchmark.ParsingBenchmark [iterations]
+"""
+import glob
+import logging
+import os
+import sys
+import timeit
+from unittest.mock import patch
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from bs4 import BeautifulSoup
+from src.main.config.SitesConfigLoader import ConfigLoader
+from src.main.service import ScraperService as scraper_module
+from src.main.service.ScraperService import ScraperService
+
+FIXTURES_GLOB = os.path.join(project_root, 'src', 'test', 'resources', 'olx_*.html')
+PAGE_URL = 'https://www.olx.pl/praca/wroclaw/q-praca-dla-studenta/'
+
+
+def parse_with_string_selectors(content: bytes, selectors, parser: str) -> int:
+    """The previous parsing path: every select_one call receives the selector string."""
+    soup = BeautifulSoup(content, parser)
+    found = 0
+    for box in soup.select(selectors['offerBox']):
+        title = box.select_one(selectors['title'])
+        box.select_one(selectors['company'])
+        box.select_one(selectors['location'])
+        box.select_one(selectors['salary'])
+        link = box.select_one(selectors['url'])
+        add_info = box.select_one(selectors['addInfo'])
+        if add_info:
+            [li.get_text(strip=True) for li in add_info.find_all('li')]
+        if title and link:
+            found += 1
+    return found
+
+
+def parse_with_compiled_selectors(scraper: ScraperService, content: bytes, compiled) -> int:
+    soup = BeautifulSoup(content, scraper.parser)
+    return len(scraper._parse_offers(soup, 'olx.pl', PAGE_URL, compiled))
+
+
+def main(iterations: int = 20):
+    fixtures = sorted(glob.glob(FIXTURES_GLOB))
+    if not fixtures:
+        print(f"No fixtures found matching {FIXTURES_GLOB}")
+        return
+
+    site = next(site for site in ConfigLoader().get_sites_config() if site.get('id') == 'olx.pl')
+    selectors = site['selectors']
+    quiet_log = logging.getLogger('parsing_benchmark')
+    quiet_log.setLevel(logging.WARNING)
+
+    with patch.object(scraper_module, 'log', quiet_log):
+        scraper = ScraperService([], {'parser': 'lxml'})
+        compiled = scraper._compile_selectors('olx.pl', selectors)
+
+        print(f"{'fixture':<28}{'variant':<36}{'offers':>8}{'ms/page':>12}")
+        for fixture in fixtures:
+            with open(fixture, 'rb') as f:
+                content = f.read()
+            variants = [
+                ('html.parser + string selectors', lambda: parse_with_string_selectors(content, selectors, 'html.parser')),
+                ('lxml + string selectors', lambda: parse_with_string_selectors(content, selectors, 'lxml')),
+                ('lxml + compiled selectors', lambda: parse_with_compiled_selectors(scraper, content, compiled)),
+            ]
+            for name, run in variants:
+                offers = run()
+                best = min(timeit.repeat(run, number=iterations, repeat=3)) / iterations
+                print(f"{os.path.basename(fixture):<28}{name:<36}{offers:>8}{best * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
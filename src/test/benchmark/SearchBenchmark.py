@@ -0,0 +1,60 @@
+"""Benchmark of offer list search over a synthetic offer history.
+
+Compares the previous linear substring scan over titles with SearchIndex, which
+also searches company and location. Queries are timed as typed one character at
+a time, so the index can narrow each query from the previous one.
+
+Run from the project root:
+    python -m src.test.benchmark.SearchBenchmark [offers]
+"""
+import os
+import random
+import sys
+import time
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from src.main.service.SearchIndex import SearchIndex
+
+FILLER_WORDS = "praca student wrocław pełny etat magazyn sklep kasjer kelner barista kucharz kierowca sprzedawca".split()
+LOCATIONS = ["Wrocław, Stare Miasto", "Wrocław, Krzyki", "Wrocław, Fabryczna", "Wrocław, Psie Pole"]
+QUERIES = ["kelner b", "firma 12", "wrocław, k", "xyz"]
+
+
+def make_rows(count, rng):
+    companies = [f"Firma {i} sp. z o.o." for i in range(500)]
+    return [(' '.join(rng.choice(FILLER_WORDS) for _ in range(6)).title(), rng.choice(companies), rng.choice(LOCATIONS))
+            for _ in range(count)]
+
+
+def scan(titles, query):
+    """The previous implementation, kept here as the baseline."""
+    return [key for key, title in enumerate(titles) if query in title.lower()]
+
+
+def main(count: int = 100000):
+    rows = make_rows(count, random.Random(0))
+    titles = [row[0] for row in rows]
+
+    start = time.perf_counter()
+    index = SearchIndex()
+    index.add_rows(rows)
+    print(f"built index of {count} offers in {time.perf_counter() - start:.3f} s")
+
+    print(f"{'query':<14}{'scan ms (max)':>16}{'index ms (max)':>16}")
+    for query in QUERIES:
+        prefixes = [query[:end] for end in range(1, len(query) + 1)]
+        timings = []
+        for search in (lambda q: scan(titles, q), index.search):
+            slowest = 0.0
+            for prefix in prefixes:
+                start = time.perf_counter()
+                search(prefix)
+                slowest = max(slowest, time.perf_counter() - start)
+            timings.append(slowest * 1000)
+        print(f"{query!r:<14}{timings[0]:>16.2f}{timings[1]:>16.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)